@@ -0,0 +1,54 @@
+# bench_editor_construction.py
+# Time the construction of CodeEditor with the shared compiled theme, against parsing the theme for every editor.
+# Usage: QT_QPA_PLATFORM=offscreen python benchmarks/bench_editor_construction.py [--editors 200]
+import argparse
+import os, sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.Qsci import QsciScintilla, QsciLexerCPP
+
+def per_editor(build, count, setup=None):
+    """Return the mean milliseconds of build() over count editors; setup runs untimed before each one."""
+    editors = []
+    elapsed = 0.0
+    for _ in range(count):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        editors.append(build())
+        elapsed += time.perf_counter() - start
+    for editor in editors:
+        editor.deleteLater()
+    QApplication.processEvents()
+    return elapsed * 1000 / count
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CodeEditor construction.")
+    parser.add_argument("--editors", type=int, default=200, help="editors built per measurement")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    from code_editor import CodeEditor
+    from theme_cache import shared_theme_cache
+
+    def bare_editor():
+        editor = QsciScintilla()
+        editor.setLexer(QsciLexerCPP(editor))
+        return editor
+
+    per_editor(CodeEditor, 10)  # Warm up Qt and the theme cache
+    results = [
+        ("QsciScintilla + QsciLexerCPP (floor)", per_editor(bare_editor, args.editors)),
+        ("CodeEditor, shared compiled theme", per_editor(CodeEditor, args.editors)),
+        ("CodeEditor, theme parsed per editor", per_editor(CodeEditor, args.editors, shared_theme_cache.themes.clear)),
+    ]
+    print(f"{'construction':40} {'ms/editor':>10}")
+    for label, milliseconds in results:
+        print(f"{label:40} {milliseconds:10.3f}")
+
+if __name__ == "__main__":
+    main()
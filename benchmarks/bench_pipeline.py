@@ -0,0 +1,227 @@
+# bench_pipeline.py
+# Time the tagging and navigation hot paths of the editor on synthetic C projects, headless.
+# Usage: QT_QPA_PLATFORM=offscreen python benchmarks/bench_pipeline.py --ctags /usr/bin/ctags [--sizes 100,1000,10000]
+#        [--repeat 3] [--json results.json] [--baseline previous.json --tolerance 0.25]
+import argparse
+import json
+import os, sys
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication, QMessageBox
+from PyQt6.QtCore import QSettings, QStandardPaths, QEventLoop, QTimer, QThreadPool
+
+FUNCTIONS_PER_MODULE = 20
+
+def make_project(directory, file_count):
+    """Write file_count/2 modules (a .c and a .h each) that include and call each other."""
+    modules = max(file_count // 2, 1)
+    for i in range(modules):
+        group = f"group_{i // 100}"
+        os.makedirs(os.path.join(directory, "src", group), exist_ok=True)
+        os.makedirs(os.path.join(directory, "inc", group), exist_ok=True)
+        next_module = (i + 1) % modules
+        header = [f"#ifndef MODULE_{i}_H", f"#define MODULE_{i}_H", f"#define MODULE_{i}_SIZE {i}",
+                  f"typedef struct {{ int id; int value; }} Module{i}_Config;"]
+        header += [f"int Module{i}_Func{j}(int value);" for j in range(FUNCTIONS_PER_MODULE)]
+        header.append("#endif")
+        source = [f'#include "module_{i}.h"', f'#include "module_{next_module}.h"',
+                  f"static int module_{i}_state = 0;", f"Module{i}_Config module_{i}_config;"]
+        for j in range(FUNCTIONS_PER_MODULE):
+            source += [f"int Module{i}_Func{j}(int value)", "{",
+                       f"    module_{i}_state += value + MODULE_{i}_SIZE;",
+                       f"    return Module{next_module}_Func{j}(module_{i}_state);" if j % 4 == 0 else "    return value;",
+                       "}"]
+        with open(os.path.join(directory, "inc", group, f"module_{i}.h"), "w", encoding="utf-8") as f:
+            f.write("\n".join(header) + "\n")
+        with open(os.path.join(directory, "src", group, f"module_{i}.c"), "w", encoding="utf-8") as f:
+            f.write("\n".join(source) + "\n")
+    return modules
+
+def source_path(directory, module):
+    return os.path.join(directory, "src", f"group_{module // 100}", f"module_{module}.c")
+
+def measure(action, setup=None, repeat=3):
+    """Return (best wall seconds, Python heap peak MB) of action; setup runs untimed before each call."""
+    best = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    # Memory is traced in a separate run, tracemalloc would distort the timings. It only sees Python allocations:
+    # SQLite's page cache, Scintilla buffers and the ctags process are not counted
+    if setup:
+        setup()
+    tracemalloc.start()
+    action()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak / 1e6
+
+def wait_for(signals, timeout_ms):
+    """Run the event loop until one of the signals fires or the timeout expires."""
+    loop = QEventLoop()
+    for signal in signals:
+        signal.connect(loop.quit)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec()
+    for signal in signals:
+        signal.disconnect(loop.quit)
+
+def bench_size(window, file_count, repeat, timeout_ms):
+    from ctags_handler import CtagsHandler
+    from symbol_database import SymbolDatabase
+    from tags_cache import shared_tags_cache
+
+    results = {}
+    project_dir = tempfile.mkdtemp(prefix=f"taara_bench_{file_count}_")
+    try:
+        modules = make_project(project_dir, file_count)
+        window.project_view.set_project_directory(project_dir)
+        scheduler = window.ctags_scheduler
+        db_path = CtagsHandler.symbol_db.db_path
+
+        def reset_index():
+            scheduler.cancel_all(wait=True)
+            CtagsHandler.symbol_db.close()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+            CtagsHandler.symbol_db = SymbolDatabase(db_path)
+            shared_tags_cache.clear()
+
+        def index_project():
+            window.project_view.generate_project_ctags(project_dir)
+            wait_for([scheduler.projectIndexed, scheduler.indexFailed], timeout_ms)
+
+        results["generate_project_ctags (cold)"] = measure(index_project, reset_index, repeat)
+        results["generate_project_ctags (no changes)"] = measure(index_project, None, repeat)
+
+        # One editor on the first module, the definitions looked up live in the middle of the project
+        first_source = source_path(project_dir, 0)
+        editor = window.open_file(first_source)
+        wait_for([scheduler.fileIndexed], 2000)
+        target = f"Module{modules // 2}_Func{FUNCTIONS_PER_MODULE // 2}"
+
+        def touch_source():
+            stat = os.stat(first_source)
+            os.utime(first_source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+        results["generate_ctags (changed file)"] = measure(
+            lambda: CtagsHandler(editor).generate_ctags(), touch_source, repeat)
+        results["generate_ctags (unchanged file)"] = measure(
+            lambda: CtagsHandler(editor).generate_ctags(), None, repeat)
+
+        def drop_tags_cache():
+            shared_tags_cache.clear()
+            editor.tags_cache = {}
+        results["update_tags_cache (cold)"] = measure(editor.update_tags_cache, drop_tags_cache, repeat)
+
+        def drop_outline():
+            drop_tags_cache()
+            editor.update_tags_cache()
+            window.function_list.current_model = None
+        results["update_function_list"] = measure(
+            lambda: window.function_list.update_function_list(editor), drop_outline, repeat)
+
+        def back_to_first_tab():
+            # Close the tab opened by the previous jump so each run opens the target file again
+            for i in range(window.tabWidget.count() - 1, -1, -1):
+                if window.tabWidget.widget(i) is not editor:
+                    widget = window.tabWidget.widget(i)
+                    window.tabWidget.removeTab(i)
+                    widget.deleteLater()
+            window.tabWidget.setCurrentWidget(editor)
+            QApplication.processEvents()
+        results["gotoDefinition (opens file)"] = measure(
+            lambda: editor.gotoDefinition(target), back_to_first_tab, repeat)
+        back_to_first_tab()
+    finally:
+        window.ctags_scheduler.cancel_all(wait=True)
+        QThreadPool.globalInstance().waitForDone()
+        for i in range(window.tabWidget.count() - 1, -1, -1):
+            widget = window.tabWidget.widget(i)
+            window.tabWidget.removeTab(i)
+            widget.deleteLater()
+        QApplication.processEvents()
+        db_path = CtagsHandler.symbol_db.db_path
+        CtagsHandler.symbol_db.close()
+        CtagsHandler.symbol_db = SymbolDatabase.for_workspace()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+        completions = os.path.splitext(db_path)[0] + ".completions"
+        if os.path.exists(completions):
+            os.remove(completions)
+        shutil.rmtree(project_dir, ignore_errors=True)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tagging and navigation on synthetic C projects.")
+    parser.add_argument("--ctags", default=shutil.which("ctags"), help="ctags executable (default: ctags on PATH)")
+    parser.add_argument("--sizes", default="100,1000,10000", help="comma separated file counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timeout", type=int, default=600, help="seconds allowed for one project indexing run")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="results file of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    args = parser.parse_args()
+    if not args.ctags or not os.path.exists(args.ctags):
+        parser.error("no ctags executable found, pass --ctags")
+
+    app = QApplication(sys.argv)
+    # Keep the user's settings and symbol databases out of the benchmark (the registry on Windows cannot be
+    # redirected, the one value written there is restored at the end and the session is never saved)
+    settings_dir = tempfile.mkdtemp(prefix="taara_bench_settings_")
+    QSettings.setPath(QSettings.Format.NativeFormat, QSettings.Scope.UserScope, settings_dir)
+    QStandardPaths.setTestModeEnabled(True)
+    settings = QSettings("Taara", "Debugger")
+    previous_ctags = settings.value("CTags/Path")
+    settings.setValue("CTags/Path", args.ctags)
+    for name in ("warning", "information", "critical"):
+        setattr(QMessageBox, name, staticmethod(lambda *a, name=name: print(f"  [{name}] {a[1:]}")))
+
+    from main_window import MainWindow
+    window = MainWindow()
+
+    all_results = {}
+    print(f"{'files':>6}  {'step':38} {'wall ms':>10} {'Python heap peak MB':>19}")
+    for file_count in [int(size) for size in args.sizes.split(",")]:
+        results = bench_size(window, file_count, args.repeat, args.timeout * 1000)
+        for step, (seconds, peak) in results.items():
+            print(f"{file_count:>6}  {step:38} {seconds * 1000:10.2f} {peak:19.2f}")
+            all_results[f"{file_count}/{step}"] = {"seconds": seconds, "python_heap_peak_mb": peak}
+
+    # Not window.close(): closeEvent would save this session over the user's one
+    from ctags_handler import CtagsHandler
+    window.ctags_scheduler.cancel_all(wait=True)
+    QThreadPool.globalInstance().waitForDone()
+    CtagsHandler.symbol_db.close()
+    if previous_ctags is None:
+        settings.remove("CTags/Path")
+    else:
+        settings.setValue("CTags/Path", previous_ctags)
+    shutil.rmtree(settings_dir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(all_results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = [(key, baseline[key]["seconds"], result["seconds"]) for key, result in all_results.items()
+                       if key in baseline and result["seconds"] > baseline[key]["seconds"] * (1 + args.tolerance)]
+        for key, before, after in regressions:
+            print(f"REGRESSION {key}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# bench_status_bar.py
+# Measure what the application adds to each keystroke (status bar and edit handlers) for growing file sizes.
+# Usage: QT_QPA_PLATFORM=offscreen python benchmarks/bench_status_bar.py --ctags /usr/bin/ctags
+#        [--lines 1000,100000,1000000] [--keys 200]
+import argparse
+import os, sys
+import shutil
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QSettings, QStandardPaths
+
+def best_of(action, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-keystroke cost of the editor handlers.")
+    parser.add_argument("--ctags", default=shutil.which("ctags"), help="ctags executable the window starts with")
+    parser.add_argument("--lines", default="1000,100000,1000000", help="comma separated file sizes in lines")
+    parser.add_argument("--keys", type=int, default=200, help="keystrokes simulated per size")
+    args = parser.parse_args()
+    if not args.ctags or not os.path.exists(args.ctags):
+        parser.error("no ctags executable found, pass --ctags")
+
+    app = QApplication(sys.argv)
+    # Keep the user's settings and session out of the benchmark
+    settings_dir = tempfile.mkdtemp(prefix="taara_bench_settings_")
+    QSettings.setPath(QSettings.Format.NativeFormat, QSettings.Scope.UserScope, settings_dir)
+    QStandardPaths.setTestModeEnabled(True)
+    settings = QSettings("Taara", "Debugger")
+    previous_ctags = settings.value("CTags/Path")
+    settings.setValue("CTags/Path", args.ctags)
+
+    from main_window import MainWindow
+    from code_editor import CodeEditor
+    window = MainWindow()
+    window.show()
+
+    updates = []
+    update_status_bar = window.update_status_bar
+    def counted_update():
+        updates.append(1)
+        update_status_bar()
+    window.status_bar_timer.timeout.disconnect()
+    window.status_bar_timer.timeout.connect(counted_update)
+
+    print(f"{'lines':>8} {'MB':>6} {'handlers/key ms':>16} {'status bar ms':>14} {'updates/burst':>14} {'text() copy ms':>15}")
+    for line_count in [int(size) for size in args.lines.split(",")]:
+        editor = CodeEditor(window)
+        window.tabWidget.addTab(editor, f"{line_count} lines")
+        window.add_editor(editor)
+        window.tabWidget.setCurrentWidget(editor)
+        editor.setText("\n".join(f"    REG_{i}.value = REG_{i}.value | (1u << {i % 32});" for i in range(line_count)))
+        editor.setCursorPosition(line_count // 2, 4)
+        app.processEvents()
+        size_mb = editor.SendScintilla(editor.SCI_GETTEXTLENGTH) / 1e6
+
+        # The signals one typed character raises, without Scintilla's own insertion cost
+        def keystroke():
+            editor.textChanged.emit()
+            editor.cursorPositionChanged.emit(line_count // 2, 5)
+        per_key = best_of(lambda: [keystroke() for _ in range(args.keys)], 3) / args.keys
+
+        # A burst of keystrokes within one frame is coalesced into a single refresh
+        window.status_bar_timer.stop()
+        updates.clear()
+        for _ in range(args.keys):
+            keystroke()
+        time.sleep(0.05)
+        app.processEvents()
+
+        status_bar = best_of(update_status_bar, 20)
+        text_copy = best_of(lambda: len(editor.text()), 3)  # What every refresh used to cost
+        print(f"{line_count:>8} {size_mb:>6.1f} {per_key * 1000:>16.3f} {status_bar * 1000:>14.3f} "
+              f"{len(updates):>14} {text_copy * 1000:>15.2f}")
+
+        window.tabWidget.removeTab(window.tabWidget.indexOf(editor))
+        editor.deleteLater()
+        app.processEvents()
+
+    # Not window.close(): closeEvent would save this session over the user's one
+    if previous_ctags is None:
+        settings.remove("CTags/Path")
+    else:
+        settings.setValue("CTags/Path", previous_ctags)
+    shutil.rmtree(settings_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# bench_symbol_search.py
+# Time building the Go to Symbol index and answering palette queries over synthetic symbol names.
+# Usage: python benchmarks/bench_symbol_search.py [--symbols 300000]
+import argparse
+import os, sys
+import random
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from symbol_search import SymbolSearchIndex
+
+PERIPHERALS = ["GPIO", "UART", "SPI", "I2C", "TIM", "ADC", "DAC", "DMA", "RCC", "FLASH", "CAN", "USB", "RTC", "PWR", "EXTI"]
+ACTIONS = ["Init", "DeInit", "Start", "Stop", "Read", "Write", "Config", "GetState", "IRQHandler", "Callback", "Enable", "Disable"]
+
+def make_names(count, seed=1):
+    """Return count distinct names shaped like HAL/LL driver and application symbols."""
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        style = rng.random()
+        if style < 0.5:
+            name = f"{rng.choice(['HAL', 'LL'])}_{rng.choice(PERIPHERALS)}{rng.randint(1, 9)}_{rng.choice(ACTIONS)}{rng.randint(0, 999)}"
+        elif style < 0.8:
+            name = f"{rng.choice(PERIPHERALS)}_{rng.choice(ACTIONS).upper()}_{rng.randint(0, 99999)}"
+        else:
+            name = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz_") for _ in range(rng.randint(6, 20)))
+        names.add(name)
+    return list(names)
+
+QUERIES = ["g", "hal", "gpioinit", "HAL_GPIO3_Init12", "uartwrite", "hgpioinit", "tim_start_", "dmairqhandler", "zzzqqq", "spi2cfg"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Go to Symbol trigram index.")
+    parser.add_argument("--symbols", type=int, default=300000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    names = make_names(args.symbols)
+    start = time.perf_counter()
+    index = SymbolSearchIndex(names)
+    print(f"built index of {len(index)} names in {time.perf_counter() - start:.2f} s")
+
+    worst = 0.0
+    for query in QUERIES:
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results = index.search(query)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        worst = max(worst, best)
+        print(f"{query!r:22} {len(results):4} results  {best * 1000:7.2f} ms  {results[:3]}")
+    print(f"slowest query: {worst * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# bench_tab_typing.py
+# Measure typing latency with many tabs open: real key events into the current editor, with the tab state handlers.
+# Usage: QT_QPA_PLATFORM=offscreen python benchmarks/bench_tab_typing.py --ctags /usr/bin/ctags [--tabs 50] [--keys 300]
+import argparse
+import os, sys
+import shutil
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import Qt, QEvent, QSettings, QStandardPaths
+from PyQt6.QtGui import QKeyEvent
+
+def type_keys(app, editor, keys, per_key=None):
+    """Send keys as key press events and return each keystroke's latency in milliseconds, events flushed."""
+    latencies = []
+    for i in range(keys):
+        # Punctuation: identifier characters would open the completion list, timing its popup instead
+        char = " +-*;,()"[i % 8]
+        start = time.perf_counter()
+        app.sendEvent(editor, QKeyEvent(QEvent.Type.KeyPress, Qt.Key.Key_unknown, Qt.KeyboardModifier.NoModifier, char))
+        if per_key:
+            per_key()
+        app.processEvents()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def report(label, latencies):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label:44} {statistics.median(latencies):10.3f} {p99:10.3f} {latencies[-1]:10.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark typing latency with many open tabs.")
+    parser.add_argument("--ctags", default=shutil.which("ctags"), help="ctags executable the window starts with")
+    parser.add_argument("--tabs", type=int, default=50, help="tabs open while typing")
+    parser.add_argument("--keys", type=int, default=300, help="keystrokes typed per measurement")
+    args = parser.parse_args()
+    if not args.ctags or not os.path.exists(args.ctags):
+        parser.error("no ctags executable found, pass --ctags")
+
+    app = QApplication(sys.argv)
+    # Keep the user's settings and session out of the benchmark
+    settings_dir = tempfile.mkdtemp(prefix="taara_bench_settings_")
+    QSettings.setPath(QSettings.Format.NativeFormat, QSettings.Scope.UserScope, settings_dir)
+    QStandardPaths.setTestModeEnabled(True)
+    settings = QSettings("Taara", "Debugger")
+    previous_ctags = settings.value("CTags/Path")
+    settings.setValue("CTags/Path", args.ctags)
+
+    from main_window import MainWindow
+    from code_editor import CodeEditor
+    window = MainWindow()
+    window.resize(1200, 800)
+    window.show()
+
+    text = "\n".join(f"    REG_{i}.value = REG_{i}.value | (1u << {i % 32});" for i in range(2000))
+    for i in range(args.tabs):
+        editor = CodeEditor(window)
+        editor.setText(text)
+        editor.setModified(False)
+        window.add_editor(editor)
+        window.tabWidget.addTab(editor, f"file_{i}.c")
+    editor = window.tabWidget.widget(window.tabWidget.count() - 1)
+    window.tabWidget.setCurrentWidget(editor)
+    editor.setFocus()
+    editor.setCursorPosition(1000, 4)
+    app.processEvents()
+
+    def from_save_point():
+        editor.setModified(False)
+        app.processEvents()
+
+    print(f"{args.tabs} tabs, {args.keys} keys per row")
+    print(f"{'typing':44} {'median ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    type_keys(app, editor, 20)  # Warm up
+    from_save_point()
+    report("stylesheet once, tab icon per transition", type_keys(app, editor, args.keys))
+    # The previous behavior: the whole tab widget stylesheet set again on every keystroke
+    from_save_point()
+    report("stylesheet set again per keystroke (before)", type_keys(app, editor, args.keys, window.set_tab_style))
+
+    # Leaving and reaching the save point repaints one tab icon
+    transitions = []
+    for _ in range(args.keys // 10):
+        from_save_point()
+        transitions += type_keys(app, editor, 1)
+    report("first key after a save (icon transition)", transitions)
+
+    # Not window.close(): closeEvent would save this session over the user's one
+    for i in range(window.tabWidget.count()):
+        window.tabWidget.widget(i).setModified(False)
+    if previous_ctags is None:
+        settings.remove("CTags/Path")
+    else:
+        settings.setValue("CTags/Path", previous_ctags)
+    shutil.rmtree(settings_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# bench_tag_file_lookup.py
+# Time go-to-definition lookups in a large sorted tags file searched in place through mmap.
+# Usage: python benchmarks/bench_tag_file_lookup.py [--tags 2000000]
+import argparse
+import os, sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tag_file_index import SortedTagsFile
+
+# Name shapes where '_' meets a letter, so folding to lower instead of upper case would break the search
+NAME_FORMATS = ("HAL_Module{0}_Func{1}", "HAL_Module{0}Ex_Func{1}", "hal_module{0}_func_{1}", "A_B{0}_{1}", "AB{0}_{1}")
+
+def make_tags_file(directory, total_tags, tags_per_file=500, fold_case=False):
+    """Write a sorted tags file and the headers it points to. Return the tags file path and some names.
+
+    With fold_case the file is sorted ignoring case the way ctags --sort=foldcase does (!_TAG_FILE_SORTED 2).
+    """
+    lines = []
+    for file_index in range(max(total_tags // tags_per_file, 1)):
+        header = f"hal_{file_index}.h"
+        source_lines = []
+        for tag_index in range(tags_per_file):
+            name = NAME_FORMATS[tag_index % len(NAME_FORMATS)].format(file_index, tag_index)
+            source_lines.append(f"void {name}(void);")
+            lines.append(f"{name}\t{header}\t/^void {name}(void);$/;\"\tp\tline:{tag_index + 1}")
+        with open(os.path.join(directory, header), "w", encoding="utf-8") as f:
+            f.write("\n".join(source_lines))
+    lines.sort(key=str.upper if fold_case else None)
+    path = os.path.join(directory, "tags")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("!_TAG_FILE_FORMAT\t2\t/extended format/\n")
+        f.write(f"!_TAG_FILE_SORTED\t{2 if fold_case else 1}\t/0=unsorted, 1=sorted, 2=foldcase/\n")
+        f.write("\n".join(lines) + "\n")
+    return path, [lines[i].split("\t", 1)[0] for i in range(0, len(lines), max(len(lines) // 1000, 1))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mmap binary search over a sorted tags file.")
+    parser.add_argument("--tags", type=int, default=2000000)
+    args = parser.parse_args()
+
+    for fold_case in (False, True):
+        with tempfile.TemporaryDirectory() as directory:
+            bench_file(directory, args.tags, fold_case)
+
+def bench_file(directory, total_tags, fold_case):
+    path, names = make_tags_file(directory, total_tags, fold_case=fold_case)
+    print(f"tags file sorted {'ignoring case' if fold_case else 'by byte'}: "
+          f"{os.path.getsize(path) / 1e6:.0f} MB, {total_tags} tags")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    tags_file = SortedTagsFile.open(path)
+    opened = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = sum(1 for name in names if tags_file.lookup(name))
+    cold = (time.perf_counter() - start) / len(names)
+    recent = names[-100:]  # Still in the LRU
+    start = time.perf_counter()
+    for name in recent:
+        tags_file.lookup(name)
+    warm = (time.perf_counter() - start) / len(recent)
+    start = time.perf_counter()
+    missing = tags_file.lookup("NoSuchSymbol")
+    miss = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tags_file.close()
+
+    print(f"open {opened * 1000:.2f} ms; lookup cold {cold * 1000:.3f} ms, cached {warm * 1000:.4f} ms, "
+          f"miss {miss * 1000:.3f} ms; {found}/{len(names)} found")
+    print(f"Python heap: {current / 1e6:.2f} MB live, {peak / 1e6:.2f} MB peak")
+    if found != len(names) or missing:
+        sys.exit(f"lookup returned wrong results for the {'case-folded' if fold_case else 'sorted'} file")
+
+if __name__ == "__main__":
+    main()
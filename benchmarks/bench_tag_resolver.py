@@ -0,0 +1,56 @@
+# bench_tag_resolver.py
+# Time the single-pass tag resolver on synthetic C sources.
+# Usage: python benchmarks/bench_tag_resolver.py [--tags 100000] [--tags-per-file 200]
+import argparse
+import os, sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ctags_handler import parse_tag_line
+from tag_resolver import resolve_tags
+
+def make_sources(directory, total_tags, tags_per_file):
+    """Write synthetic C files and return the ctags lines describing them."""
+    tag_lines = []
+    for file_index in range(max(total_tags // tags_per_file, 1)):
+        path = os.path.join(directory, f"module_{file_index}.c")
+        lines = []
+        for tag_index in range(tags_per_file):
+            name = f"Module{file_index}_Func{tag_index}"
+            source_line = f"static int {name}(int value)"
+            lines.append(source_line)
+            lines.append("{ return value; }")
+            # Half of the tags carry a line number, the other half only a search pattern
+            if tag_index % 2:
+                tag_lines.append(f"{name}\t{path}\t/^{source_line}$/;\"\tf\tline:{len(lines) - 1}")
+            else:
+                tag_lines.append(f"{name}\t{path}\t/^{source_line}$/;\"\tf")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+    return tag_lines
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ctags location resolver.")
+    parser.add_argument("--tags", type=int, default=100000)
+    parser.add_argument("--tags-per-file", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        tag_lines = make_sources(directory, args.tags, args.tags_per_file)
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            tags = [parse_tag_line(line) for line in tag_lines]
+            resolved = resolve_tags(tags)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        count = sum(len(file_tags) for file_tags in resolved.values())
+        print(f"resolved {count} tags in {len(resolved)} files: best {best:.3f} s "
+              f"({best * 100000 / max(count, 1):.3f} s per 100k tags)")
+
+if __name__ == "__main__":
+    main()
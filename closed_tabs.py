@@ -0,0 +1,119 @@
+# closed_tabs.py
+from collections import deque
+import os
+import shutil
+import tempfile
+import zlib
+
+MEMORY_LIMIT = 16 * 1024 * 1024     # Compressed bytes of closed buffers kept in RAM, older ones go to disk
+DISK_LIMIT = 256 * 1024 * 1024      # Compressed bytes kept on disk, the oldest closed tabs beyond are forgotten
+MAX_TABS = 500                      # Closed tabs remembered at most
+COMPRESS_LEVEL = 1                  # Fast: compression runs on the GUI thread when a tab is closed
+
+class ClosedTab:
+    def __init__(self, file_path, cursor_pos, data=None):
+        self.file_path = file_path
+        self.cursor_pos = tuple(cursor_pos)
+        self.data = data            # zlib compressed UTF-8 of the buffer, None when the file on disk holds it
+        self.size = len(data) if data is not None else 0
+        self.spill_path = None      # File holding data once it left memory
+
+class ClosedTabHistory:
+    """Stack of the closed tabs reopened by Reopen Closed Tab, bounded in memory and on disk.
+
+    A tab closed unmodified is remembered by path and cursor only, the file is read again when it is reopened.
+    Modified buffers are kept compressed; past MEMORY_LIMIT the oldest spill to a temporary directory.
+    """
+    def __init__(self, memory_limit=MEMORY_LIMIT, disk_limit=DISK_LIMIT, max_tabs=MAX_TABS):
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self.max_tabs = max_tabs
+        self.tabs = deque()
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self.spill_dir = None
+
+    def __len__(self):
+        return len(self.tabs)
+
+    def push(self, file_path, cursor_pos, content=None):
+        """Remember a closed tab; content is the UTF-8 of a buffer that differs from its file, else None."""
+        data = zlib.compress(content, COMPRESS_LEVEL) if content is not None else None
+        if data is not None and len(data) > self.disk_limit:
+            data = None  # Would push out every other tab, it is reopened from its file instead
+        tab = ClosedTab(file_path, cursor_pos, data)
+        self.tabs.append(tab)
+        self.memory_bytes += tab.size
+        self.trim()
+
+    def pop(self):
+        """Return (file_path, content or None, cursor_pos) of the last closed tab, or None if there is none."""
+        if not self.tabs:
+            return None
+        tab = self.tabs.pop()
+        data = tab.data
+        if tab.spill_path:
+            try:
+                with open(tab.spill_path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                data = None  # The temporary file is gone, the tab is reopened from its file
+            self.drop(tab)
+        else:
+            self.memory_bytes -= tab.size
+        content = zlib.decompress(data).decode('utf-8') if data is not None else None
+        return tab.file_path, content, tab.cursor_pos
+
+    def trim(self):
+        # Oldest buffers leave memory first
+        for tab in self.tabs:
+            if self.memory_bytes <= self.memory_limit:
+                break
+            if tab.data is not None:
+                self.spill(tab)
+        while self.tabs and (self.disk_bytes > self.disk_limit or len(self.tabs) > self.max_tabs):
+            tab = self.tabs.popleft()
+            if tab.spill_path:
+                self.drop(tab)
+            else:
+                self.memory_bytes -= tab.size
+
+    def spill(self, tab):
+        self.memory_bytes -= tab.size
+        try:
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix="taara_closed_tabs_")
+            fd, tab.spill_path = tempfile.mkstemp(suffix=".z", dir=self.spill_dir)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(tab.data)
+        except OSError:
+            # No room on disk either: the tab is still reopened, from its file
+            if tab.spill_path:
+                try:
+                    os.unlink(tab.spill_path)
+                except OSError:
+                    pass
+            tab.spill_path = None
+            tab.size = 0
+        else:
+            self.disk_bytes += tab.size
+        tab.data = None
+
+    def drop(self, tab):
+        """Delete the spilled copy of a tab."""
+        if tab.spill_path:
+            self.disk_bytes -= tab.size
+            try:
+                os.unlink(tab.spill_path)
+            except OSError:
+                pass
+            tab.spill_path = None
+
+    def clear(self):
+        for tab in self.tabs:
+            self.drop(tab)
+        self.tabs.clear()
+        self.memory_bytes = self.disk_bytes = 0
+        if self.spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
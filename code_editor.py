@@ -1,15 +1,50 @@
 from PyQt6.Qsci         import QsciScintilla, QsciLexerCPP, QsciLexerPython
 from PyQt6.QtGui        import QFont, QColor, QMouseEvent
-from PyQt6.QtCore       import QTimer, Qt
-from PyQt6.QtWidgets    import QMessageBox
+from PyQt6.QtCore       import QTimer, Qt, QPoint, QThreadPool
+from PyQt6.QtWidgets    import QMessageBox, QMenu
 from pathlib            import Path
-import json
+from ctags_handler      import CtagsHandler, BufferTagJob
+from tags_cache         import shared_tags_cache
+from symbol_database    import normalize_path, rank_definitions
+from completion_provider        import shared_completions
+from theme_cache        import shared_theme_cache
+import difflib
+import re
 import os
 
+WORD_BEFORE_CARET = re.compile(r'[A-Za-z_]\w*$')
+IDENTIFIER = re.compile(r'[A-Za-z_]\w*')
+NEARBY_LINES = 100  # Lines above and below the caret scanned for local names missing from the index
+HIGHLIGHT_DELAY_MS = 50      # Caret idle time before occurrences of the word under it are highlighted
+HIGHLIGHT_MARGIN_LINES = 100  # Lines above and below the visible ones searched for occurrences
+HIGHLIGHT_MAX_MATCHES = 500   # Occurrences highlighted at most, beyond that the highlight restarts at the view
+OVERLAY_DELAY_MS = 1000     # Typing pause before an unsaved buffer is tagged in the background
+LINE_BREAK = re.compile(r'(?<=\n)|(?<=\r)(?!\n)')  # Splits after each line break, into the lines Scintilla has
+
+def common_prefix_length(a, b, limit):
+    """Return how many leading characters a and b share, at most limit; compared block by block at memcmp speed."""
+    length, block = 0, 1 << 16
+    while block:
+        while length + block <= limit and a[length:length + block] == b[length:length + block]:
+            length += block
+        block >>= 1
+    return length
+
+def common_suffix_length(a, b, limit):
+    """Return how many trailing characters a and b share, at most limit."""
+    length, block = 0, 1 << 16
+    while block:
+        while length + block <= limit and a[len(a) - length - block:len(a) - length] == b[len(b) - length - block:len(b) - length]:
+            length += block
+        block >>= 1
+    return length
+
 class CodeEditor(QsciScintilla):
     def __init__(self, parent=None, theme_name="Khaki", language="CPP"):
         super().__init__(parent)
         self.GUI = parent
+        self.large_file = False  # Huge files are shown without lexer, folding, highlighting and tags
+        self.marked_modified = False  # Set by setModified(True): the file differs although Scintilla is at its save point
 
         # Font configuration
         self.text_font = QFont("Consolas", 16)
@@ -22,13 +57,14 @@ class CodeEditor(QsciScintilla):
         # Set language for file
         # self.set_language(language)
 
-        # Load and apply theme
-        self.theme = self.load_theme(theme_name.lower() + ".json")
+        # Apply the theme, compiled once per process and restyled when its JSON changes
+        self.theme_name = theme_name.lower()
+        self.theme = shared_theme_cache.theme(self.theme_name)
         self.apply_theme()
+        shared_theme_cache.themeChanged.connect(self.on_theme_changed)
 
-        # Apply font to all styles
-        for style in range(128):
-            self.lexer.setFont(self.text_font, style)
+        # Apply font to all styles (style -1 sets them in one call)
+        self.lexer.setFont(self.text_font, -1)
 
         # Apply lexer to QScintilla
         self.setLexer(self.lexer)
@@ -63,6 +99,7 @@ class CodeEditor(QsciScintilla):
 
         # Edit Action from User
         self.textChanged.connect(self.on_text_changed)
+        self.modificationChanged.connect(self.on_modification_changed)
 
         # Set the default page step for horizontal scroll bar
         self.horizontalScrollBar().setSingleStep(20)  # Adjust the step size as needed
@@ -70,10 +107,16 @@ class CodeEditor(QsciScintilla):
 
         self.setMouseTracking(True)  # Enable mouse tracking
         self.last_highlighted_word = None  # To keep track of the last highlighted word
+        self.encoding = 'utf-8'  # Codec the file was read with, and is saved with
+        self.highlighted_range = None  # (start, end) positions already searched for last_highlighted_word
+        self.highlight_count = 0
 
-        # Set auto completion source
-        self.setAutoCompletionSource(QsciScintilla.AutoCompletionSource.AcsAll)  # Set to AcsAll
-        self.setAutoCompletionThreshold(2)  # Set threshold to 2
+        # Completions come from the shared symbol index and the lines around the caret, see show_completions
+        self.setAutoCompletionSource(QsciScintilla.AutoCompletionSource.AcsNone)
+        self.completion_threshold = 2  # Letters typed before the list pops up
+        self.SendScintilla(QsciScintilla.SCI_AUTOCSETIGNORECASE, True)
+        self.SendScintilla(QsciScintilla.SCI_AUTOCSETCASEINSENSITIVEBEHAVIOUR, QsciScintilla.SC_CASEINSENSITIVEBEHAVIOUR_RESPECTCASE)
+        self.SCN_CHARADDED.connect(self.on_char_added)
 
         # Enable Call Tips
         self.setCallTipsVisible(3)  # Number of call tips displayed at the same time
@@ -90,33 +133,120 @@ class CodeEditor(QsciScintilla):
         color_int = (color.red() << 16) | (color.green() << 8) | color.blue()
         self.SendScintilla(self.SCI_INDICSETFORE, self.highlight_indicator, color_int)
 
-        # Connect event when cursor moves
-        self.cursorPositionChanged.connect(self.highlight_current_word)
+        # Highlight the word under the caret once it rests, and extend the highlight when scrolling
+        self.highlight_timer = QTimer(self)
+        self.highlight_timer.setSingleShot(True)
+        self.highlight_timer.timeout.connect(self.highlight_current_word)
+        self.cursorPositionChanged.connect(self.schedule_highlight)
+        self.verticalScrollBar().valueChanged.connect(self.schedule_highlight)
 
         # Set up Hotspot style for clickable keywords
         HOTSPOT_STYLE = 10
         self.SendScintilla(QsciScintilla.SCI_STYLESETHOTSPOT, HOTSPOT_STYLE, True)
 
-        # Create timer for deferred updates
-        self.update_timer = QTimer(self)
-        self.update_timer.setSingleShot(True)
-        self.update_timer.timeout.connect(self.deferred_update_status_bar)
-        self.cursorPositionChanged.connect(self.schedule_update)
-        self.textChanged.connect(self.schedule_update)
-
         # Add cache variable for tags
-        self.tags_cache = {}  # Store tags content: {word: (file_path, line_number)}
+        self.tags_cache = {}  # Shared symbol table of the file on disk: {word: (file_path, line_number, column, kind)}
+        self.outline_model = None  # Function List model built from tags_cache, reused on tab switches
         self.last_modified = None  # Last modified time of the source file
 
-    def schedule_update(self):
-        self.update_timer.start(100)  # Delay 100ms
-
-    def deferred_update_status_bar(self):
-        self.GUI.update_status_bar()  # Call the function to update the status bar
+        # Document revision, bumped on every edit, and the symbols of the unsaved buffer at a revision
+        self.document_revision = 0
+        self.overlay_revision = -1
+        self.overlay_tags = None
+        self.overlay_job = None  # BufferTagJob running on the global thread pool
+        self.overlay_owner = None  # Tab editor whose document this split view shows, it tags the buffer for both
+        self.overlay_timer = QTimer(self)
+        self.overlay_timer.setSingleShot(True)
+        self.overlay_timer.setInterval(OVERLAY_DELAY_MS)
+        self.overlay_timer.timeout.connect(self.update_buffer_overlay)
+
+    def schedule_highlight(self):
+        if not self.large_file:
+            self.highlight_timer.start(HIGHLIGHT_DELAY_MS)
+
+    def enter_large_file_mode(self):
+        """Drop what does not scale to huge documents: lexing, folding, word highlighting and tagging."""
+        self.large_file = True
+        paper, color = self.lexer.paper(QsciLexerCPP.Default), self.lexer.color(QsciLexerCPP.Default)
+        self.setLexer(None)
+        self.setFont(self.text_font)
+        self.setPaper(paper)
+        self.setColor(color)
+        self.setFolding(QsciScintilla.FoldStyle.NoFoldStyle)
+        self.setWrapMode(QsciScintilla.WrapMode.WrapNone)
+        self.setIndentationGuides(False)
+        self.setMarginWidth(0, "000000000")  # Room for the line numbers of a huge file
+        self.highlight_timer.stop()
+        # QScintilla turns the byte position of every insert/delete notification into a character offset by
+        # walking the document, which costs ~0.3 s per edit near the end of 40 MB. Without these notifications
+        # textChanged is not emitted; the modified state still follows modificationChanged.
+        self.SendScintilla(QsciScintilla.SCI_SETMODEVENTMASK, 0)
 
     def on_text_changed(self):
         """Handle text changes in the editor"""
-        self.setModified(True)
+        self.document_revision += 1
+        self.highlighted_range = None  # Positions shifted, highlight the visible lines again
+        if getattr(self, 'file_path', None) and self.overlay_owner is None:
+            self.overlay_timer.start()
+
+    def on_modification_changed(self, modified):
+        if not modified:
+            # Saved: the index holds the buffer now, an overlay of older unsaved text must not come back
+            self.overlay_revision = -1
+            self.overlay_tags = None
+
+    def isModified(self):
+        return self.marked_modified or super().isModified()
+
+    def setModified(self, modified):
+        """Set or clear the modified state. QScintilla alone can only clear it, e.g. a failed save sets it back."""
+        was_modified = self.isModified()
+        scintilla_modified = super().isModified()
+        self.marked_modified = modified
+        super().setModified(modified)
+        # Scintilla only notifies when it reaches its save point, other transitions are announced here
+        if super().isModified() == scintilla_modified and self.isModified() != was_modified:
+            self.modificationChanged.emit(self.isModified())
+
+    def replace_changed_lines(self, text):
+        """Make the document equal to text by replacing only the lines that differ. Return True if any did.
+
+        Untouched lines keep their folds, markers and styling, the caret and the view follow the edits,
+        and the whole change is one undo step.
+        """
+        old_text = self.text()
+        limit = min(len(old_text), len(text))
+        prefix = common_prefix_length(old_text, text, limit)
+        if prefix == len(old_text) == len(text):
+            return False
+        suffix = common_suffix_length(old_text, text, limit - prefix)
+        # Only the middle between the common head and tail is diffed, widened to whole lines
+        start = old_text.rfind('\n', 0, prefix) + 1
+        old_end = old_text.find('\n', len(old_text) - suffix) + 1 or len(old_text)
+        new_end = len(text) - (len(old_text) - old_end)
+        old_lines = LINE_BREAK.split(old_text[start:old_end])
+        new_lines = LINE_BREAK.split(text[start:new_end])
+        if old_end < len(old_text):
+            # The middle ends at the start of a line, not in the empty last line of a document
+            old_lines.pop()
+            new_lines.pop()
+        start_line = old_text.count('\n', 0, start) + old_text.count('\r', 0, start) - old_text.count('\r\n', 0, start)
+
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        line_count = self.lines()
+        length = self.SendScintilla(QsciScintilla.SCI_GETTEXTLENGTH)
+        self.beginUndoAction()
+        # From the end backwards, the lines before each replaced range keep their positions
+        for tag, old_first, old_last, new_first, new_last in reversed(matcher.get_opcodes()):
+            if tag == 'equal':
+                continue
+            first = self.SendScintilla(QsciScintilla.SCI_POSITIONFROMLINE, start_line + old_first)
+            last = length if start_line + old_last >= line_count else self.SendScintilla(QsciScintilla.SCI_POSITIONFROMLINE, start_line + old_last)
+            replacement = "".join(new_lines[new_first:new_last]).encode("utf-8")
+            self.SendScintilla(QsciScintilla.SCI_SETTARGETRANGE, first, last)
+            self.SendScintilla(QsciScintilla.SCI_REPLACETARGET, len(replacement), replacement)
+        self.endUndoAction()
+        return True
 
     def maintain_margin_font(self):
         """Keep margin font size fixed regardless of zoom level"""
@@ -146,81 +276,80 @@ class CodeEditor(QsciScintilla):
         else:
             super().wheelEvent(event)
 
-    def load_theme(self, theme_file):
-        """Load theme from JSON file"""
-        try:
-            script_dir = Path(__file__).parent
-            theme_path = script_dir / "themes" / theme_file
-
-            with open(theme_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            return None
-
     def apply_theme(self):
         """Apply the loaded theme"""
-        if not self.theme:
+        theme = self.theme
+        if not theme:
             return
 
-        # Get colors from theme
-        colors = self.theme.get("colors", {})
-        token_colors = self.theme.get("tokenColors", [])
-
-        # Set editor background and foreground
-        editor_bg = colors.get("editor.background", "#D7D7AF")
-        editor_fg = colors.get("editor.foreground", "#5F5F00")
-        self.lexer.setDefaultPaper(QColor(editor_bg))
-        self.lexer.setDefaultColor(QColor(editor_fg))
-
-        # Map token colors to Scintilla styles
-        style_map = {
-            "comment": QsciLexerCPP.Comment,
-            "string": QsciLexerCPP.DoubleQuotedString,
-            "constant.numeric": QsciLexerCPP.Number,
-            "keyword": QsciLexerCPP.Keyword,
-            "storage": QsciLexerCPP.KeywordSet2,
-            "entity.name.function": QsciLexerCPP.GlobalClass,
-            "meta.preprocessor": QsciLexerCPP.PreProcessor
-        }
-
-        # Apply token colors
-        for token in token_colors:
-            scope = token.get("scope", "")
-            settings = token.get("settings", {})
-
-            # Handle both string and list scopes
-            scopes = [scope] if isinstance(scope, str) else scope
-
-            for scope in scopes:
-                if scope in style_map:
-                    style = style_map[scope]
-                    if "foreground" in settings:
-                        self.lexer.setColor(QColor(settings["foreground"]), style)
-                    if "background" in settings:
-                        self.lexer.setPaper(QColor(settings["background"]), style)
+        # Set editor background and foreground, then the colors of the themed styles
+        self.lexer.setDefaultPaper(theme.background)
+        self.lexer.setDefaultColor(theme.foreground)
+        for style, foreground, background in theme.styles:
+            if foreground:
+                self.lexer.setColor(foreground, style)
+            if background:
+                self.lexer.setPaper(background, style)
+        if self.large_file:  # No lexer in large-file mode, the editor draws with its own colors
+            self.setPaper(theme.background)
+            self.setColor(theme.foreground)
 
         # Set editor UI colors
-        self.setCaretLineBackgroundColor(QColor(colors.get("editor.lineHighlightBackground", "#BFBF97")))
-        self.setCaretForegroundColor(QColor(colors.get("editorCursor.foreground", "#4D4D4D")))
-        self.setSelectionBackgroundColor(QColor(colors.get("editor.selectionBackground", "#D7FF87")))
-        self.setSelectionForegroundColor(QColor(editor_fg))
+        self.setCaretLineBackgroundColor(theme.caret_line)
+        self.setCaretForegroundColor(theme.caret)
+        self.setSelectionBackgroundColor(theme.selection)
+        self.setSelectionForegroundColor(theme.foreground)
 
         # Set margin colors (darker theme)
-        self.setMarginsForegroundColor(QColor("#2B2B2B"))  # Dark gray for line numbers
-        self.setMarginsBackgroundColor(QColor("#D3CBB7"))  # Darker khaki for margin background
+        self.setMarginsForegroundColor(theme.margin_foreground)
+        self.setMarginsBackgroundColor(theme.margin_background)
 
-        # Set indent guides color
-        indent_guide_color = colors.get("editorIndentGuide.background", "#586E7580")
-        self.setIndentationGuidesBackgroundColor(QColor(indent_guide_color))
+        # Set indent guides and whitespace colors
+        self.setIndentationGuidesBackgroundColor(theme.indent_guide)
+        self.setWhitespaceForegroundColor(theme.whitespace)
 
-        # Set whitespace color
-        whitespace_color = colors.get("editorWhitespace.foreground", "#586E7580")
-        self.setWhitespaceForegroundColor(QColor(whitespace_color))
+    def on_theme_changed(self, name):
+        """Restyle the editor after its theme file was edited."""
+        if name != self.theme_name:
+            return
+        self.theme = shared_theme_cache.theme(name)
+        if self.theme:
+            # The lexer keeps the colors each style was first given, all of them restart from the new defaults
+            self.lexer.setDefaultPaper(self.theme.background)
+            self.lexer.setDefaultColor(self.theme.foreground)
+            for style in range(128):
+                self.lexer.setColor(self.lexer.defaultColor(style), style)
+                self.lexer.setPaper(self.lexer.defaultPaper(style), style)
+        self.apply_theme()
 
-        # Apply background color to all styles that don't have specific backgrounds
-        for style in range(128):
-            if not self.lexer.paper(style).isValid():
-                self.lexer.setPaper(QColor(editor_bg), style)
+    def on_char_added(self, char):
+        if chr(char).isalnum() or chr(char) == "_":
+            self.show_completions()
+
+    def show_completions(self):
+        """Pop up the symbols starting with the word before the caret, from the index and the nearby lines."""
+        line, index = self.getCursorPosition()
+        match = WORD_BEFORE_CARET.search(self.text(line)[:index])
+        if not match or len(match.group()) < self.completion_threshold:
+            return
+        prefix = match.group()
+        folded_prefix = prefix.casefold()
+        words = set(shared_completions.complete(prefix))
+
+        # Locals and parameters are not indexed, pick them up from the code around the caret
+        first_line = max(line - NEARBY_LINES, 0)
+        last_line = min(line + NEARBY_LINES, self.lines() - 1)
+        for line_number in range(first_line, last_line + 1):
+            for word in IDENTIFIER.findall(self.text(line_number)):
+                if word.casefold().startswith(folded_prefix):
+                    words.add(word)
+        words.discard(prefix)
+
+        if words:
+            # Scintilla binary-searches the list, it must be in its own case-insensitive (upper case) order
+            self.SendScintilla(QsciScintilla.SCI_AUTOCSHOW, len(prefix.encode("utf-8")), " ".join(sorted(words, key=str.upper)).encode("utf-8"))
+        elif self.isListActive():
+            self.cancelList()
 
     def comment_lines(self):
         """Comment or uncomment the selected lines or the current line."""
@@ -295,43 +424,80 @@ class CodeEditor(QsciScintilla):
         word = buffer.decode('utf-8', errors='ignore').rstrip('\x00').strip()
         return word
 
-    def highlight_current_word(self):
-        """Highlight all occurrences of the current word in C/C++"""
-        # Set the current indicator
-        self.SendScintilla(self.SCI_SETINDICATORCURRENT, self.highlight_indicator)
-        
-        # Clear old highlight
-        self.SendScintilla(self.SCI_INDICATORCLEARRANGE, 0, self.length())
+    def visible_line_range(self, margin=0):
+        """Return the first and last document lines on screen, widened by margin lines."""
+        first_visible = self.SendScintilla(self.SCI_GETFIRSTVISIBLELINE)
+        first = self.SendScintilla(self.SCI_DOCLINEFROMVISIBLE, first_visible)
+        last = self.SendScintilla(self.SCI_DOCLINEFROMVISIBLE, first_visible + self.SendScintilla(self.SCI_LINESONSCREEN))
+        return max(first - margin, 0), min(last + margin, self.lines() - 1)
 
+    def highlight_current_word(self):
+        """Highlight the occurrences of the current word around the visible lines"""
         # Get the current cursor position
         pos = self.SendScintilla(self.SCI_GETCURRENTPOS)
         word = self.get_word_at_position(pos)
 
         # Check if the word is valid (only contains letters, numbers, or underscore)
         if not word or not any(c.isalnum() or c == '_' for c in word):
-            return
+            word = None
 
-        # Set search flags with word boundaries
-        self.SendScintilla(self.SCI_SETSEARCHFLAGS, QsciScintilla.SCFIND_WHOLEWORD)
-        
-        # Get the entire text
-        full_text = self.text()
-        text_length = len(full_text)
-        search_pos = 0
-
-        # Find and highlight all occurrences
-        while search_pos < text_length:
-            self.SendScintilla(self.SCI_SETTARGETSTART, search_pos)
-            self.SendScintilla(self.SCI_SETTARGETEND, text_length)
-            
-            found_pos = self.SendScintilla(self.SCI_SEARCHINTARGET, len(word), word.encode('utf-8'))
-            if found_pos == -1:  # No more words found
+        if word != self.last_highlighted_word or self.highlighted_range is None:
+            self.clear_word_highlight()
+            self.last_highlighted_word = word
+        if word:
+            self.extend_word_highlight()
+
+    def clear_word_highlight(self):
+        """Remove the word highlight, visiting the highlighted runs only instead of the whole document"""
+        self.SendScintilla(self.SCI_SETINDICATORCURRENT, self.highlight_indicator)
+        text_length = self.SendScintilla(self.SCI_GETTEXTLENGTH)
+        position = 0
+        while position < text_length:
+            run_end = self.SendScintilla(self.SCI_INDICATOREND, self.highlight_indicator, position)
+            if run_end <= position:
                 break
-            
-            # Highlight the found word
-            self.SendScintilla(self.SCI_INDICATORFILLRANGE, found_pos, len(word))
-            search_pos = found_pos + len(word)  # Continue searching from the next position
+            if self.SendScintilla(self.SCI_INDICATORVALUEAT, self.highlight_indicator, position):
+                self.SendScintilla(self.SCI_INDICATORCLEARRANGE, position, run_end - position)
+            position = run_end
+        self.highlighted_range = None
+        self.highlight_count = 0
+
+    def extend_word_highlight(self):
+        """Highlight last_highlighted_word over the visible lines plus a margin, searching only lines not covered yet"""
+        first_line, last_line = self.visible_line_range(HIGHLIGHT_MARGIN_LINES)
+        start = self.SendScintilla(self.SCI_POSITIONFROMLINE, first_line)
+        end = self.SendScintilla(self.SCI_GETLINEENDPOSITION, last_line)
+
+        if self.highlighted_range:
+            covered_start, covered_end = self.highlighted_range
+            if covered_start <= start and end <= covered_end:
+                return
+            if end < covered_start or start > covered_end or self.highlight_count >= HIGHLIGHT_MAX_MATCHES:
+                # Jumped away from the highlighted lines, or too many matches kept: start over at the view
+                self.clear_word_highlight()
+
+        if self.highlighted_range:
+            covered_start, covered_end = self.highlighted_range
+            ranges = [(start, covered_start), (covered_end, end)]
+            self.highlighted_range = (min(start, covered_start), max(end, covered_end))
+        else:
+            ranges = [(start, end)]
+            self.highlighted_range = (start, end)
 
+        word = self.last_highlighted_word.encode('utf-8')
+        self.SendScintilla(self.SCI_SETINDICATORCURRENT, self.highlight_indicator)
+        # Set search flags with word boundaries
+        self.SendScintilla(self.SCI_SETSEARCHFLAGS, QsciScintilla.SCFIND_WHOLEWORD)
+        for search_pos, range_end in ranges:
+            while search_pos < range_end and self.highlight_count < HIGHLIGHT_MAX_MATCHES:
+                self.SendScintilla(self.SCI_SETTARGETSTART, search_pos)
+                self.SendScintilla(self.SCI_SETTARGETEND, range_end)
+                found_pos = self.SendScintilla(self.SCI_SEARCHINTARGET, len(word), word)
+                if found_pos == -1:  # No more words found
+                    break
+                self.SendScintilla(self.SCI_INDICATORFILLRANGE, found_pos, len(word))
+                self.highlight_count += 1
+                search_pos = found_pos + len(word)
         # Restore search state (if needed)
         self.SendScintilla(self.SCI_SETSEARCHFLAGS, 0)
 
@@ -357,121 +523,104 @@ class CodeEditor(QsciScintilla):
         super().mousePressEvent(event)
 
     def gotoDefinition(self, word):
-        """Find the keyword definition in .tags files, first in current file, then in project."""
+        """Jump to the best ranked definition of word, or let the user pick when several remain."""
         # Check if the current file exists
         if not hasattr(self, 'file_path') or not self.file_path:
             QMessageBox.warning(self, "CTags Error", "No file path available for this editor!")
             return
 
-        # .tags file of the current file (e.g. main.c.tags)
-        file_tag = f"{self.file_path}.tags"
-
-        # project.tags file of the project directory
-        project_dir = self.GUI.project_view.get_project_directory() if self.GUI.project_view else None
-        project_tag = str(Path(project_dir) / "project.tags") if project_dir else None
-
-        # Check if the current file has been modified
-        if self.isModified() or not self.tags_cache:
-            # Only regenerate tags if the file has changed or the cache is empty
-            if not os.path.exists(file_tag):
-                if not self.GUI.ctags_handler.generate_ctags():
-                    QMessageBox.warning(self, "CTags Error", "Failed to generate tags file!")
-                    return
+        # A file changed on disk since it was indexed is re-tagged in the background (never a huge file),
+        # the lookup below uses the index as it is and the overlay of unsaved edits
+        if not self.large_file:
+            self.GUI.ctags_scheduler.index_file(self.file_path)
 
-            # Create a list of .tags files to update
-            tag_files = [file_tag]
-            if project_tag and os.path.exists(project_tag):
-                tag_files.append(project_tag)
-
-            # Update self.tags_cache with both file_tag and project_tag
-            self.update_tags_cache(tag_files)
+        project_dir = self.GUI.project_view.current_project_directory if self.GUI.project_view else None
+        candidates = rank_definitions(self.find_definitions(word), self.file_path, project_dir)
+        if not candidates:
+            # If not found, display an error message
+            QMessageBox.warning(self, "CTags", f"Definition for '{word}' not found!")
+            return
 
-        # Search for definition in self.tags_cache
-        definition = self.tags_cache.get(word)
+        # Several definitions with the same rank (e.g. per-MCU #ifdef variants) are left to the user
+        best = [candidate for candidate in candidates if candidate[0] == candidates[0][0]]
+        definition = best[0][1] if len(best) == 1 else self.pick_definition(word, [c[1] for c in candidates])
         if definition:
-            file_path, line_number, column = definition
+            file_path, line_number, column, kind, scope = definition
             self.open_file_at_line(file_path, line_number, column)
-            return
 
-        # If not found, display an error message
-        QMessageBox.warning(self, "CTags", f"Definition for '{word}' not found!")
+    def find_definitions(self, word):
+        """Return every known definition of word as (file_path, line, column, kind, scope)."""
+        symbol_db = CtagsHandler.symbol_db
+        candidates = symbol_db.lookup(word) if symbol_db else []
+        for tags_file in CtagsHandler.tag_files:
+            candidates = candidates + tags_file.lookup(word)
+
+        # The definitions of an unsaved buffer come from its overlay instead of the file on disk
+        overlay = self.buffer_overlay()
+        if overlay is not None:
+            own_path = normalize_path(self.file_path)
+            candidates = [c for c in candidates if c[0] != own_path] + overlay.get(word, [])
+        return candidates
+
+    def pick_definition(self, word, candidates):
+        """Show a menu of definitions at the caret and return the chosen one, or None."""
+        menu = QMenu(self)
+        menu.setToolTip(f"Definitions of {word}")
+        for candidate in candidates:
+            file_path, line_number, column, kind, scope = candidate
+            label = f"{Path(file_path).name}:{line_number}   [{kind}]"
+            if scope:
+                label += f"   {scope}"
+            action = menu.addAction(label)
+            action.setData(candidate)
+            action.setToolTip(file_path)
+        caret = self.SendScintilla(self.SCI_GETCURRENTPOS)
+        x = self.SendScintilla(self.SCI_POINTXFROMPOSITION, 0, caret)
+        y = self.SendScintilla(self.SCI_POINTYFROMPOSITION, 0, caret) + self.textHeight(0)
+        chosen = menu.exec(self.viewport().mapToGlobal(QPoint(x, y)))
+        return chosen.data() if chosen else None
+
+    def update_tags_cache(self):
+        """Point the cache at the shared symbol table of the current file, including column position and kind."""
+        if not getattr(self, 'file_path', None) or not CtagsHandler.symbol_db:
+            tags_cache = {}
+        else:
+            tags_cache = shared_tags_cache.file_symbols(CtagsHandler.symbol_db, self.file_path)
+        if tags_cache is not self.tags_cache:
+            self.tags_cache = tags_cache
+            self.outline_model = None  # The Function List outline is rebuilt from the new cache
+
+    def buffer_overlay(self):
+        """Return {symbol: [(file_path, line, column, kind, scope)]} of the unsaved text, or None if saved.
+
+        Never waits for ctags: while the buffer is being tagged the last overlay is used, a few edits
+        behind, or None before the first one so the symbols of the file on disk are used.
+        """
+        if self.overlay_owner is not None:
+            return self.overlay_owner.buffer_overlay()
+        if not self.isModified() or self.large_file:
+            return None
+        if self.overlay_revision != self.document_revision:
+            self.update_buffer_overlay()
+        return self.overlay_tags
 
-    def update_tags_cache(self, tag_files):
-        """Update cache from multiple .tags files, including column position of the symbol."""
-        self.tags_cache.clear()  # Clear the cache once before updating
-        for tag_file in tag_files:
-            if not os.path.exists(tag_file):
-                continue
-            try:
-                with open(tag_file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        if line.startswith("!"):  # Skip comment
-                            continue
-                        parts = line.strip().split("\t")
-                        if len(parts) < 3:
-                            continue
-                        symbol = parts[0]
-                        file_path = parts[1]
-                        line_info = parts[2]
-
-                        # Determine tag type (if any)
-                        tag_type = parts[3] if len(parts) > 3 else 'unknown'
-
-                        # Process definition
-                        line_number = None
-                        column = 0
-                        if tag_type == 'd':  # Macro case (#define)
-                            # Find line information from the "line:" field
-                            for field in parts:
-                                if field.startswith("line:"):
-                                    line_number = int(field.split(":")[1])
-                                    break
-                            if line_number:
-                                # Read the line from the file to find the column position
-                                with open(file_path, "r", encoding="utf-8") as source_file:
-                                    for i, source_line in enumerate(source_file, 1):
-                                        if i == line_number:
-                                            column = source_line.find(symbol)
-                                            if column == -1:
-                                                column = 0
-                                            break
-                            else:
-                                # If there's no "line:", use the pattern from line_info
-                                if line_info.startswith("/^") and line_info.endswith("$/;\""):
-                                    pattern = line_info[2:-4].strip()
-                                    with open(file_path, "r", encoding="utf-8") as source_file:
-                                        for i, source_line in enumerate(source_file, 1):
-                                            if pattern in source_line.strip():
-                                                line_number = i
-                                                column = source_line.find(symbol)
-                                                if column == -1:
-                                                    column = 0
-                                                break
-                        elif line_info.startswith("/^") and line_info.endswith("$/;\""):
-                            pattern = line_info[2:-4].strip()
-                            with open(file_path, "r", encoding="utf-8") as source_file:
-                                for i, source_line in enumerate(source_file, 1):
-                                    if pattern in source_line.strip():
-                                        line_number = i
-                                        column = source_line.find(symbol)
-                                        if column == -1:
-                                            column = 0
-                                        break
-                        elif line_info.isdigit():
-                            line_number = int(line_info)
-                            # Read the line from the file to find the column position
-                            with open(file_path, "r", encoding="utf-8") as source_file:
-                                for i, source_line in enumerate(source_file, 1):
-                                    if i == line_number:
-                                        column = source_line.find(symbol)
-                                        if column == -1:
-                                            column = 0
-                                        break
-
-                        if line_number is not None:
-                            self.tags_cache[symbol] = (file_path, line_number, column)
-            except Exception as e:
-                return
+    def update_buffer_overlay(self):
+        """Tag the unsaved buffer on the thread pool, unless its overlay is current or already being built."""
+        if not self.isModified() or self.large_file or not getattr(self, 'file_path', None) or self.overlay_owner:
+            return
+        if CtagsHandler.ctags_path is None or self.overlay_job is not None or self.overlay_revision == self.document_revision:
+            return
+        self.overlay_job = BufferTagJob(self.file_path, self.text(), self.document_revision)
+        self.overlay_job.signals.tagged.connect(self.on_buffer_tagged)
+        QThreadPool.globalInstance().start(self.overlay_job)
+
+    def on_buffer_tagged(self, revision, overlay):
+        self.overlay_job = None
+        self.overlay_tags = overlay
+        self.overlay_revision = revision
+        # Edits made while ctags ran are tagged next, unless the typing pause timer will do it
+        if revision != self.document_revision and not self.overlay_timer.isActive():
+            self.update_buffer_overlay()
 
     def open_file_at_line(self, file_path, line_number, column=0):
         """Open the file and jump to the corresponding line and column. Return True if successful."""
@@ -482,8 +631,9 @@ class CodeEditor(QsciScintilla):
         # Check if the file is already open
         for i in range(self.GUI.tabWidget.count()):
             editor = self.GUI.tabWidget.widget(i)
-            if hasattr(editor, 'file_path') and editor.file_path == file_path:
+            if hasattr(editor, 'file_path') and editor.file_path and normalize_path(editor.file_path) == normalize_path(file_path):
                 self.GUI.tabWidget.setCurrentIndex(i)
+                editor = self.GUI.tabWidget.widget(i)  # A restored tab is loaded by the switch
                 editor.setCursorPosition(line_number - 1, column)  # Set the cursor at the correct column
                 editor.ensureLineVisible(line_number - 1)
                 return True
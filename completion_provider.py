@@ -0,0 +1,100 @@
+# completion_provider.py
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from bisect import bisect_left
+from pathlib import Path
+import os
+
+MAX_COMPLETIONS = 200  # Names offered per popup, typing more letters narrows the list
+
+def cache_path(symbol_db):
+    """Return the completion list cache file stored next to a symbol database."""
+    return Path(symbol_db.db_path).with_suffix(".completions")
+
+class CompletionProvider:
+    """Symbol names of the workspace sorted case-insensitively, shared by every editor for autocompletion."""
+    def __init__(self):
+        self.names = []   # Names in folded order
+        self.folded = []  # name.casefold() of each entry, for bisect
+        self.known = set()
+
+    def __len__(self):
+        return len(self.names)
+
+    def set_names(self, sorted_names):
+        """Replace the list with names already sorted by casefold, e.g. from prepare_names()."""
+        self.names = sorted_names
+        self.folded = [name.casefold() for name in sorted_names]
+        self.known = set(sorted_names)
+
+    def add_names(self, names):
+        """Insert the names not known yet, e.g. the symbols of a freshly indexed file."""
+        for name in names:
+            if name not in self.known:
+                self.known.add(name)
+                folded = name.casefold()
+                position = bisect_left(self.folded, folded)
+                self.folded.insert(position, folded)
+                self.names.insert(position, name)
+
+    def complete(self, prefix, limit=MAX_COMPLETIONS):
+        """Return up to limit names starting with prefix, ignoring case."""
+        folded_prefix = prefix.casefold()
+        start = bisect_left(self.folded, folded_prefix)
+        completions = []
+        for i in range(start, min(start + limit, len(self.names))):
+            if not self.folded[i].startswith(folded_prefix):
+                break
+            completions.append(self.names[i])
+        return completions
+
+def prepare_names(names):
+    """Sort names the way CompletionProvider expects them."""
+    return sorted(set(names), key=str.casefold)
+
+def load_cached_names(path):
+    """Return the names of a completion cache file, or None if there is none."""
+    try:
+        with open(path, "r", encoding="utf-8") as cache_file:
+            return cache_file.read().split("\n") if os.path.getsize(path) else []
+    except OSError:
+        return None
+
+def save_cached_names(path, names):
+    """Write a completion cache file, replacing the previous one atomically."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as cache_file:
+        cache_file.write("\n".join(names))
+    os.replace(temp_path, path)
+
+class CompletionSignals(QObject):
+    prepared = pyqtSignal(object, object)  # (symbol database, names sorted by casefold)
+
+class CompletionPrepareJob(QRunnable):
+    """Prepare the completion list of a symbol database on a worker thread.
+
+    The list cached on disk is published first so completions work right away, then the list is
+    rebuilt from the database and the cache rewritten.
+    """
+    def __init__(self, symbol_db, use_cache=True):
+        super().__init__()
+        self.symbol_db = symbol_db
+        self.use_cache = use_cache
+        self.signals = CompletionSignals()
+
+    def run(self):
+        path = cache_path(self.symbol_db)
+        if self.use_cache:
+            cached = load_cached_names(path)
+            if cached is not None:
+                self.signals.prepared.emit(self.symbol_db, cached)
+        try:
+            names = prepare_names(self.symbol_db.symbol_names())
+        except Exception:
+            return  # The database was closed by a project switch, a new job follows
+        try:
+            save_cached_names(path, names)
+        except OSError:
+            pass  # Completions still work, only the next start is slower
+        self.signals.prepared.emit(self.symbol_db, names)
+
+shared_completions = CompletionProvider()
@@ -1,15 +1,335 @@
 import subprocess
+import threading
+import tempfile
+import json
 import os, sys
 from PyQt6.QtWidgets import QMessageBox, QDialog, QLabel, QLineEdit, QVBoxLayout, QPushButton, QFileDialog, QApplication
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
 from pathlib import Path
 
+from symbol_database import normalize_path, file_signature
+from tag_resolver import resolve_file_tags
+from xref_index import index_references
+
 def resource_path(relative_path):
     if hasattr(sys, '_MEIPASS'):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.abspath("."), relative_path)
 
+SOURCE_EXTENSIONS = ('.c', '.cpp', '.h', '.hpp', '.py')  # Files that get tagged
+
+# Long kind names of the JSON output mapped to the single letters of the tags format
+KIND_LETTERS = {
+    "function": "f", "prototype": "p", "variable": "v", "externvar": "x", "macro": "d",
+    "typedef": "t", "struct": "s", "union": "u", "enum": "g", "enumerator": "e",
+    "member": "m", "local": "l", "parameter": "z", "label": "L", "header": "h",
+}
+
+def parse_tag_line(line):
+    """Parse one line of ctags output into a dict, or return None for headers and malformed lines."""
+    if line.startswith("!"):  # Skip comment
+        return None
+    parts = line.rstrip("\r\n").split("\t")
+    if len(parts) < 3:
+        return None
+    tag = {"name": parts[0], "path": parts[1], "address": parts[2], "kind": "unknown", "line": None, "scope": None}
+    for field in parts[3:]:
+        key, sep, value = field.partition(":")
+        if not sep:
+            tag["kind"] = field  # Single letter kind, e.g. 'f', 'v', 'd'
+        elif key == "line" and value.isdigit():
+            tag["line"] = int(value)
+        elif key in ("struct", "union", "enum", "function", "class", "namespace"):
+            tag["scope"] = value
+    if tag["line"] is None and tag["address"].isdigit():
+        tag["line"] = int(tag["address"])
+    return tag
+
+def parse_json_tag(line):
+    """Parse one line of ctags JSON output into the same dict as parse_tag_line."""
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    if entry.get("_type") != "tag" or "name" not in entry or "path" not in entry:
+        return None
+    kind = entry.get("kind", "unknown")
+    return {
+        "name": entry["name"],
+        "path": entry["path"],
+        "address": entry.get("pattern", ""),
+        "kind": KIND_LETTERS.get(kind, kind),
+        "line": entry.get("line"),
+        "scope": entry.get("scope"),
+    }
+
+def ctags_supports_json():
+    """Return True if the configured ctags can write JSON, checking the executable only once."""
+    if CtagsHandler.json_output is None:
+        try:
+            result = subprocess.run([CtagsHandler.ctags_path, "--list-features"], capture_output=True,
+                                    text=True, errors="replace", shell=(os.name == "nt"))
+            CtagsHandler.json_output = any(line.split()[:1] == ["json"] for line in result.stdout.splitlines())
+        except Exception as e:
+            CtagsHandler.json_output = False
+    return CtagsHandler.json_output
+
+def stream_ctags(paths, is_cancelled=None):
+    """Run one ctags process over paths, fed through a file list on stdin, and yield tags as they are written."""
+    use_json = ctags_supports_json()
+    ctags_cmd = [CtagsHandler.ctags_path, "--fields=+n", "--kinds-C=+dpx", "--sort=no", "-f", "-", "-L", "-"]
+    if use_json:
+        ctags_cmd.insert(1, "--output-format=json")
+    parse = parse_json_tag if use_json else parse_tag_line
+
+    process = subprocess.Popen(ctags_cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True, encoding="utf-8", errors="replace", shell=(os.name == "nt"))
+    errors = []
+
+    def feed_file_list():
+        # Written from a thread so a full stdout pipe can never block the file list
+        try:
+            for path in paths:
+                process.stdin.write(path + "\n")
+            process.stdin.close()
+        except OSError:
+            pass
+
+    def drain_stderr():
+        errors.append(process.stderr.read())
+
+    threads = [threading.Thread(target=feed_file_list, daemon=True), threading.Thread(target=drain_stderr, daemon=True)]
+    for thread in threads:
+        thread.start()
+    try:
+        for line in process.stdout:
+            if is_cancelled and is_cancelled():
+                return
+            tag = parse(line)
+            if tag is not None:
+                yield tag
+    finally:
+        if process.poll() is None and is_cancelled and is_cancelled():
+            process.kill()
+        returncode = process.wait()
+        for thread in threads:
+            thread.join()
+        process.stdout.close()
+    if returncode != 0:
+        raise RuntimeError("".join(errors) or "Unknown error occurred.")
+
+def tag_buffer(file_path, text):
+    """Tag unsaved buffer text as if it were file_path. Returns a list of (name, line, column, kind, scope)."""
+    with tempfile.NamedTemporaryFile("w", suffix=Path(file_path).suffix, encoding="utf-8", delete=False) as snapshot:
+        snapshot.write(text)
+    try:
+        return resolve_file_tags(snapshot.name, list(stream_ctags([snapshot.name])))
+    finally:
+        os.remove(snapshot.name)
+
+class BufferTagSignals(QObject):
+    tagged = pyqtSignal(int, object)  # (document revision, {symbol: [(file_path, line, column, kind, scope)]} or None)
+
+class BufferTagJob(QRunnable):
+    """Tag a snapshot of an unsaved buffer on a worker thread, for the go-to-definition overlay."""
+    def __init__(self, file_path, text, revision):
+        super().__init__()
+        self.file_path = file_path
+        self.text = text
+        self.revision = revision
+        self.signals = BufferTagSignals()
+
+    def run(self):
+        try:
+            overlay = {}
+            for symbol, line_number, column, kind, scope in tag_buffer(self.file_path, self.text):
+                overlay.setdefault(symbol, []).append((self.file_path, line_number, column, kind, scope))
+        except Exception:
+            overlay = None  # Fall back to the symbols of the file on disk
+        self.text = None
+        self.signals.tagged.emit(self.revision, overlay)
+
+def collect_source_files(directory):
+    """Return every taggable source file below directory."""
+    source_files = []
+    for root, dirs, files in os.walk(directory):
+        for name in files:
+            if Path(name).suffix.lower() in SOURCE_EXTENSIONS:
+                source_files.append(os.path.join(root, name))
+    return source_files
+
+def index_files(symbol_db, paths, is_cancelled=None):
+    """Tag the given files in one ctags process, storing each file as soon as its tags have streamed in.
+
+    Return False if cancelled.
+    """
+    paths = list(paths)
+    if not paths:
+        return True
+    # Take the signatures before tagging so a file edited meanwhile stays stale
+    signatures = {normalize_path(path): file_signature(path) for path in paths}
+    pending = set(signatures)
+
+    def store(key, tags):
+        # Each source file is read once to resolve the locations of all of its tags
+        if key in pending:
+            symbol_db.store_file(key, resolve_file_tags(key, tags), signatures[key])
+            pending.discard(key)
+        elif key in signatures:
+            symbol_db.add_symbols(key, resolve_file_tags(key, tags))  # Tags of a file written in several runs
+
+    # With --sort=no ctags writes the tags of one file after the other
+    current_key, current_tags = None, []
+    for tag in stream_ctags(paths, is_cancelled):
+        key = normalize_path(tag["path"])
+        if key != current_key:
+            if current_key is not None:
+                store(current_key, current_tags)
+            current_key, current_tags = key, []
+        current_tags.append(tag)
+    if is_cancelled and is_cancelled():
+        return False
+    if current_key is not None:
+        store(current_key, current_tags)
+
+    # Files without any tag are stored too, so they are not re-tagged next time
+    for key in list(pending):
+        store(key, [])
+    return True
+
+def index_project(symbol_db, directory, is_cancelled=None):
+    """Re-tag the changed files of a project and drop the files that were deleted. Return False if cancelled."""
+    source_files = collect_source_files(directory)
+    if not index_files(symbol_db, symbol_db.stale_files(source_files), is_cancelled):
+        return False
+    symbol_db.prune(directory, source_files)
+    # The cross-reference index follows the same files once their symbols are stored
+    return index_references(symbol_db, source_files, is_cancelled)
+
+class CtagsJobSignals(QObject):
+    finished = pyqtSignal(str)      # job key (normalized file or project path)
+    failed = pyqtSignal(str, str)   # (job key, error message)
+    done = pyqtSignal()             # run() returned, whatever the outcome
+
+class CtagsJob(QRunnable):
+    """Index the symbols and cross-references of one file or a whole project on a worker thread."""
+    def __init__(self, key, symbol_db, is_project=False):
+        super().__init__()
+        self.key = key
+        self.symbol_db = symbol_db
+        self.is_project = is_project
+        self.cancelled = False
+        self.signals = CtagsJobSignals()
+
+    def cancel(self):
+        """Ask the job to stop its ctags process and drop its result."""
+        self.cancelled = True
+
+    def run(self):
+        try:
+            if self.cancelled:
+                return
+            if self.is_project:
+                done = index_project(self.symbol_db, self.key, lambda: self.cancelled)
+            else:
+                done = index_files(self.symbol_db, self.symbol_db.stale_files([self.key]), lambda: self.cancelled)
+                done = done and index_references(self.symbol_db, [self.key], lambda: self.cancelled)
+            if done and not self.cancelled:
+                self.signals.finished.emit(self.key)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(self.key, str(e))
+        finally:
+            self.signals.done.emit()
+
+class CtagsScheduler(QObject):
+    """Run ctags jobs on a thread pool so tagging never blocks the GUI thread."""
+    fileIndexed = pyqtSignal(str)       # normalized path of a file whose symbols are up to date
+    projectIndexed = pyqtSignal(str)    # normalized project directory
+    indexFailed = pyqtSignal(str, str)  # (path, error message)
+
+    def __init__(self, parent=None, max_threads=2):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.jobs = {}  # {key: CtagsJob} of queued or running jobs
+        self.submitted = set()  # Every job the pool may still run or report on, kept alive until its done signal
+
+    def index_file(self, file_path):
+        """Queue tagging of one file, unless it is already indexed or queued."""
+        if not file_path or CtagsHandler.ctags_path is None or CtagsHandler.symbol_db is None:
+            return
+        if Path(file_path).suffix.lower() not in SOURCE_EXTENSIONS:
+            return
+        key = normalize_path(file_path)
+        if key in self.jobs and not self.jobs[key].cancelled:
+            return
+        # Framework files are served by the shared framework index, current ones are never re-tagged here
+        if CtagsHandler.symbol_db.in_framework(key) or (
+                CtagsHandler.symbol_db.is_current(key) and not CtagsHandler.symbol_db.stale_reference_files([key])):
+            self.fileIndexed.emit(key)
+            return
+        self.submit(CtagsJob(key, CtagsHandler.symbol_db))
+
+    def index_project(self, directory):
+        """Queue re-indexing of a whole project directory."""
+        if not directory or CtagsHandler.ctags_path is None or CtagsHandler.symbol_db is None:
+            return
+        key = normalize_path(directory)
+        if key in self.jobs:
+            self.withdraw(self.jobs[key])
+        self.submit(CtagsJob(key, CtagsHandler.symbol_db, is_project=True))
+
+    def submit(self, job):
+        # Python owns the job: cancelled ones leave self.jobs while their queued signals may still be delivered
+        job.setAutoDelete(False)
+        self.jobs[job.key] = job
+        self.submitted.add(job)
+        job.signals.finished.connect(lambda key, job=job: self.on_job_finished(job, True))
+        job.signals.failed.connect(lambda key, message, job=job: self.on_job_failed(job, message))
+        job.signals.done.connect(lambda job=job: self.submitted.discard(job))
+        self.pool.start(job)
+
+    def withdraw(self, job):
+        """Cancel a job, dropping it at once if the pool had not started it."""
+        job.cancel()
+        if self.pool.tryTake(job):
+            self.submitted.discard(job)
+
+    def on_job_finished(self, job, success):
+        if self.jobs.get(job.key) is job:
+            del self.jobs[job.key]
+        if success:
+            if job.is_project:
+                self.projectIndexed.emit(job.key)
+            else:
+                self.fileIndexed.emit(job.key)
+
+    def on_job_failed(self, job, message):
+        self.on_job_finished(job, False)
+        self.indexFailed.emit(job.key, message)
+
+    def cancel_stale(self, keep_paths):
+        """Cancel the queued file jobs whose file is not in keep_paths, e.g. after a tab switch."""
+        keep = {normalize_path(path) for path in keep_paths if path}
+        for key, job in list(self.jobs.items()):
+            if not job.is_project and key not in keep:
+                self.withdraw(job)
+                del self.jobs[key]
+
+    def cancel_all(self, wait=False):
+        """Cancel every job, optionally waiting for the running ones to stop."""
+        for job in self.jobs.values():
+            self.withdraw(job)
+        self.jobs.clear()
+        if wait:
+            self.pool.waitForDone()
+
 class CtagsHandler:
     ctags_path = None  # Class-level variable to store the ctags path
+    json_output = None  # Whether ctags_path supports --output-format=json, detected on first use
+    symbol_db = None   # Class-level SymbolDatabase of the current workspace
+    tag_files = []     # Sorted tags files (tag_file_index.SortedTagsFile) searched in place besides symbol_db
 
     def __init__(self, editor):
         self.editor = editor  # Reference to the editor instance
@@ -17,45 +337,22 @@ class CtagsHandler:
             QMessageBox.information(self.editor, "CTags Path", "CTags path not set. Please set the path to the ctags executable.")
 
     def generate_ctags(self):
-        """Generate CTags for the current file, only for supported source files."""
-        if not self.editor.file_path:
+        """Index the current file into the symbol database, skipping it if it did not change."""
+        file_path = getattr(self.editor, 'file_path', None)
+        if not file_path or CtagsHandler.symbol_db is None:
             return False
 
-        # Create a .tags file name based on file_path
-        tags_file = f"{self.editor.file_path}.tags"  # Example: Queue.c.tags
-
-        # Check write permission in the directory containing the file
-        target_dir = Path(self.editor.file_path).parent
-        if not os.access(target_dir, os.W_OK):
-            QMessageBox.warning(self.editor, "CTags Error", f"No write permission in directory: {target_dir}")
-            return False
+        # Files that are unchanged since the last session are not re-tagged
+        if CtagsHandler.symbol_db.is_current(file_path):
+            return True
 
         try:
-            # Command to generate CTags for the current file
-            ctags_cmd = [CtagsHandler.ctags_path, "--fields=+n", "--kinds-C=+d", "-o", tags_file, self.editor.file_path]
-            result = subprocess.run(ctags_cmd, capture_output=True, text=True, shell=True)
-
-            if result.returncode == 0:
-                return True
-            else:
-                # Display detailed error from stdout/stderr
-                error_message = result.stderr or result.stdout or "Unknown error occurred."
-                QMessageBox.warning(self.editor, "CTags Error", f"Failed to generate tags file:\n{error_message}")
-                return False
+            index_files(CtagsHandler.symbol_db, [file_path])
+            return True
         except Exception as e:
-            QMessageBox.warning(self.editor, "CTags Error", f"Exception occurred while generating tags:\n{str(e)}")
+            QMessageBox.warning(self.editor, "CTags Error", f"Failed to generate tags:\n{str(e)}")
             return False
 
-    def remove_ctags(self):
-        """Remove the .tags file associated with the current editor's file."""
-        if hasattr(self.editor, 'file_path') and self.editor.file_path:
-            tags_file_path = f"{self.editor.file_path}.tags"
-            if os.path.exists(tags_file_path):
-                try:
-                    os.remove(tags_file_path)
-                except Exception as e:
-                    QMessageBox.warning(self.editor, "CTags Error", f"Failed to remove tags file:\n{str(e)}")
-
     def update_ctags(self):
         """Update CTags for the current editor's file."""
         self.generate_ctags()  # Simply regenerate CTags
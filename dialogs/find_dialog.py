@@ -1,4 +1,6 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTabWidget, QWidget,
+                             QCheckBox, QGroupBox, QRadioButton, QMessageBox)
+from PyQt6.Qsci import QsciScintilla
 
 # Add this class for the Find Dialog
 class FindDialog(QDialog):
@@ -407,11 +409,21 @@ class FindDialog(QDialog):
 
         total_count = 0
         results = []
-
-        # Search in all tabs
-        for i in range(self.parent.tabWidget.count()):
-            editor = self.parent.tabWidget.widget(i)
-            file_name = self.parent.tabWidget.tabText(i)
+        still_loading = []
+
+        # Search in all tabs, taken before loading restored ones: a tab whose file is gone is removed meanwhile
+        tab_widget = self.parent.tabWidget
+        for widget in [tab_widget.widget(i) for i in range(tab_widget.count())]:
+            index = tab_widget.indexOf(widget)
+            if index < 0:
+                continue
+            editor = self.parent.materialize_tab(index)  # Restored tabs not shown yet are searched too
+            if editor is None:
+                continue
+            file_name = tab_widget.tabText(tab_widget.indexOf(editor))
+            if getattr(editor, 'loader', None):
+                still_loading.append(file_name)  # A large file still being read would be searched partly
+                continue
 
             # Save current position
             original_line, original_index = editor.getCursorPosition()
@@ -438,7 +450,7 @@ class FindDialog(QDialog):
                     self.regex_mode.isChecked(),
                     self.match_case.isChecked(),
                     self.whole_word.isChecked(),
-                    True,  # wrap
+                    False,  # no wrap: findNext would cycle through the matches forever
                     True,  # forward
                     0, 0,  # from start
                     False  # don't move cursor
@@ -464,11 +476,14 @@ class FindDialog(QDialog):
                 editor.setCursorPosition(original_line, original_index)
 
         # Show results
+        skipped = f"\n\nStill loading, not searched: {', '.join(still_loading)}" if still_loading else ""
+        if still_loading:
+            self.parent.statusBar().showMessage(f"Find All skipped files still loading: {', '.join(still_loading)}", 5000)
         if total_count > 0:
             result_text = "Found matches in:\n" + "\n".join(results)
-            QMessageBox.information(self, "Find All", f"{result_text}\n\nTotal: {total_count} occurrence(s)")
+            QMessageBox.information(self, "Find All", f"{result_text}\n\nTotal: {total_count} occurrence(s){skipped}")
         else:
-            QMessageBox.information(self, "Find All", "No matches found in any open documents")
+            QMessageBox.information(self, "Find All", f"No matches found in any open documents{skipped}")
 
     def replace_find_next(self):
         """Find the next occurrence of the text to replace."""
@@ -0,0 +1,76 @@
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QLineEdit, QListWidget, QListWidgetItem
+from PyQt6.QtCore import Qt
+from pathlib import Path
+
+from symbol_database import rank_definitions
+
+MAX_RESULTS = 100  # Rows listed at most, one per definition
+
+class GoToSymbolDialog(QDialog):
+    """Ctrl+T palette: fuzzy search over every indexed symbol, updated as you type."""
+    def __init__(self, parent, search_index, symbol_db, project_dir=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.search_index = search_index
+        self.symbol_db = symbol_db
+        self.project_dir = project_dir
+        self.setWindowTitle("Go to Symbol in Project")
+        self.resize(600, 400)
+
+        layout = QVBoxLayout()
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("Symbol name, e.g. gpioinit or HAL_GPIO")
+        self.query_input.textChanged.connect(self.update_results)
+        self.query_input.returnPressed.connect(self.open_selected)
+        layout.addWidget(self.query_input)
+
+        self.result_list = QListWidget()
+        self.result_list.setUniformItemSizes(True)
+        self.result_list.itemActivated.connect(self.open_selected)
+        layout.addWidget(self.result_list)
+
+        self.summary_label = QLabel(f"{len(search_index)} symbols indexed")
+        layout.addWidget(self.summary_label)
+        self.setLayout(layout)
+
+    def update_results(self, text):
+        """Run the query and list the definitions of the best matching names."""
+        self.result_list.clear()
+        editor = self.parent.get_current_editor()
+        current_file = getattr(editor, 'file_path', None) or ""
+        rows = 0
+        for name in self.search_index.search(text, MAX_RESULTS):
+            definitions = self.symbol_db.lookup(name) if self.symbol_db else []
+            for _, (file_path, line_number, column, kind, scope) in rank_definitions(definitions, current_file, self.project_dir):
+                item = QListWidgetItem(f"{name}    [{kind}]    {Path(file_path).name}:{line_number}")
+                item.setToolTip(file_path)
+                item.setData(Qt.ItemDataRole.UserRole, (file_path, line_number, column))
+                self.result_list.addItem(item)
+                rows += 1
+            if rows >= MAX_RESULTS:
+                break
+        if self.result_list.count():
+            self.result_list.setCurrentRow(0)
+
+    def keyPressEvent(self, event):
+        # Arrow keys move through the results while the focus stays in the query field
+        if event.key() in (Qt.Key.Key_Up, Qt.Key.Key_Down, Qt.Key.Key_PageUp, Qt.Key.Key_PageDown):
+            self.result_list.keyPressEvent(event)
+            return
+        super().keyPressEvent(event)
+
+    def open_selected(self, *args):
+        """Jump to the selected definition and close the palette."""
+        item = self.result_list.currentItem()
+        if item is None:
+            return
+        file_path, line_number, column = item.data(Qt.ItemDataRole.UserRole)
+        editor = self.parent.get_current_editor()
+        if editor:
+            editor.open_file_at_line(file_path, line_number, column)
+        else:
+            editor = self.parent.open_file(file_path)
+            if editor:
+                editor.setCursorPosition(line_number - 1, column)
+                editor.ensureLineVisible(line_number - 1)
+        self.accept()
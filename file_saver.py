@@ -0,0 +1,153 @@
+# file_saver.py
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.Qsci import QsciScintilla
+import ctypes
+import os
+import tempfile
+import threading
+
+# Line ending written for each EOL mode of the editor
+LINE_ENDINGS = {
+    QsciScintilla.EolMode.EolWindows: b'\r\n',
+    QsciScintilla.EolMode.EolUnix: b'\n',
+    QsciScintilla.EolMode.EolMac: b'\r',
+}
+EOL_MODES = {line_ending.decode(): mode for mode, line_ending in LINE_ENDINGS.items()}
+UMASK = os.umask(0o022)  # Read once here: setting it from a worker thread would race other threads creating files
+os.umask(UMASK)
+
+def detect_eol_mode(text):
+    """Return the EOL mode of the first line break of text, or None if it has none."""
+    newline = text.find('\n')
+    carriage_return = text.find('\r', 0, newline if newline != -1 else len(text))
+    if carriage_return != -1:
+        return EOL_MODES['\r\n'] if text.startswith('\r\n', carriage_return) else EOL_MODES['\r']
+    return EOL_MODES['\n'] if newline != -1 else None
+
+def snapshot(editor):
+    """Copy the document of an editor as the UTF-8 bytes Scintilla holds, without building a Python string."""
+    length = editor.SendScintilla(QsciScintilla.SCI_GETTEXTLENGTH)
+    # The pointer is valid until the next edit, the copy is made before control returns to the event loop
+    return ctypes.string_at(editor.SendScintilla(QsciScintilla.SCI_GETCHARACTERPOINTER), length)
+
+def encode_document(data, encoding, line_ending):
+    """Turn a UTF-8 snapshot into the bytes of the file: every line break as line_ending, text in encoding."""
+    data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    if line_ending != b'\n':
+        data = data.replace(b'\n', line_ending)
+    if encoding != 'utf-8':
+        data = data.decode('utf-8').encode(encoding)
+    return data
+
+def write_atomic(file_path, data):
+    """Replace file_path with data: written to a temporary file next to it, synced, then renamed over it.
+
+    A crash or a full disk leaves either the old file or the new one, never a truncated mix.
+    """
+    file_path = os.path.realpath(file_path)  # Write through symlinks instead of replacing them
+    directory = os.path.dirname(file_path)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(temp_path, os.stat(file_path).st_mode & 0o7777)  # mkstemp creates the file as 0600
+        except FileNotFoundError:
+            os.chmod(temp_path, 0o666 & ~UMASK)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    if hasattr(os, 'O_DIRECTORY'):
+        # Make the rename itself durable on POSIX file systems
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+def save_key(file_path):
+    return os.path.normcase(os.path.realpath(file_path))
+
+class SaveJobSignals(QObject):
+    saved = pyqtSignal(str)         # file path
+    failed = pyqtSignal(str, str)   # (file path, error message)
+    done = pyqtSignal()             # run() returned, whatever the outcome
+
+class SaveJob(QRunnable):
+    """Encode a snapshot of a document and write it to its file on a worker thread."""
+    def __init__(self, file_path, data, encoding, line_ending, saver):
+        super().__init__()
+        self.file_path = file_path
+        self.key = save_key(file_path)
+        self.data = data
+        self.encoding = encoding
+        self.line_ending = line_ending
+        self.saver = saver
+        self.error = None
+        self.signals = SaveJobSignals()
+
+    def run(self):
+        try:
+            # Saves of one file run one at a time, a save overtaken by a newer one is not written
+            with self.saver.locks[self.key]:
+                if self.saver.latest.get(self.key) is not self:
+                    return
+                write_atomic(self.file_path, encode_document(self.data, self.encoding, self.line_ending))
+            self.signals.saved.emit(self.file_path)
+        except Exception as e:
+            self.error = str(e)
+            self.signals.failed.emit(self.file_path, self.error)
+        finally:
+            self.data = None
+            self.signals.done.emit()
+
+class FileSaver(QObject):
+    """Write editor snapshots to disk on a thread pool, several files in parallel, the GUI thread only copies."""
+    fileSaved = pyqtSignal(str)         # file path
+    saveFailed = pyqtSignal(str, str)   # (file path, error message)
+
+    def __init__(self, parent=None, max_threads=4):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.locks = {}  # {normalized path: threading.Lock} serializing the saves of one file
+        self.latest = {}  # {normalized path: SaveJob} newest save requested for each file
+        self.submitted = set()  # Every job the pool may still run or report on, kept alive until its done signal
+
+    def save(self, editor, file_path, wait=False):
+        """Snapshot editor and write it to file_path in its encoding and EOL mode. Return the SaveJob.
+
+        With wait the file is written before returning, job.error tells whether it failed.
+        """
+        job = SaveJob(file_path, snapshot(editor), editor.encoding, LINE_ENDINGS[editor.eolMode()], self)
+        self.locks.setdefault(job.key, threading.Lock())
+        self.latest[job.key] = job
+        job.signals.saved.connect(self.fileSaved)
+        job.signals.failed.connect(self.saveFailed)
+        if wait:
+            job.run()
+            return job
+        # Python owns the job so its signals outlive the pool's reference
+        job.setAutoDelete(False)
+        self.submitted.add(job)
+        job.signals.done.connect(lambda job=job: self.submitted.discard(job))
+        self.pool.start(job)
+        return job
+
+    def is_saving(self, file_path):
+        """Return True while a background save of file_path is queued or being written."""
+        key = save_key(file_path)
+        return any(job.key == key for job in self.submitted)
+
+    def wait(self):
+        """Block until every queued save is written, e.g. before the application exits."""
+        self.pool.waitForDone()
@@ -0,0 +1,95 @@
+# file_watcher.py
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+import os
+import time
+
+from symbol_database import file_signature
+
+SETTLE_MS = 300             # Quiet time after the last change before the open files are looked at
+MAX_DELAY_S = 2.0           # A build writing for longer is still reported this often
+
+class FileWatcher(QObject):
+    """Report changes made to the open files by other programs (make, code generators, git).
+
+    Change notifications are coalesced until the files settle; a file whose (mtime, size) still matches
+    what the editor last read or wrote is not reported, so the editor's own saves are ignored.
+    """
+    filesChanged = pyqtSignal(list)     # paths changed or deleted on disk
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.on_file_changed)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.signatures = {}  # {path: (mtime_ns, size) or None} as the editor last saw the file
+        self.missing = set()  # Deleted files, their directory is watched until they come back
+        self.pending = set()
+        self.first_change = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(SETTLE_MS)
+        self.timer.timeout.connect(self.flush)
+
+    def watch(self, file_path):
+        """Watch a file, taking its current state as the one the editor shows (after opening or saving it)."""
+        self.signatures[file_path] = file_signature(file_path)
+        if os.path.exists(file_path):
+            self.missing.discard(file_path)
+            if file_path not in self.watcher.files():
+                self.watcher.addPath(file_path)
+
+    def unwatch(self, file_path):
+        self.signatures.pop(file_path, None)
+        self.missing.discard(file_path)
+        self.pending.discard(file_path)
+        if file_path in self.watcher.files():
+            self.watcher.removePath(file_path)
+        self.watch_missing_directories()
+
+    def on_file_changed(self, file_path):
+        if file_path not in self.signatures:
+            return
+        self.pending.add(file_path)
+        now = time.monotonic()
+        if self.first_change is None:
+            self.first_change = now
+        # Every change of a burst pushes the check back, up to MAX_DELAY_S after the first one
+        if now - self.first_change < MAX_DELAY_S or not self.timer.isActive():
+            self.timer.start()
+
+    def on_directory_changed(self, directory):
+        for file_path in list(self.missing):
+            if os.path.dirname(file_path) == directory:
+                self.on_file_changed(file_path)
+
+    def flush(self):
+        self.first_change = None
+        changed = []
+        for file_path in self.pending:
+            if file_path not in self.signatures:
+                continue
+            signature = file_signature(file_path)
+            if signature is None:
+                self.missing.add(file_path)
+            else:
+                self.missing.discard(file_path)
+                # Replacing a file (write to temp, rename) drops the watch, it is set again
+                if file_path not in self.watcher.files():
+                    self.watcher.addPath(file_path)
+            if signature != self.signatures[file_path]:
+                self.signatures[file_path] = signature
+                changed.append(file_path)
+        self.pending.clear()
+        self.watch_missing_directories()
+        if changed:
+            self.filesChanged.emit(changed)
+
+    def watch_missing_directories(self):
+        """Watch the directories of deleted files, to see them created again."""
+        wanted = {os.path.dirname(file_path) for file_path in self.missing}
+        watched = set(self.watcher.directories())
+        for directory in wanted - watched:
+            if os.path.isdir(directory):
+                self.watcher.addPath(directory)
+        for directory in watched - wanted:
+            self.watcher.removePath(directory)
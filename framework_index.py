@@ -0,0 +1,115 @@
+# framework_index.py
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from pathlib import Path
+import hashlib
+import os
+
+from symbol_database import SymbolDatabase, index_directory, normalize_path
+from ctags_handler import collect_source_files, index_files
+from include_graph import framework_directories
+from xref_index import index_references
+
+def git_head(directory):
+    """Return the commit checked out in a git work tree, read from .git without running git, or None."""
+    git_dir = os.path.join(directory, ".git")
+    try:
+        if os.path.isfile(git_dir):  # Worktrees and submodules point to the real git directory
+            with open(git_dir, "r") as git_file:
+                git_dir = os.path.join(directory, git_file.read().split("gitdir:", 1)[1].strip())
+        with open(os.path.join(git_dir, "HEAD"), "r") as head_file:
+            head = head_file.read().strip()
+        if not head.startswith("ref:"):
+            return head
+        ref = head[4:].strip()
+        ref_path = os.path.join(git_dir, ref)
+        if os.path.isfile(ref_path):
+            with open(ref_path, "r") as ref_file:
+                return ref_file.read().strip()
+        with open(os.path.join(git_dir, "packed-refs"), "r") as packed_file:
+            for line in packed_file:
+                if line.rstrip().endswith(" " + ref):
+                    return line.split()[0]
+    except (OSError, IndexError):
+        pass
+    return None
+
+def framework_source_files(framework_path):
+    """Return the taggable files of the framework trees shared by every project."""
+    files = []
+    for directory in framework_directories(framework_path):
+        files.extend(collect_source_files(directory))
+    return files
+
+def framework_revision(framework_path, files=None):
+    """Identify the framework content: the git HEAD of the checkout, else a hash of its files' paths, times and sizes."""
+    head = git_head(framework_path)
+    if head:
+        return head
+    digest = hashlib.sha1()
+    for path in sorted(files if files is not None else framework_source_files(framework_path)):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f"{normalize_path(path)}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+def framework_index_path(framework_path, revision):
+    """Return the shared index file of one framework checkout at one revision."""
+    checkout = hashlib.sha1(normalize_path(framework_path).lower().encode("utf-8")).hexdigest()[:8]
+    return index_directory() / f"framework_{checkout}_{revision[:16]}.db"
+
+def build_framework_index(framework_path, files, target, is_cancelled=None):
+    """Index the framework into target. The file only appears once complete. Return False if cancelled."""
+    building = target.with_suffix(".building")
+    for leftover in (building, Path(f"{building}-wal"), Path(f"{building}-shm")):
+        if leftover.exists():
+            leftover.unlink()
+    symbol_db = SymbolDatabase(building)
+    try:
+        done = index_files(symbol_db, files, is_cancelled) and index_references(symbol_db, files, is_cancelled)
+        # Projects open the index read-only, which needs a plain rollback journal rather than WAL
+        symbol_db.connection.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        symbol_db.close()
+    if not done:
+        building.unlink()
+        return False
+    os.replace(building, target)
+    # Indexes of older revisions of the same checkout are never used again
+    prefix = target.name.rsplit("_", 1)[0] + "_"
+    for old in target.parent.glob(prefix + "*.db"):
+        if old != target:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+    return True
+
+class FrameworkIndexSignals(QObject):
+    ready = pyqtSignal(str)         # path of the framework index database
+    failed = pyqtSignal(str)        # error message
+
+class FrameworkIndexJob(QRunnable):
+    """Find or build the shared framework index on a worker thread."""
+    def __init__(self, framework_path):
+        super().__init__()
+        self.framework_path = framework_path
+        self.cancelled = False
+        self.signals = FrameworkIndexSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            files = framework_source_files(self.framework_path)
+            if not files:
+                return
+            target = framework_index_path(self.framework_path, framework_revision(self.framework_path, files))
+            if target.exists() or build_framework_index(self.framework_path, files, target, lambda: self.cancelled):
+                if not self.cancelled:
+                    self.signals.ready.emit(str(target))
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(str(e))
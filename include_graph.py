@@ -0,0 +1,401 @@
+# include_graph.py
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from collections import defaultdict, deque
+from pathlib import Path
+import posixpath
+import json
+import os
+import re
+
+from symbol_database import normalize_path, file_signature
+
+INCLUDE_DIRECTIVE = re.compile(r'^[ \t]*#[ \t]*include[ \t]*([<"])([^>"\n]+)[>"]', re.M)
+HEADER_EXTENSIONS = ('.h', '.hpp')
+C_SOURCE_EXTENSIONS = ('.c', '.cpp')
+FRAMEWORK_DIRS = ("STM32F4_Framework", "STM32F4_Drivers")  # Trees of the framework checkout holding headers
+
+def scan_includes(path):
+    """Return the #include directives of a file as a list of (line, name, is_system)."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as source_file:
+            text = source_file.read()
+    except OSError:
+        return []
+    directives = []
+    line_number = 1
+    position = 0
+    for match in INCLUDE_DIRECTIVE.finditer(text):
+        line_number += text.count("\n", position, match.start())
+        position = match.start()
+        directives.append((line_number, match.group(2).strip(), match.group(1) == "<"))
+    return directives
+
+# --- Makefile evaluation -------------------------------------------------------------------------
+# Only what the framework Makefiles use: :=, =, +=, ?=, ifeq/ifneq/ifdef/ifndef, include and $(foreach).
+
+MAKE_ASSIGNMENT = re.compile(r'^\s*([A-Za-z_][\w.]*)\s*(:=|::=|\+=|\?=|=)\s*(.*?)\s*$')
+MAKE_RULE = re.compile(r'^[^\s#=][^=]*?:(?!=)')
+
+def split_make_arguments(text):
+    """Split function arguments on the commas that are not nested in parentheses."""
+    arguments, depth, start = [], 0, 0
+    for i, c in enumerate(text):
+        if c in "({":
+            depth += 1
+        elif c in ")}":
+            depth -= 1
+        elif c == "," and depth == 0:
+            arguments.append(text[start:i])
+            start = i + 1
+    arguments.append(text[start:])
+    return arguments
+
+def expand_make(text, variables, depth=0):
+    """Expand $(VAR), ${VAR} and $(foreach ...) references. variables is {name: (value, recursive)}."""
+    if depth > 20 or "$" not in text:
+        return text
+    expanded = []
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if c == "$" and i + 1 < len(text):
+            opener = text[i + 1]
+            if opener in "({":
+                closer = ")" if opener == "(" else "}"
+                nesting, j = 1, i + 2
+                while j < len(text) and nesting:
+                    if text[j] == opener:
+                        nesting += 1
+                    elif text[j] == closer:
+                        nesting -= 1
+                    j += 1
+                expanded.append(expand_make_reference(text[i + 2:j - 1], variables, depth))
+                i = j
+                continue
+            expanded.append("$" if opener == "$" else variable_value(opener, variables, depth))
+            i += 2
+            continue
+        expanded.append(c)
+        i += 1
+    return "".join(expanded)
+
+def variable_value(name, variables, depth):
+    value, recursive = variables.get(name, ("", False))
+    return expand_make(value, variables, depth + 1) if recursive else value
+
+def expand_make_reference(inner, variables, depth):
+    """Expand the text between $( and ). Functions other than foreach expand to nothing."""
+    if inner.startswith("foreach "):
+        arguments = split_make_arguments(inner[len("foreach "):])
+        if len(arguments) != 3:
+            return ""
+        name = expand_make(arguments[0], variables, depth + 1).strip()
+        words = expand_make(arguments[1], variables, depth + 1).split()
+        local = dict(variables)
+        results = []
+        for word in words:
+            local[name] = (word, False)
+            results.append(expand_make(arguments[2], local, depth + 1).strip())
+        return " ".join(result for result in results if result)
+    if " " in inner or "\t" in inner:
+        return ""
+    return variable_value(expand_make(inner, variables, depth + 1), variables, depth)
+
+def read_makefile(path, variables, overrides, seen=None):
+    """Evaluate the variable assignments of a Makefile and of the files it includes into variables."""
+    seen = seen if seen is not None else set()
+    key = normalize_path(path)
+    if key in seen:
+        return
+    seen.add(key)
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as makefile:
+            lines = makefile.read().replace("\\\n", " ").split("\n")
+    except OSError:
+        return
+
+    conditions = []  # One bool per open ifeq/ifdef block
+    in_rules = False
+    for raw_line in lines:
+        line = raw_line.split("#", 1)[0].rstrip()
+        stripped = line.strip()
+        if not stripped:
+            continue
+        keyword = stripped.split(None, 1)[0]
+        if keyword in ("ifeq", "ifneq"):
+            arguments = split_make_arguments(stripped[len(keyword):].strip()[1:-1])
+            if len(arguments) == 2:
+                equal = expand_make(arguments[0], variables).strip() == expand_make(arguments[1], variables).strip()
+            else:
+                equal = False
+            conditions.append(equal if keyword == "ifeq" else not equal)
+            continue
+        if keyword in ("ifdef", "ifndef"):
+            defined = bool(variable_value(stripped[len(keyword):].strip(), variables, 0))
+            conditions.append(defined if keyword == "ifdef" else not defined)
+            continue
+        if keyword == "else" and conditions:
+            conditions[-1] = not conditions[-1]
+            continue
+        if keyword == "endif" and conditions:
+            conditions.pop()
+            continue
+        if not all(conditions):
+            continue
+        # Once rules start, tab-indented lines are recipes rather than assignments
+        if line.startswith("\t") and in_rules:
+            continue
+        if keyword in ("include", "-include", "sinclude"):
+            for included in expand_make(stripped[len(keyword):], variables).split():
+                if not os.path.isabs(included):
+                    included = os.path.join(os.path.dirname(path), included)
+                read_makefile(included, variables, overrides, seen)
+            continue
+        match = MAKE_ASSIGNMENT.match(line)
+        if match:
+            name, operator, value = match.groups()
+            if name in overrides:
+                continue  # Like variables given on the make command line
+            if operator == "=":
+                variables[name] = (value, True)
+            elif operator == "?=":
+                variables.setdefault(name, (value, True))
+            elif operator == "+=":
+                old_value, recursive = variables.get(name, ("", False))
+                if not recursive:
+                    value = expand_make(value, variables)
+                variables[name] = ((old_value + " " + value).strip(), recursive)
+            else:
+                variables[name] = (expand_make(value, variables), False)
+        elif MAKE_RULE.match(line):
+            in_rules = True
+
+def project_include_dirs(project_dir, framework_path=None):
+    """Return the existing include directories of a project, from its Makefile INC_DIRS and .taara_project."""
+    makefile_path = os.path.join(project_dir, "Makefile")
+    overrides = {}
+    variables = {}
+    read_makefile(makefile_path, variables, overrides)
+    # Makefiles generated on another machine point these elsewhere, use the local checkout instead
+    local_dirs = {"PROJECT_DIR": project_dir}
+    if framework_path:
+        local_dirs["FRAMEWORK_DIR"] = os.path.join(framework_path, "STM32F4_Framework")
+    for name, directory in local_dirs.items():
+        value = variable_value(name, variables, 0)
+        if value and not os.path.isdir(value):
+            overrides[name] = (directory.replace('\\', '/'), False)
+    if overrides:
+        variables = dict(overrides)
+        read_makefile(makefile_path, variables, overrides)
+
+    directories = expand_make("$(INC_DIRS)", variables).split()
+    try:
+        with open(os.path.join(project_dir, ".taara_project"), "r") as settings_file:
+            directories += json.load(settings_file).get("include_directories", [])
+    except (OSError, ValueError):
+        pass
+
+    include_dirs = []
+    for directory in directories:
+        if not os.path.isabs(directory):
+            directory = os.path.join(project_dir, directory)
+        directory = normalize_path(directory)
+        if os.path.isdir(directory) and directory not in include_dirs:
+            include_dirs.append(directory)
+    return include_dirs
+
+def framework_directories(framework_path):
+    """Return the framework trees that exist under a framework checkout."""
+    if not framework_path:
+        return []
+    return [normalize_path(os.path.join(framework_path, name)) for name in FRAMEWORK_DIRS
+            if os.path.isdir(os.path.join(framework_path, name))]
+
+def graph_files(project_dir, include_dirs, framework_dirs):
+    """Return the files of the include graph: project C files, headers of INC_DIRS and framework headers."""
+    extensions = HEADER_EXTENSIONS + C_SOURCE_EXTENSIONS
+    files = set()
+    for root, dirs, names in os.walk(project_dir):
+        files.update(os.path.join(root, name) for name in names if Path(name).suffix.lower() in extensions)
+    for directory in include_dirs:
+        try:
+            files.update(entry.path for entry in os.scandir(directory)
+                         if entry.is_file() and Path(entry.name).suffix.lower() in HEADER_EXTENSIONS)
+        except OSError:
+            pass
+    for directory in framework_dirs:
+        for root, dirs, names in os.walk(directory):
+            files.update(os.path.join(root, name) for name in names if Path(name).suffix.lower() in extensions)
+    return sorted(normalize_path(path) for path in files)
+
+class IncludeGraph:
+    """#include relationships between the files of a project, with their reverse edges.
+
+    Header/source switching and direct includers are dictionary lookups; transitive dependents are
+    computed once per header and cached until the graph changes.
+    """
+    def __init__(self, include_dirs=()):
+        self.include_dirs = list(include_dirs)
+        self.directives = {}                     # {path: [(line, name, is_system)]}
+        self.includes = {}                       # {path: [(line, target)]} of the resolved directives
+        self.included_by = defaultdict(dict)     # {target: {includer: line}}
+        self.unresolved = defaultdict(set)       # {basename: includers} of directives not resolved yet
+        self.by_basename = defaultdict(set)      # {basename: paths}
+        self.by_stem = defaultdict(set)          # {stem: paths}, for header/source switching
+        self.dependents_cache = {}
+
+    def load(self, directives_by_path):
+        """Add many files at once, resolving their directives after all of them are known."""
+        for path, directives in directives_by_path.items():
+            self.add_path(path)
+            self.directives[path] = directives
+        for path in directives_by_path:
+            self.link(path)
+        self.dependents_cache.clear()
+
+    def set_file(self, path, directives):
+        """Add or replace the directives of one file, e.g. after it was saved."""
+        path = normalize_path(path)
+        is_new = path not in self.directives
+        self.unlink(path)
+        if is_new:
+            self.add_path(path)
+        self.directives[path] = directives
+        self.link(path)
+        # A new file may be the target that earlier directives could not find
+        if is_new:
+            for includer in list(self.unresolved.pop(posixpath.basename(path).lower(), ())):
+                self.unlink(includer)
+                self.link(includer)
+        self.dependents_cache.clear()
+
+    def remove_file(self, path):
+        path = normalize_path(path)
+        if path not in self.directives:
+            return
+        self.unlink(path)
+        del self.directives[path]
+        self.by_basename[posixpath.basename(path).lower()].discard(path)
+        self.by_stem[Path(path).stem.lower()].discard(path)
+        for includer in list(self.included_by.pop(path, {})):
+            self.unlink(includer)
+            self.link(includer)
+        self.dependents_cache.clear()
+
+    def add_path(self, path):
+        self.by_basename[posixpath.basename(path).lower()].add(path)
+        self.by_stem[Path(path).stem.lower()].add(path)
+
+    def link(self, path):
+        resolved = []
+        for line, name, is_system in self.directives[path]:
+            target = self.resolve(path, name, is_system)
+            if target is None:
+                self.unresolved[posixpath.basename(name).lower()].add(path)
+            else:
+                resolved.append((line, target))
+                self.included_by[target].setdefault(path, line)
+        self.includes[path] = resolved
+
+    def unlink(self, path):
+        for line, target in self.includes.pop(path, ()):
+            includers = self.included_by.get(target)
+            if includers is not None:
+                includers.pop(path, None)
+        for line, name, is_system in self.directives.get(path, ()):
+            includers = self.unresolved.get(posixpath.basename(name).lower())
+            if includers:
+                includers.discard(path)
+
+    def resolve(self, includer, name, is_system):
+        """Return the graph file an #include refers to, or None (e.g. compiler headers)."""
+        name = name.replace('\\', '/')
+        directories = self.include_dirs if is_system else [posixpath.dirname(includer)] + self.include_dirs
+        for directory in directories:
+            candidate = posixpath.normpath(posixpath.join(directory, name))
+            if candidate in self.directives:
+                return candidate
+        # Fall back to a unique file with that name, e.g. when INC_DIRS point outside this machine
+        suffix = "/" + name.lower().lstrip("./")
+        matches = [path for path in self.by_basename.get(posixpath.basename(name).lower(), ()) if path.lower().endswith(suffix)]
+        if matches:
+            return min(matches, key=lambda path: (not path.startswith(posixpath.dirname(includer)), path))
+        return None
+
+    def counterpart(self, path):
+        """Return the header of a source file or the source of a header, preferring the nearest one."""
+        path = normalize_path(path)
+        extension = Path(path).suffix.lower()
+        wanted = C_SOURCE_EXTENSIONS if extension in HEADER_EXTENSIONS else HEADER_EXTENSIONS
+        candidates = [candidate for candidate in self.by_stem.get(Path(path).stem.lower(), ())
+                      if Path(candidate).suffix.lower() in wanted]
+        if not candidates:
+            # Files outside the graph: look next to the file and in the sibling inc/src folders
+            directory = posixpath.dirname(path)
+            parent = posixpath.dirname(directory)
+            for folder in (directory, posixpath.join(parent, "inc"), posixpath.join(parent, "include"), posixpath.join(parent, "src")):
+                for candidate_extension in wanted:
+                    candidate = posixpath.join(folder, Path(path).stem + candidate_extension)
+                    if os.path.isfile(candidate):
+                        return candidate
+            return None
+        # The candidate sharing the longest directory prefix wins (src/x.c <-> inc/x.h)
+        return max(candidates, key=lambda candidate: (len(os.path.commonprefix([candidate, path])), candidate))
+
+    def includers(self, path):
+        """Return the files including path directly, as sorted (file, line of the #include)."""
+        return sorted(self.included_by.get(normalize_path(path), {}).items())
+
+    def dependents(self, path):
+        """Return every file that includes path directly or through other headers, as sorted (file, line)."""
+        path = normalize_path(path)
+        cached = self.dependents_cache.get(path)
+        if cached is not None:
+            return cached
+        found = {}
+        queue = deque([path])
+        while queue:
+            header = queue.popleft()
+            for includer, line in self.included_by.get(header, {}).items():
+                if includer not in found and includer != path:
+                    found[includer] = line
+                    queue.append(includer)
+        result = sorted(found.items())
+        self.dependents_cache[path] = result
+        return result
+
+def update_include_graph(symbol_db, project_dir, framework_path=None, is_cancelled=None):
+    """Rescan the #include directives of the changed files and return the resulting IncludeGraph."""
+    include_dirs = project_include_dirs(project_dir, framework_path)
+    framework_dirs = framework_directories(framework_path)
+    paths = graph_files(project_dir, include_dirs, framework_dirs)
+    for path in symbol_db.stale_include_files(paths):
+        if is_cancelled and is_cancelled():
+            return None
+        signature = file_signature(path)
+        symbol_db.store_includes(path, scan_includes(path), signature)
+    symbol_db.prune_includes(paths)
+
+    graph = IncludeGraph(include_dirs + [directory for directory in framework_dirs if directory not in include_dirs])
+    graph.load(symbol_db.all_includes())
+    return graph
+
+class IncludeGraphSignals(QObject):
+    finished = pyqtSignal(object, object)  # (symbol database, IncludeGraph)
+
+class IncludeGraphJob(QRunnable):
+    """Bring the include graph of a project up to date on a worker thread."""
+    def __init__(self, symbol_db, project_dir, framework_path=None):
+        super().__init__()
+        self.symbol_db = symbol_db
+        self.project_dir = project_dir
+        self.framework_path = framework_path
+        self.signals = IncludeGraphSignals()
+
+    def run(self):
+        try:
+            graph = update_include_graph(self.symbol_db, self.project_dir, self.framework_path)
+        except Exception:
+            return  # The database was closed by a project switch, a new job follows
+        if graph is not None:
+            self.signals.finished.emit(self.symbol_db, graph)
@@ -0,0 +1,101 @@
+# large_file.py
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.Qsci import QsciScintilla
+import codecs
+import os
+
+from text_encoding import detect_encoding
+from file_saver import detect_eol_mode
+
+LARGE_FILE_SIZE = 32 * 1024 * 1024      # Files from this size open in large-file mode
+LOAD_CHUNK_SIZE = 2 * 1024 * 1024       # Bytes appended to the document per event loop turn
+ENCODING_SAMPLE_SIZE = 64 * 1024        # Bytes looked at to guess the encoding of a large file
+
+def is_large_file(file_path):
+    try:
+        return os.path.getsize(file_path) >= LARGE_FILE_SIZE
+    except OSError:
+        return False
+
+def sample_encoding(file_path):
+    """Guess the encoding of a file from its first bytes."""
+    with open(file_path, 'rb') as f:
+        sample = f.read(ENCODING_SAMPLE_SIZE)
+    return detect_encoding(sample, complete=len(sample) < ENCODING_SAMPLE_SIZE)
+
+class LargeFileLoader(QObject):
+    """Stream a file into an editor chunk by chunk from the event loop, so the UI keeps running while it loads."""
+    progress = pyqtSignal(int)      # percent loaded
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)        # error message
+
+    def __init__(self, editor, file_path):
+        super().__init__(editor)
+        self.editor = editor
+        self.file_path = file_path
+        self.file = None
+        self.decoder = None
+        self.size = 0
+        self.loaded = 0
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.load_chunk)
+
+    def start(self):
+        try:
+            self.size = os.path.getsize(self.file_path)
+            encoding = sample_encoding(self.file_path)
+            self.file = open(self.file_path, 'rb')
+        except OSError as e:
+            self.failed.emit(str(e))
+            return
+        # Scintilla holds UTF-8: UTF-8 files are appended as read, others are converted chunk by chunk
+        if encoding != 'utf-8':
+            self.decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        editor = self.editor
+        editor.encoding = encoding
+        editor.SendScintilla(QsciScintilla.SCI_ALLOCATE, self.size + 1)
+        editor.SendScintilla(QsciScintilla.SCI_SETUNDOCOLLECTION, False)
+        editor.setReadOnly(True)  # No edits until the whole file is in
+        self.timer.start()
+
+    def load_chunk(self):
+        try:
+            data = self.file.read(LOAD_CHUNK_SIZE)
+        except OSError as e:
+            self.stop()
+            self.failed.emit(str(e))
+            return
+        self.loaded += len(data)
+        if self.decoder:
+            data = self.decoder.decode(data, final=not data).encode('utf-8')
+        if data:
+            editor = self.editor
+            if self.loaded <= LOAD_CHUNK_SIZE:
+                # The buffer keeps the file's line breaks, Enter and saving follow the first one
+                eol_mode = detect_eol_mode(data[:ENCODING_SAMPLE_SIZE].decode('utf-8', 'replace'))
+                if eol_mode is not None:
+                    editor.setEolMode(eol_mode)
+            # The document is being loaded, not edited: no modified state, tagging or status bar refresh per chunk
+            editor.blockSignals(True)
+            editor.setReadOnly(False)
+            editor.SendScintilla(QsciScintilla.SCI_APPENDTEXT, len(data), data)
+            editor.setReadOnly(True)
+            editor.blockSignals(False)
+        if self.loaded < self.size and data:
+            self.progress.emit(int(self.loaded * 100 / max(self.size, 1)))
+            return
+
+        self.stop()
+        editor = self.editor
+        editor.SendScintilla(QsciScintilla.SCI_SETUNDOCOLLECTION, True)
+        editor.SendScintilla(QsciScintilla.SCI_EMPTYUNDOBUFFER)
+        editor.setReadOnly(False)
+        editor.setModified(False)
+        self.finished.emit()
+
+    def stop(self):
+        self.timer.stop()
+        if self.file:
+            self.file.close()
+            self.file = None
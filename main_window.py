@@ -1,5 +1,5 @@
 import os
-import chardet
+import codecs
 import subprocess
 from pathlib            import Path
 from PyQt6.Qsci         import (
@@ -7,19 +7,34 @@ from PyQt6.Qsci         import (
 )
 from PyQt6.QtWidgets    import (
     QMainWindow, QTabWidget, QToolBar, QStatusBar, QLabel, QMessageBox,
-    QFileDialog, QWidget, QMenu, QDialog
+    QFileDialog, QWidget, QMenu, QDialog, QSplitter
 )
-from PyQt6.QtGui        import QIcon, QAction
-from PyQt6.QtCore       import Qt
+from PyQt6.QtGui        import QIcon, QAction, QColor, QPainter, QPixmap
+from PyQt6.QtCore       import Qt, QCoreApplication, QThreadPool, QTimer
 
 from code_editor        import CodeEditor
 from dialogs.find_dialog        import FindDialog
 from dialogs.goto_line_dialog   import GoToLineDialog
+from dialogs.goto_symbol_dialog import GoToSymbolDialog
 from Terminal           import Terminal
 from settings_manager   import SettingsManager
 from project_view       import ProjectView, FunctionList
+from references_view    import ReferencesPanel
 from stm32_framework_handler    import STM32FrameworkHandler, InstallFrameworkDialog, CreateProjectDialog
-from ctags_handler      import CtagsHandler, CtagsPathDialog
+from ctags_handler      import CtagsHandler, CtagsPathDialog, CtagsScheduler
+from symbol_database    import SymbolDatabase, normalize_path, file_signature
+from symbol_search      import SymbolSearchIndex, SymbolSearchJob
+from completion_provider        import shared_completions, CompletionPrepareJob
+from framework_index    import FrameworkIndexJob
+from tag_file_index     import open_tag_files
+from large_file         import LargeFileLoader, is_large_file
+from tab_placeholder    import TabPlaceholder
+from file_saver         import FileSaver, LINE_ENDINGS, detect_eol_mode, snapshot
+from closed_tabs        import ClosedTabHistory
+from file_watcher       import FileWatcher
+from text_encoding      import decode_text, encoding_display_name
+from tags_cache         import shared_tags_cache
+from include_graph      import IncludeGraph, IncludeGraphJob, scan_includes, HEADER_EXTENSIONS, C_SOURCE_EXTENSIONS
 from utils.resource     import resource_path
 
 class MainWindow(QMainWindow):
@@ -41,10 +56,40 @@ class MainWindow(QMainWindow):
         self.ctags_handler  = None
         self.current_tab_index = -1
 
+        # Status bar refreshes are coalesced to one per frame (~16 ms), editors restored below already use it
+        self.status_bar_timer = QTimer(self)
+        self.status_bar_timer.setSingleShot(True)
+        self.status_bar_timer.setInterval(16)
+        self.status_bar_timer.timeout.connect(self.update_status_bar)
+
         # Initialize SettingsManager
         self.settings_manager = SettingsManager()
         # Check for existing ctags path
         self.check_ctags_path()
+        # Persistent symbol database, replaced by the project one when a project is opened
+        CtagsHandler.symbol_db = SymbolDatabase.for_workspace()
+        # Run ctags on a worker pool and refresh the views when results land
+        self.ctags_scheduler = CtagsScheduler(self)
+        self.ctags_scheduler.fileIndexed.connect(self.on_file_indexed)
+        self.ctags_scheduler.projectIndexed.connect(self.on_project_indexed)
+        self.ctags_scheduler.indexFailed.connect(self.on_index_failed)
+        # Files are written on worker threads, the GUI thread only copies the document
+        self.file_saver = FileSaver(self)
+        self.file_saver.fileSaved.connect(self.on_file_saved)
+        self.file_saver.saveFailed.connect(self.on_save_failed)
+        # Open files changed by other programs are reloaded, see on_files_changed
+        self.file_watcher = FileWatcher(self)
+        self.file_watcher.filesChanged.connect(self.on_files_changed)
+        # Name index of the Go to Symbol palette, built off the GUI thread
+        self.symbol_search = SymbolSearchIndex()
+        self.symbol_search_db = None
+        self.symbol_search_job = None
+        self.completion_job = None
+        self.on_symbol_db_changed()
+        # #include relationships of the open project, built off the GUI thread
+        self.include_graph = IncludeGraph()
+        self.include_graph_db = None
+        self.include_graph_job = None
 
         # Create Terminal
         self.terminal = Terminal(self)
@@ -55,11 +100,21 @@ class MainWindow(QMainWindow):
         # Check framework status
         if self.stm32_handler.framework_installed:
             self.statusBar().showMessage("TaaraFramework detected", 3000)
+        # Shared framework symbol index, layered under every workspace database
+        self.framework_index_path = None
+        self.framework_index_job = None
+        self.load_framework_index()
+        self.load_tag_files()
 
         # Add Function List
         self.function_list = FunctionList(self)
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.function_list)
 
+        # Add Find References panel, shown on the first search
+        self.references_panel = ReferencesPanel(self)
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.references_panel)
+        self.references_panel.hide()
+
         # Initialize TabWidget with custom styling
         self.tabWidget = QTabWidget()
         self.tabWidget.setTabsClosable(True)
@@ -75,7 +130,12 @@ class MainWindow(QMainWindow):
         # Install event filter for right mouse click on tabs
         self.tabWidget.tabBar().installEventFilter(self)
 
-        self.setCentralWidget(self.tabWidget)
+        # The tabs, and beside them the split view of one of their documents (see open_split_view)
+        self.editor_splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.editor_splitter.addWidget(self.tabWidget)
+        self.split_view = None
+        self.split_source = None
+        self.setCentralWidget(self.editor_splitter)
 
         # Set the tab style
         self.set_tab_style()
@@ -93,8 +153,8 @@ class MainWindow(QMainWindow):
         if self.tabWidget.count() == 0:
             self.new_file()
 
-        # Initialize a list to keep track of closed files
-        self.closed_files = []
+        # Closed tabs for Reopen, bounded in memory and spilled to disk
+        self.closed_files = ClosedTabHistory()
 
         # Create a status bar
         self.mainStatusBar = QStatusBar()
@@ -134,7 +194,7 @@ class MainWindow(QMainWindow):
         self.terminal.exe_first_cmd()
 
         # Connect the cursor position change to update the status bar
-        self.tabWidget.currentChanged.connect(self.update_status_bar)
+        self.tabWidget.currentChanged.connect(self.schedule_status_bar_update)
 
         # Update the Project View Status follow the STM32 Framework Project
         project_directory = self.project_view.get_project_directory()
@@ -176,19 +236,35 @@ class MainWindow(QMainWindow):
                 border-radius: 2px;
             }
         """)
+        # The stylesheet is set once; the modified state of each tab is shown by its icon (see update_tab_state)
+        pixmap = QPixmap(10, 10)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("#E8A33D"))  # Amber dot, the color the selected tab used to turn when modified
+        painter.drawEllipse(1, 1, 8, 8)
+        painter.end()
+        self.modified_tab_icon = QIcon(pixmap)
+        self.saved_tab_icon = QIcon()
 
     def on_tab_changed(self, index):
         """Handle tab change event"""
+        if index >= 0:
+            self.materialize_tab(index)  # Restored tabs are loaded on first activation
         current_editor = self.get_current_editor()
 
         # Update the UI to reflect the current tab
-        if index >= 0:
-            # You can add additional handling here if needed
-            current_index_file_status = "saved" if not current_editor.isModified() else "changed"
-            self.set_tab_background_color(index, current_index_file_status)
+        if index >= 0 and isinstance(current_editor, CodeEditor):
             self.tabWidget.setCurrentIndex(index)
             self.current_tab_index = index
 
+            # Tagging jobs of the tabs left behind are stale, the new tab gets tagged first
+            current_path = getattr(current_editor, 'file_path', None)
+            self.ctags_scheduler.cancel_stale([current_path])
+            if current_path and not current_editor.tags_cache and not current_editor.large_file:
+                self.ctags_scheduler.index_file(current_path)
+
     def control_shorcut_actions(self):
         # File actions
         self.newAction = QAction("New File", self)
@@ -203,6 +279,10 @@ class MainWindow(QMainWindow):
         self.saveAction.setShortcut("Ctrl+S")
         self.saveAction.triggered.connect(self.save_file)
 
+        self.saveAllAction = QAction("Save All", self)
+        self.saveAllAction.setShortcut("Ctrl+Shift+S")
+        self.saveAllAction.triggered.connect(self.save_all_files)
+
         self.exitAction = QAction("Exit", self)
         self.exitAction.setShortcut("Alt+F4")
         self.exitAction.triggered.connect(self.close)
@@ -269,6 +349,30 @@ class MainWindow(QMainWindow):
         self.findAction.triggered.connect(self.show_find_dialog)
         self.addAction(self.findAction)     # Make the shortcut work globally
 
+        # Add Find References action
+        self.findReferencesAction = QAction("Find References", self)
+        self.findReferencesAction.setShortcut("Shift+F12")
+        self.findReferencesAction.triggered.connect(self.find_references)
+        self.addAction(self.findReferencesAction)
+
+        # Add Go to Symbol palette action
+        self.goToSymbolAction = QAction("Go to Symbol in Project", self)
+        self.goToSymbolAction.setShortcut("Ctrl+T")
+        self.goToSymbolAction.triggered.connect(self.show_go_to_symbol_dialog)
+        self.addAction(self.goToSymbolAction)
+
+        # Add include graph navigation actions
+        self.switchHeaderSourceAction = QAction("Switch Header/Source", self)
+        self.switchHeaderSourceAction.setShortcut("Alt+O")
+        self.switchHeaderSourceAction.triggered.connect(self.switch_header_source)
+        self.addAction(self.switchHeaderSourceAction)
+
+        self.showIncludersAction = QAction("Show Files Including This", self)
+        self.showIncludersAction.triggered.connect(lambda: self.show_includers(False))
+
+        self.showDependentsAction = QAction("Show All Dependent Files", self)
+        self.showDependentsAction.triggered.connect(lambda: self.show_includers(True))
+
         # Add action for reopening the last closed file
         self.reopenAction = QAction("Reopen Last Closed File", self)
         self.reopenAction.setShortcut("Ctrl+H")
@@ -300,6 +404,13 @@ class MainWindow(QMainWindow):
         self.wordWrapAction.triggered.connect(self.toggle_word_wrap)
         self.addAction(self.wordWrapAction)  # Make the shortcut work globally
 
+        # Add Split View action
+        self.splitViewAction = QAction("Split View", self)
+        self.splitViewAction.setCheckable(True)
+        self.splitViewAction.setShortcut("Ctrl+\\")
+        self.splitViewAction.triggered.connect(self.toggle_split_view)
+        self.addAction(self.splitViewAction)
+
         # Add Show All Characters action
         self.ShowAllCharAction = QAction("Show All Characters", self)
         self.ShowAllCharAction.setCheckable(True)  # Make it checkable
@@ -376,6 +487,7 @@ class MainWindow(QMainWindow):
 
         fileMenu.addAction(self.openAction)
         fileMenu.addAction(self.saveAction)
+        fileMenu.addAction(self.saveAllAction)
         fileMenu.addAction(self.openprojectAction)
         fileMenu.addSeparator()
         fileMenu.addAction(self.reopenAction)  # Add the reopen action to the menu
@@ -391,6 +503,12 @@ class MainWindow(QMainWindow):
         editMenu.addAction(self.pasteAction)
         editMenu.addSeparator()
         editMenu.addAction(self.findAction)
+        editMenu.addAction(self.findReferencesAction)
+        editMenu.addAction(self.goToSymbolAction)
+        editMenu.addSeparator()
+        editMenu.addAction(self.switchHeaderSourceAction)
+        editMenu.addAction(self.showIncludersAction)
+        editMenu.addAction(self.showDependentsAction)
         editMenu.addAction(self.selectAllAction)
         
         # Execute Menu
@@ -427,6 +545,7 @@ class MainWindow(QMainWindow):
         show_view_menu.addAction(self.projectviewAction)
         show_view_menu.addAction(self.functionlistAction)
         show_view_menu.addAction(self.toggleterminalAction)
+        windowMenu.addAction(self.splitViewAction)
         
         # Help Menu
         helpMenu = menubar.addMenu("Help")
@@ -443,6 +562,7 @@ class MainWindow(QMainWindow):
         if path and os.path.exists(path):
             # Set the ctags path in the handler
             CtagsHandler.ctags_path = path
+            CtagsHandler.json_output = None  # Detected again for this executable
             self.ctags_handler = CtagsHandler(self)
             self.ctags_handler.ctags_path = path
             return
@@ -457,6 +577,10 @@ class MainWindow(QMainWindow):
         dialog = InstallFrameworkDialog(self.settings_manager, self.terminal)
         if dialog.getstatus():
             dialog.exec()
+            # The dialog saved the new checkout in the settings, index it for every project
+            self.stm32_handler.framework_path = self.stm32_handler.load_framework_path()
+            self.stm32_handler.framework_installed = self.stm32_handler.check_framework_status()
+            self.load_framework_index()
 
     def create_stm32_project(self):
         """Create a new STM32 project and generate ctags."""
@@ -523,13 +647,15 @@ class MainWindow(QMainWindow):
     def new_file(self):
         """Create a new empty file"""
         editor = CodeEditor(self)  # Ensure self is passed as the parent
-        editor.textChanged.connect(self.on_editor_text_changed)  # Connect the signal
         self.add_editor(editor)
         self.tabWidget.addTab(editor, "Untitled")
         self.tabWidget.setCurrentWidget(editor)  # Set the new editor as the current widget
 
-    def open_file(self, file_path=None, cursor_pos=(0, 0)):
-        """Open a file in a new tab, generating CTags only for source code files."""
+    def open_file(self, file_path=None, cursor_pos=(0, 0), tab_index=None):
+        """Open a file in a new tab, generating CTags only for source code files.
+
+        With tab_index the tab is inserted there without becoming current (see materialize_tab).
+        """
         if not file_path:
             file_path, _ = QFileDialog.getOpenFileName(
                 self,
@@ -544,23 +670,17 @@ class MainWindow(QMainWindow):
                 editor = self.tabWidget.widget(i)
                 if hasattr(editor, 'file_path') and editor.file_path == file_path:
                     self.tabWidget.setCurrentIndex(i)
-                    return
+                    return self.tabWidget.widget(i)  # A restored tab was just materialized by the switch
 
-            try:
-                # Detect file encoding
-                with open(file_path, 'rb') as f:
-                    raw_data = f.read()
-                    result = chardet.detect(raw_data)
-                    encoding = result['encoding']
-
-                with open(file_path, 'r', encoding=encoding) as f:
-                    text = f.read()
+            if is_large_file(file_path):
+                return self.open_large_file(file_path, cursor_pos, tab_index)
 
+            try:
                 editor = CodeEditor(self)
-                editor.textChanged.connect(self.on_editor_text_changed)
-                editor.setText(text)
+                editor.setText(self.read_file_text(editor, file_path))
                 editor.file_path = file_path
                 editor.setModified(False)
+                self.file_watcher.watch(file_path)
                 self.add_editor(editor)
 
                 # Restore cursor position
@@ -568,56 +688,108 @@ class MainWindow(QMainWindow):
                 editor.horizontalScrollBar().setValue(0)  # Set to leftmost position
 
                 filename = Path(file_path).name
-                index = self.tabWidget.addTab(editor, filename)
-                self.tabWidget.setCurrentIndex(index)
-                
-                # Update Function List after opening a file
-                self.update_function_list()
+                self.insert_editor_tab(editor, filename, tab_index)
 
-                # Define recognized source code extensions
-                SOURCE_EXTENSIONS = ('.c', '.cpp', '.h', '.hpp', '.py')  # Add more as needed
+                # Generate CTags in the background, the Function List is refreshed when they land
+                self.ctags_scheduler.index_file(file_path)
 
-                # Only generate CTags for source code files
-                file_suffix = Path(file_path).suffix.lower()
-                if file_suffix in SOURCE_EXTENSIONS:
-                    self.ctags_handler = CtagsHandler(editor)
-                    self.ctags_handler.generate_ctags()
+                return editor
 
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Could not open file: {str(e)}")
-    
+
+    def read_file_text(self, editor, file_path):
+        """Read a file for editor: set its encoding and EOL mode from the file and return the text to show."""
+        # Read the file once, detect its encoding and decode the same bytes
+        with open(file_path, 'rb') as f:
+            text, editor.encoding = decode_text(f.read())
+        # The file's line ending is kept for Enter and for saving, the buffer gets only that one
+        eol_mode = detect_eol_mode(text)
+        if eol_mode is not None:
+            editor.setEolMode(eol_mode)
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        if editor.eolMode() != QsciScintilla.EolMode.EolUnix:
+            text = text.replace('\n', LINE_ENDINGS[editor.eolMode()].decode())
+        return text
+
+    def open_large_file(self, file_path, cursor_pos=(0, 0), tab_index=None):
+        """Open a huge file (logs, generated sources) in a plain editor filled in chunks from the event loop."""
+        editor = CodeEditor(self)
+        editor.enter_large_file_mode()
+        editor.file_path = file_path
+        self.file_watcher.watch(file_path)
+        self.add_editor(editor)
+        self.insert_editor_tab(editor, Path(file_path).name, tab_index)
+
+        name = Path(file_path).name
+        editor.loader = LargeFileLoader(editor, file_path)
+        editor.loader.progress.connect(lambda percent: self.statusBar().showMessage(f"Loading {name}: {percent}%"))
+
+        def loaded():
+            editor.loader = None
+            editor.setCursorPosition(*cursor_pos)
+            self.schedule_status_bar_update()
+            self.statusBar().showMessage(f"{name} opened in large-file mode (no highlighting, folding or tags)", 5000)
+
+        def failed(message):
+            editor.loader = None
+            QMessageBox.critical(self, "Error", f"Could not open file: {message}")
+        editor.loader.finished.connect(loaded)
+        editor.loader.failed.connect(failed)
+        editor.loader.start()
+        return editor
+
+    def insert_editor_tab(self, editor, title, tab_index=None):
+        """Append the tab of a new editor and make it current, or put it at tab_index as it is."""
+        if tab_index is None:
+            self.tabWidget.setCurrentIndex(self.tabWidget.addTab(editor, title))
+        else:
+            self.tabWidget.insertTab(tab_index, editor, title)
+
+    def add_tab_placeholder(self, file_path, cursor_pos=(0, 0)):
+        """Add a tab for file_path that is only loaded when first shown."""
+        # The first tab added becomes current, it must not be materialized by that
+        self.tabWidget.blockSignals(True)
+        self.tabWidget.addTab(TabPlaceholder(file_path, cursor_pos), Path(file_path).name)
+        self.tabWidget.blockSignals(False)
+
+    def materialize_tab(self, index):
+        """Open the file of a restored tab in place of its placeholder. Return the widget of the tab."""
+        placeholder = self.tabWidget.widget(index)
+        if not isinstance(placeholder, TabPlaceholder):
+            return placeholder
+        was_current = self.tabWidget.currentIndex() == index
+        self.tabWidget.blockSignals(True)
+        try:
+            self.tabWidget.removeTab(index)
+            editor = self.open_file(placeholder.file_path, placeholder.cursor_pos, tab_index=index)
+            if was_current and editor:
+                self.tabWidget.setCurrentIndex(index)
+        finally:
+            self.tabWidget.blockSignals(False)
+        placeholder.deleteLater()
+        if editor is None and was_current and self.tabWidget.count():
+            # The file is gone: its tab was dropped, the neighbour that became current is loaded instead
+            return self.materialize_tab(self.tabWidget.currentIndex())
+        if editor is None and not self.tabWidget.count():
+            self.new_file()
+        return editor
+
     def save_file(self):
         """Save the current file"""
         current_editor = self.get_current_editor()
-        if current_editor is None:
+        if self.split_view is not None and self.split_view.hasFocus():
+            current_editor = self.split_source  # The split view edits the document of that tab
+        if current_editor is None or isinstance(current_editor, TabPlaceholder):
             return
-        self.set_tab_background_color(self.current_tab_index, "saved")
-
-        if not hasattr(current_editor, 'file_path'):
-            file_path, _ = QFileDialog.getSaveFileName(self, "Save File", "", "All Files (*.*)")
-            if file_path:
-                current_editor.file_path = file_path
-            else:
-                return
-        try:
-            with open(current_editor.file_path, 'w', encoding='utf-8') as f:
-                f.write(current_editor.text())
-
-            # Mark the editor as not modified
-            current_editor.setModified(False)
+        return self.save_file_for_editor(current_editor)
 
-            # Update Tab Color Background
-            self.set_tab_background_color(self.current_tab_index, "saved")
-
-            # Update the tab title to the file name
-            self.tabWidget.setTabText(
-                self.current_tab_index,
-                Path(current_editor.file_path).name
-            )
-            return True
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not save file: {str(e)}")
-            return False
+    def save_all_files(self):
+        """Save every modified tab, the files are written in parallel."""
+        for i in range(self.tabWidget.count()):
+            editor = self.tabWidget.widget(i)
+            if editor.isModified() and not self.save_file_for_editor(editor):
+                return  # Save dialog of an untitled tab cancelled
 
     def close_file(self, index):
         """Handle closing a tab"""
@@ -634,21 +806,26 @@ class MainWindow(QMainWindow):
             )
 
             if reply == QMessageBox.StandardButton.Save:
-                if not self.save_file(editor):
-                    return  # Don't close if save was cancelled
+                if not self.save_file_for_editor(editor, wait=True):
+                    return  # Don't close if save was cancelled or failed
             elif reply == QMessageBox.StandardButton.Cancel:
                 return  # Don't close if user cancelled
 
-        # Store the closed file information
+        if getattr(editor, 'loader', None):
+            editor.loader.stop()
+
+        # Store the closed file information: the text only if it differs from the file, huge files are reopened from disk
         if hasattr(editor, 'file_path'):
-            self.closed_files.append((editor.file_path, editor.text(), editor.getCursorPosition()))
+            keep_text = isinstance(editor, CodeEditor) and editor.isModified() and not editor.large_file
+            self.closed_files.push(editor.file_path, editor.getCursorPosition(), snapshot(editor) if keep_text else None)
 
-        # Remove ctags file
-        self.ctags_handler = CtagsHandler(editor)
-        self.ctags_handler.remove_ctags()
+        if editor is self.split_source:
+            self.close_split_view()
 
         # Remove the tab
         self.tabWidget.removeTab(index)
+        if getattr(editor, 'file_path', None) and self.find_editor(editor.file_path) is None:
+            self.file_watcher.unwatch(editor.file_path)
 
         # Create a new tab if this was the last one
         if self.tabWidget.count() == 0:
@@ -657,81 +834,11 @@ class MainWindow(QMainWindow):
     def about_app(self):
         QMessageBox.information(self, "About", "This is a Notepad++ style Text Editor, develop by Nghia Taarabt and Channel laptrinhdientu.com\nDebugger integration coming soon!")
 
-    def set_tab_background_color(self, index, hex_color):
-        """Set the background color of a specific tab"""
-        if 0 <= index < self.tabWidget.count():
-            if hex_color == "changed":
-                self.tabWidget.setStyleSheet("""
-                    QTabWidget::pane {
-                        border: 1px solid #C2C7CB;
-                        background: #F0F0F0;
-                    }
-                    QTabBar::tab {
-                        background: #E1E1E1;
-                        border: 1px solid #C4C4C3;
-                        padding: 5px 10px;
-                        margin-right: 2px;
-                    }
-                    QTabBar::tab:selected {
-                        background: #edd19d;  /* Moccasin color for selected tab */
-                        border-bottom: none;
-                        margin-bottom: -1px;
-                        font-weight: bold;
-                    }
-                    QTabBar::tab:!selected {
-                        background: #F0F0F0;
-                    }
-                    QTabBar::tab:!selected:hover {
-                        background: #E8E8E8;
-                    }
-                    QTabBar::close-button {
-                        image: url(icons/close.png);
-                        subcontrol-position: right;
-                    }
-                    QTabBar::close-button:hover {
-                        background: #FFA07A;  /* Light salmon color for close button hover */
-                        border-radius: 2px;
-                    }
-                """)
-            elif hex_color == "saved":
-                self.tabWidget.setStyleSheet("""
-                    QTabWidget::pane {
-                        border: 1px solid #C2C7CB;
-                        background: #F0F0F0;
-                    }
-                    QTabBar::tab {
-                        background: #E1E1E1;
-                        border: 1px solid #C4C4C3;
-                        padding: 5px 10px;
-                        margin-right: 2px;
-                    }
-                    QTabBar::tab:selected {
-                        background: #dcffbd;  /* Moccasin color for selected tab */
-                        border-bottom: none;
-                        margin-bottom: -1px;
-                        font-weight: bold;
-                    }
-                    QTabBar::tab:!selected {
-                        background: #F0F0F0;
-                    }
-                    QTabBar::tab:!selected:hover {
-                        background: #E8E8E8;
-                    }
-                    QTabBar::close-button {
-                        image: url(icons/close.png);
-                        subcontrol-position: right;
-                    }
-                    QTabBar::close-button:hover {
-                        background: #FFA07A;  /* Light salmon color for close button hover */
-                        border-radius: 2px;
-                    }
-                """)
-            #self.tabWidget.tabBar().setTabData(index, {"background-color": hex_color})
-
-    def set_tabtext_color(self, index, hex_color):
-        """Set the text color of a specific tab"""
-        if 0 <= index < self.tabWidget.count():
-            self.tabWidget.tabBar().setStyleSheet(f"QTabBar::tab::selected {{ color: {hex_color}; }}")
+    def update_tab_state(self, editor):
+        """Show the modified state of an editor on its tab."""
+        index = self.tabWidget.indexOf(editor)
+        if index != -1:
+            self.tabWidget.setTabIcon(index, self.modified_tab_icon if editor.isModified() else self.saved_tab_icon)
 
     def get_current_editor(self):
         """Return the currently active editor"""
@@ -740,6 +847,12 @@ class MainWindow(QMainWindow):
             return self.tabWidget.widget(current_index)
         return None
 
+    def get_focused_editor(self):
+        """Return the split view while it has the focus, else the editor of the current tab."""
+        if self.split_view is not None and self.split_view.hasFocus():
+            return self.split_view
+        return self.get_current_editor()
+
     def show_find_dialog(self):
         if not self.find_dialog:
             self.find_dialog = FindDialog(self)
@@ -755,8 +868,11 @@ class MainWindow(QMainWindow):
         self.find_dialog.activateWindow()
         self.find_dialog.find_input.setFocus()
 
-    def save_file_for_editor(self, editor):
-        """Save the specified editor's content"""
+    def save_file_for_editor(self, editor, wait=False):
+        """Save the specified editor's content in its encoding and EOL mode.
+
+        The file is written in the background unless wait is set; return False if cancelled or, waiting, failed.
+        """
         if not hasattr(editor, 'file_path') or not editor.file_path:
             file_path, _ = QFileDialog.getSaveFileName(self, "Save File", "", "All Files (*.*)")
             if file_path:
@@ -764,22 +880,80 @@ class MainWindow(QMainWindow):
             else:
                 return False  # Người dùng hủy lưu
 
+        # The save point is the snapshot taken now, edits typed while it is written keep the tab modified
+        editor.setModified(False)
+        job = self.file_saver.save(editor, editor.file_path, wait)
+        # Cập nhật tên tab
+        tab_index = self.tabWidget.indexOf(editor)
+        if tab_index != -1:
+            self.tabWidget.setTabText(tab_index, Path(editor.file_path).name)
+        return job.error is None
+
+    def on_file_saved(self, file_path):
+        """Re-index a file once it is on disk so the symbol database follows the new content."""
+        editor = self.find_editor(file_path)
+        if editor is not None and not editor.large_file:
+            self.ctags_scheduler.index_file(file_path)
+        self.file_watcher.watch(file_path)  # What was written is what the editor shows
+        self.statusBar().showMessage(f"Saved {file_path}", 3000)
+
+    def on_files_changed(self, file_paths):
+        """Reload the open files other programs changed; modified ones only if the user agrees."""
+        for file_path in file_paths:
+            editor = self.find_editor(file_path)
+            # Our own save still being written is not an outside change, on_file_saved takes its state
+            if not isinstance(editor, CodeEditor) or self.file_saver.is_saving(file_path):
+                continue
+            name = Path(file_path).name
+            if not os.path.exists(file_path):
+                editor.setModified(True)  # Saving writes the file again
+                self.statusBar().showMessage(f"{name} was deleted from disk", 5000)
+                continue
+            if editor.large_file or getattr(editor, 'loader', None):
+                self.statusBar().showMessage(f"{name} was changed on disk, reopen it to see the changes", 5000)
+                continue
+            if editor.isModified():
+                reply = QMessageBox.question(
+                    self, "File Changed",
+                    f"{name} was changed by another program.\nReload it and lose your changes?",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                )
+                if reply != QMessageBox.StandardButton.Yes:
+                    continue
+            self.reload_editor(editor)
+
+    def reload_editor(self, editor):
+        """Bring an editor in line with its file, editing only the lines that changed (undoable)."""
         try:
-            with open(editor.file_path, 'w', encoding='utf-8') as f:
-                f.write(editor.text())
-            editor.setModified(False)
-            # Cập nhật tên tab
-            tab_index = self.tabWidget.indexOf(editor)
-            if tab_index != -1:
-                self.tabWidget.setTabText(tab_index, Path(editor.file_path).name)
-                self.set_tab_background_color(tab_index, "saved")
-            return True
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not save file: {str(e)}")
-            return False
+            text = self.read_file_text(editor, editor.file_path)
+        except OSError as e:
+            self.statusBar().showMessage(f"Could not reload {editor.file_path}: {e}", 5000)
+            return
+        if editor.replace_changed_lines(text):
+            self.ctags_scheduler.index_file(editor.file_path)
+            self.statusBar().showMessage(f"Reloaded {Path(editor.file_path).name}", 3000)
+        editor.setModified(False)
+
+    def on_save_failed(self, file_path, message):
+        """A failed write leaves the old file on disk, its tab goes back to modified."""
+        editor = self.find_editor(file_path)
+        if editor is not None:
+            editor.setModified(True)
+        QMessageBox.critical(self, "Error", f"Could not save file: {message}")
+
+    def find_editor(self, file_path):
+        """Return the editor of the tab showing file_path, or None."""
+        for i in range(self.tabWidget.count()):
+            editor = self.tabWidget.widget(i)
+            if getattr(editor, 'file_path', None) == file_path:
+                return editor
+        return None
 
     def closeEvent(self, event):
         """Handle application close event."""
+        # Saves still being written finish first, a failed one marks its tab modified again before the prompts
+        self.file_saver.wait()
+        QCoreApplication.sendPostedEvents(self.file_saver)
         modified_saved_files = []
         for i in range(self.tabWidget.count()):
             editor = self.tabWidget.widget(i)
@@ -795,7 +969,7 @@ class MainWindow(QMainWindow):
                     QMessageBox.StandardButton.Save | QMessageBox.StandardButton.Discard
                 )
                 if reply == QMessageBox.StandardButton.Save:
-                    if not self.save_file_for_editor(editor):
+                    if not self.save_file_for_editor(editor, wait=True):
                         event.ignore()
                         return
                 elif reply == QMessageBox.StandardButton.Discard:
@@ -804,22 +978,19 @@ class MainWindow(QMainWindow):
             for index in sorted(tabs_to_remove, reverse=True):
                 self.tabWidget.removeTab(index)
 
-        # Remove .tags files for all open files
-        for i in range(self.tabWidget.count()):
-            editor = self.tabWidget.widget(i)
-            if hasattr(editor, 'file_path'):
-                self.ctags_handler = CtagsHandler(editor)
-                self.ctags_handler.remove_ctags()
-
-        # Remove .tags file for current project
-        if hasattr(self, 'project_view') and self.project_view.current_project_directory:
-            project_tags = Path(self.project_view.current_project_directory) / 'project.tags'
-            if project_tags.exists():
-                project_tags.unlink()
-
         # Lưu session và layout qua SettingsManager
         self.settings_manager.save_session(self)
         self.settings_manager.save_layout(self)
+
+        self.closed_files.clear()  # Removes the buffers spilled to disk
+
+        # The symbol database is kept on disk for the next session
+        self.ctags_scheduler.cancel_all(wait=True)
+        if self.framework_index_job:
+            self.framework_index_job.cancel()
+        if CtagsHandler.symbol_db:
+            CtagsHandler.symbol_db.close()
+            CtagsHandler.symbol_db = None
         event.accept()
 
     def hideEvent(self, event):
@@ -884,27 +1055,78 @@ class MainWindow(QMainWindow):
         open_folder_action.triggered.connect(lambda: self.open_containing_folder(editor))
         menu.addAction(open_folder_action)
 
+        # Split View action, a restored tab is loaded first
+        split_action = QAction("Split View", self)
+        split_action.triggered.connect(lambda: self.open_split_view(self.materialize_tab(tab_index)))
+        menu.addAction(split_action)
+
         # Show the context menu
         menu.exec(pos)
 
+    def toggle_split_view(self, checked):
+        if checked:
+            self.open_split_view(self.get_current_editor())
+        else:
+            self.close_split_view()
+
+    def open_split_view(self, editor):
+        """Show the document of editor a second time beside the tabs.
+
+        Both views hold the same Scintilla document: nothing is copied, even for a huge file, and an edit
+        in one view shows in the other at once. Saving, undo and the modified state are the document's.
+        """
+        self.close_split_view()
+        if not isinstance(editor, CodeEditor):
+            self.splitViewAction.setChecked(False)
+            return
+        view = CodeEditor(self)
+        if editor.large_file:
+            view.enter_large_file_mode()
+        view.setDocument(editor.document())
+        view.overlay_owner = editor  # One background ctags run per edit of the shared document, not one per view
+        if hasattr(editor, 'file_path'):
+            view.file_path = editor.file_path
+        if getattr(editor, 'loader', None):
+            # Read-only is kept on the shared document until the large-file loader has put the whole file in
+            view.setReadOnly(True)
+            editor.loader.finished.connect(lambda view=view: view.setReadOnly(False) if view is self.split_view else None)
+        self.add_editor(view)  # Status bar and modified state follow the view like any editor
+        view.setCursorPosition(*editor.getCursorPosition())
+        view.SendScintilla(QsciScintilla.SCI_SETFIRSTVISIBLELINE, editor.firstVisibleLine())
+        self.editor_splitter.addWidget(view)
+        width = self.editor_splitter.width()
+        self.editor_splitter.setSizes([width // 2, width - width // 2])
+        self.split_view, self.split_source = view, editor
+        self.splitViewAction.setChecked(True)
+        view.setFocus()
+
+    def close_split_view(self):
+        """Close the split view; the document lives on in its tab."""
+        if self.split_view is not None:
+            self.split_view.hide()
+            self.split_view.deleteLater()
+            self.split_view = self.split_source = None
+        self.splitViewAction.setChecked(False)
+
     def on_editor_text_changed(self):
         """Handle text changes in the editor"""
-        current_editor = self.get_current_editor()
-        if current_editor:
-            current_index = self.tabWidget.indexOf(current_editor)
-            self.set_tab_background_color(current_index, "changed")
-            self.update_status_bar()  # Update status bar on text change
+        self.schedule_status_bar_update()  # Update status bar on text change
+
+    def on_editor_modification_changed(self, modified):
+        """Scintilla left or returned to the save point: repaint that editor's tab, once per transition."""
+        editor = self.sender()
+        self.update_tab_state(self.split_source if editor is self.split_view else editor)
 
     def reopen_last_closed_file(self):
         """Reopen the last closed file"""
-        if self.closed_files:
-            file_path, content, cursor_pos = self.closed_files.pop()  # Get the last closed file info
-            self.open_file(file_path, cursor_pos)  # Open the file with the saved cursor position
-            editor = self.get_current_editor()
-            if editor:
-                editor.setText(content)     # Restore the content
-                editor.setModified(False)   # Mark as saved
-                self.set_tab_background_color(self.tabWidget.indexOf(editor), "saved")
+        closed = self.closed_files.pop()  # Get the last closed file info
+        if closed:
+            file_path, content, cursor_pos = closed
+            editor = self.open_file(file_path, cursor_pos)  # Open the file with the saved cursor position
+            if editor and content is not None:
+                # Restore the unsaved content, it stays modified since the file does not hold it
+                editor.setText(content)
+                editor.setCursorPosition(*cursor_pos)
 
     def close_current_tab(self):
         """Close the currently active tab."""
@@ -912,6 +1134,149 @@ class MainWindow(QMainWindow):
         if current_index != -1:
             self.close_file(current_index)  # Call the existing close_file method
 
+    def find_references(self):
+        """Show every occurrence of the word under the cursor across the project."""
+        editor = self.get_current_editor()
+        if not editor:
+            return
+        word = editor.get_word_at_position(editor.SendScintilla(QsciScintilla.SCI_GETCURRENTPOS))
+        if not word:
+            self.statusBar().showMessage("No identifier under the cursor", 3000)
+            return
+        editors = [self.tabWidget.widget(i) for i in range(self.tabWidget.count())]
+        self.references_panel.find_references(word, CtagsHandler.symbol_db, editors)
+
+    def show_go_to_symbol_dialog(self):
+        """Open the fuzzy symbol palette over the symbols of the workspace."""
+        if self.symbol_search_db is not CtagsHandler.symbol_db:
+            self.rebuild_symbol_search()  # Project switched, the palette fills once the new index is built
+        dialog = GoToSymbolDialog(self, self.symbol_search, CtagsHandler.symbol_db, self.project_view.get_project_directory())
+        dialog.exec()
+
+    def load_framework_index(self):
+        """Find or build the symbol index of the installed framework in the background."""
+        if not self.stm32_handler.framework_installed or CtagsHandler.ctags_path is None:
+            return
+        if self.framework_index_job:
+            self.framework_index_job.cancel()
+        self.framework_index_job = FrameworkIndexJob(self.stm32_handler.framework_path)
+        self.framework_index_job.signals.ready.connect(self.on_framework_index_ready)
+        self.framework_index_job.signals.failed.connect(lambda message: self.statusBar().showMessage(f"Framework indexing failed: {message}", 5000))
+        QThreadPool.globalInstance().start(self.framework_index_job)
+
+    def on_framework_index_ready(self, path):
+        """Layer the framework index under the workspace database and refresh everything reading symbols."""
+        self.framework_index_path = path
+        self.attach_framework_index()
+        self.rebuild_symbol_search()
+        self.prepare_completions()
+        for i in range(self.tabWidget.count()):
+            self.tabWidget.widget(i).update_tags_cache()
+        self.update_function_list()
+        self.statusBar().showMessage("TaaraFramework symbols loaded", 3000)
+
+    def load_tag_files(self, project_dir=None):
+        """Use the sorted tags files at the root of the project and the framework for go-to-definition."""
+        for tags_file in CtagsHandler.tag_files:
+            tags_file.close()
+        CtagsHandler.tag_files = open_tag_files([project_dir, self.stm32_handler.framework_path])
+
+    def attach_framework_index(self):
+        if self.framework_index_path and CtagsHandler.symbol_db and \
+                CtagsHandler.symbol_db.framework_db_path != self.framework_index_path:
+            CtagsHandler.symbol_db.attach_framework(self.framework_index_path)
+            shared_tags_cache.clear()
+
+    def on_symbol_db_changed(self, directory=None):
+        """Point the symbol palette, completions and include graph at the database of a newly opened workspace."""
+        if getattr(self, 'framework_index_path', None):
+            self.attach_framework_index()
+        self.rebuild_symbol_search()
+        self.prepare_completions(use_cache=True)
+        if directory:
+            self.load_tag_files(directory)
+            self.include_graph = IncludeGraph()
+            self.include_graph_db = None
+            self.rebuild_include_graph(directory)
+
+    def rebuild_include_graph(self, directory):
+        """Rescan the #include directives of the changed project and framework files in the background."""
+        if CtagsHandler.symbol_db is None:
+            return
+        self.include_graph_job = IncludeGraphJob(CtagsHandler.symbol_db, directory, self.stm32_handler.framework_path)
+        self.include_graph_job.signals.finished.connect(self.on_include_graph_built)
+        QThreadPool.globalInstance().start(self.include_graph_job)
+
+    def on_include_graph_built(self, symbol_db, graph):
+        """Swap in a freshly built include graph unless the workspace changed meanwhile."""
+        if symbol_db is CtagsHandler.symbol_db:
+            self.include_graph = graph
+            self.include_graph_db = symbol_db
+
+    def update_include_graph(self, file_path):
+        """Refresh the #include edges of one saved file."""
+        symbol_db = CtagsHandler.symbol_db
+        if self.include_graph_db is not symbol_db or Path(file_path).suffix.lower() not in HEADER_EXTENSIONS + C_SOURCE_EXTENSIONS:
+            return
+        if symbol_db.stale_include_files([file_path]):
+            directives = scan_includes(file_path)
+            symbol_db.store_includes(file_path, directives, file_signature(file_path))
+            self.include_graph.set_file(file_path, directives)
+
+    def switch_header_source(self):
+        """Open the header of the current source file, or the source of the current header."""
+        editor = self.get_current_editor()
+        if not getattr(editor, 'file_path', None):
+            return
+        counterpart = self.include_graph.counterpart(editor.file_path)
+        if counterpart:
+            self.open_file(counterpart)
+        else:
+            self.statusBar().showMessage(f"No header/source counterpart for {os.path.basename(editor.file_path)}", 3000)
+
+    def show_includers(self, transitive=False):
+        """List the files including the current file, directly or through other headers."""
+        editor = self.get_current_editor()
+        if not getattr(editor, 'file_path', None):
+            return
+        if transitive:
+            files = self.include_graph.dependents(editor.file_path)
+            summary = f"{len(files)} files depending on {os.path.basename(editor.file_path)}"
+        else:
+            files = self.include_graph.includers(editor.file_path)
+            summary = f"{len(files)} files including {os.path.basename(editor.file_path)}"
+        self.references_panel.show_locations(summary, [(path, line, 0) for path, line in files])
+
+    def prepare_completions(self, use_cache=False):
+        """Rebuild the shared completion list from the current symbol database in the background."""
+        if CtagsHandler.symbol_db is None:
+            return
+        self.completion_job = CompletionPrepareJob(CtagsHandler.symbol_db, use_cache)
+        self.completion_job.signals.prepared.connect(self.on_completions_prepared)
+        QThreadPool.globalInstance().start(self.completion_job)
+
+    def on_completions_prepared(self, symbol_db, names):
+        """Swap in a prepared completion list unless the workspace changed meanwhile."""
+        if symbol_db is CtagsHandler.symbol_db:
+            shared_completions.set_names(names)
+
+    def rebuild_symbol_search(self):
+        """Rebuild the palette index from the current symbol database in the background."""
+        if CtagsHandler.symbol_db is None:
+            return
+        if self.symbol_search_db is not CtagsHandler.symbol_db:
+            self.symbol_search = SymbolSearchIndex()
+            self.symbol_search_db = CtagsHandler.symbol_db
+        self.symbol_search_job = SymbolSearchJob(CtagsHandler.symbol_db)
+        self.symbol_search_job.signals.finished.connect(self.on_symbol_search_built)
+        QThreadPool.globalInstance().start(self.symbol_search_job)
+
+    def on_symbol_search_built(self, symbol_db, index):
+        """Swap in a freshly built palette index unless the workspace changed meanwhile."""
+        if symbol_db is CtagsHandler.symbol_db:
+            self.symbol_search = index
+            self.symbol_search_db = symbol_db
+
     def show_go_to_line_dialog(self):
         """Show the Go To Line dialog."""
         dialog = GoToLineDialog(self)
@@ -944,17 +1309,23 @@ class MainWindow(QMainWindow):
     def add_editor(self, editor):
         """Add a new editor and connect signals for real-time updates."""
         editor.textChanged.connect(self.on_editor_text_changed)  # Update on text change
-        editor.cursorPositionChanged.connect(self.update_status_bar)  # Update on cursor position change
+        editor.modificationChanged.connect(self.on_editor_modification_changed)  # Tab icon on save point changes
+        editor.cursorPositionChanged.connect(self.schedule_status_bar_update)  # Update on cursor position change
+
+    def schedule_status_bar_update(self):
+        """Refresh the status bar on the next frame; edits and moves until then share that one update."""
+        if not self.status_bar_timer.isActive():
+            self.status_bar_timer.start()
 
     def update_status_bar(self):
         """Update the status bar with current editor information."""
-        editor = self.get_current_editor()
+        editor = self.get_focused_editor()
         if editor:
             # Chặn tín hiệu để tránh tác dụng phụ
             editor.blockSignals(True)
             try:
-                text = editor.text()
-                length = len(text)
+                # Scintilla keeps both counters, no copy of the buffer is needed
+                length = editor.SendScintilla(QsciScintilla.SCI_GETTEXTLENGTH)
                 lines = editor.SendScintilla(QsciScintilla.SCI_GETLINECOUNT)
                 cursor_line, cursor_col = editor.getCursorPosition()
                 cursor_pos = editor.SendScintilla(QsciScintilla.SCI_GETCURRENTPOS)
@@ -971,7 +1342,8 @@ class MainWindow(QMainWindow):
                 else:
                     line_endings = "Unknown EOL"
 
-                encoding = "UTF-8"  # You can implement detection if needed
+                # The file's codec is kept on the tab editor, a split view shows the same file
+                encoding = encoding_display_name((self.split_source if editor is self.split_view else editor).encoding)
                 mode = "INS" if editor.SendScintilla(QsciScintilla.SCI_GETOVERTYPE) == 0 else "OVR"
 
                 # Update the status labels
@@ -1001,37 +1373,20 @@ class MainWindow(QMainWindow):
         menu.exec(self.encoding_label.mapToGlobal(pos))
 
     def change_encoding(self, new_enc):
-        """Change the encoding of the current file."""
+        """Convert the current file to another encoding."""
         current_editor = self.get_current_editor()
-        if current_editor and hasattr(current_editor, 'file_path'):
+        if current_editor:
             try:
-                # Read the current content
-                coding1 = "utf-8"
-                coding2 = "gb18030"
-
-                f = open(current_editor.file_path, 'rb')
-                content = unicode(f.read(), coding2)
-                f.close()
-                f = open(current_editor.file_path, 'wb')
-                f.write(content.encode(new_enc))
-                f.close()
-
-                # Save the current cursor position
-                # cursor_pos = current_editor.getCursorPosition()
-
-                # Write the content with the new encoding
-                # with open(current_editor.file_path, 'wb') as f:
-                #     f.write(content.encode(new_enc))
-
-                # Update the encoding label
-                self.encoding_label.setText(new_enc)
-
-                # Restore the cursor position
-                current_editor.setCursorPosition(*cursor_pos)
-
-                QMessageBox.information(self, "Encoding Changed", f"File encoding changed to {new_enc}.")
-            except Exception as e:
+                current_editor.text().encode(new_enc)
+            except UnicodeEncodeError as e:
                 QMessageBox.warning(self, "Error", f"Could not change encoding: {str(e)}")
+                return
+            current_editor.encoding = codecs.lookup(new_enc).name
+            self.update_status_bar()
+            # An unmodified file is rewritten right away, pending edits are written with the new encoding on save
+            if getattr(current_editor, 'file_path', None) and not current_editor.isModified():
+                self.save_file_for_editor(current_editor)
+            self.statusBar().showMessage(f"Encoding changed to {new_enc}.", 3000)
 
     def show_line_end_menu(self, pos):
         """Show context menu for encoding options."""
@@ -1059,6 +1414,9 @@ class MainWindow(QMainWindow):
                 elif new_line_end == "Mac (CR)":
                     current_editor.setEolMode(QsciScintilla.EolMode.EolMac)
 
+                # Line breaks already in the buffer follow, saving writes the mode's line ending
+                current_editor.convertEols(current_editor.eolMode())
+
                 # Save the current cursor position
                 cursor_pos = current_editor.getCursorPosition()
 
@@ -1084,6 +1442,47 @@ class MainWindow(QMainWindow):
         current_editor = self.get_current_editor()
         self.function_list.update_function_list(current_editor)
 
+    def on_file_indexed(self, file_path):
+        """Refresh the tags cache of the editors showing a freshly indexed file."""
+        if CtagsHandler.symbol_db is None:  # Signal of a job that finished after the window closed
+            return
+        self.update_include_graph(file_path)
+        names = [symbol[0] for symbol in CtagsHandler.symbol_db.symbols_in_file(file_path)]
+        shared_completions.add_names(names)
+        if self.symbol_search_db is CtagsHandler.symbol_db:
+            self.symbol_search.add_names(names)
+        current_editor = self.get_current_editor()
+        for i in range(self.tabWidget.count()):
+            editor = self.tabWidget.widget(i)
+            if getattr(editor, 'file_path', None) and normalize_path(editor.file_path) == file_path:
+                editor.update_tags_cache()
+                if editor is current_editor:
+                    self.update_function_list()
+
+    def on_project_indexed(self, directory):
+        """Refresh the editors of the project, the symbol palette index and completions after an indexing run."""
+        # Editors restored or opened before the run still show the symbols of the previous database
+        prefix = directory.rstrip('/') + '/'
+        current_editor = self.get_current_editor()
+        for i in range(self.tabWidget.count()):
+            editor = self.tabWidget.widget(i)
+            if isinstance(editor, CodeEditor) and getattr(editor, 'file_path', None) \
+                    and normalize_path(editor.file_path).startswith(prefix):
+                editor.update_tags_cache()
+                editor.outline_model = None
+        self.update_function_list()
+        # The project switch cancelled the job of the current file: queue it again, it is skipped if already current
+        if current_editor is not None and not getattr(current_editor, 'large_file', False):
+            self.ctags_scheduler.index_file(getattr(current_editor, 'file_path', None))
+        self.rebuild_symbol_search()
+        self.prepare_completions()
+        self.rebuild_include_graph(directory)
+        self.statusBar().showMessage(f"Project symbols indexed: {directory}", 3000)
+
+    def on_index_failed(self, path, message):
+        """Report a CTags failure without interrupting the user."""
+        self.statusBar().showMessage(f"CTags failed for {path}: {message}", 5000)
+
     def on_item_double_clicked(self, item, column):
         """Handle double-click event on a function list item."""
         data = item.data(0, Qt.ItemDataRole.UserRole)
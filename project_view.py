@@ -1,10 +1,13 @@
 # project_view.py
-from PyQt6.QtWidgets import QTreeView, QDockWidget, QHeaderView, QWidget, QVBoxLayout, QTreeWidget, QTreeWidgetItem
+from PyQt6.QtWidgets import QTreeView, QDockWidget, QHeaderView, QWidget, QVBoxLayout
 from PyQt6.QtGui import QFileSystemModel
-from PyQt6.QtCore import QDir, Qt
+from PyQt6.QtCore import QDir, Qt, QAbstractItemModel, QModelIndex
 import os, sys
-import subprocess
-from pathlib import Path
+
+from ctags_handler import CtagsHandler
+from code_editor import CodeEditor
+from symbol_database import SymbolDatabase
+from tags_cache import shared_tags_cache
 
 def resource_path(relative_path):
     if hasattr(sys, '_MEIPASS'):
@@ -53,10 +56,14 @@ class ProjectView:
     def set_project_directory(self, directory):
         """Update project directory for Project View, set column header to folder name, and generate CTags."""
         if directory and os.path.isdir(directory):
-            # Remove the project.tags file from the previous project directory
-            if self.current_project_directory:
-                self.remove_project_ctags(self.current_project_directory)
-            
+            # Switch to the persistent symbol database of the new project, once no job writes to the old one
+            self.parent.ctags_scheduler.cancel_all(wait=True)
+            if CtagsHandler.symbol_db:
+                CtagsHandler.symbol_db.close()
+            CtagsHandler.symbol_db = SymbolDatabase.for_workspace(directory)
+            shared_tags_cache.clear()
+            self.parent.on_symbol_db_changed(directory)
+
             # Set the root path and update the view
             self.project_model.setRootPath(directory)
             self.project_tree.setRootIndex(self.project_model.index(directory))
@@ -85,25 +92,98 @@ class ProjectView:
         return self.project_model.rootPath()
 
     def generate_project_ctags(self, directory):
-        """Generate a single CTags file for the entire project."""
-        tags_file = os.path.join(directory, "project.tags")
-        try:
-            # Command to generate CTags recursively for the project, including macros
-            from ctags_handler import CtagsHandler
-            ctags_cmd = [CtagsHandler.ctags_path, "--fields=+n", "--kinds-C=+d", "-R", "-f", tags_file, directory]
-            result = subprocess.run(ctags_cmd, capture_output=True, text=True, shell=True)
-            return True if result.returncode == 0 else False
-        except Exception as e:
-            return False
-        
-    def remove_project_ctags(self, directory):
-        tags_file = os.path.join(directory, "project.tags")
-
-        if os.path.exists(tags_file):
-            os.remove(tags_file)
-            return True
-        else:
+        """Queue indexing of the project on the CTags worker pool, re-tagging only changed files."""
+        self.parent.ctags_scheduler.index_project(directory)
+        return True
+
+# Function List groups: (title, type shown in the Type column, ctags kinds)
+OUTLINE_GROUPS = [
+    ("Functions", "Function", ("f",)),
+    ("Variables", "Variable", ("v",)),
+    ("Macros", "Macro", ("d",)),
+    ("Typedefs", "Typedef", ("t",)),
+    ("Structs", "Struct", ("s", "u")),
+]
+
+class SymbolOutlineModel(QAbstractItemModel):
+    """Two-level outline of a tags cache whose group rows are fetched lazily, in chunks, by the view."""
+    FETCH_SIZE = 200  # Symbol rows added to a group per fetchMore()
+
+    def __init__(self, tags_cache, parent=None):
+        super().__init__(parent)
+        group_of_kind = {kind: row for row, (_, _, kinds) in enumerate(OUTLINE_GROUPS) for kind in kinds}
+        symbols = [[] for _ in OUTLINE_GROUPS]
+        for symbol, (file_path, line_number, column, kind) in tags_cache.items():
+            row = group_of_kind.get(kind)
+            if row is not None:
+                symbols[row].append((line_number, symbol, file_path, column))
+
+        # Each group: [title, type, symbols sorted by line, number of rows fetched so far]
+        self.groups = []
+        for (title, type_name, _), group_symbols in zip(OUTLINE_GROUPS, symbols):
+            if group_symbols or title in ("Functions", "Variables"):
+                group_symbols.sort()
+                self.groups.append([title, type_name, group_symbols, 0])
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, 0)  # Group rows have internal id 0
+        return self.createIndex(row, column, parent.row() + 1)  # Symbol rows store their group row + 1
+
+    def parent(self, index):
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.groups)
+        if parent.internalId() == 0 and parent.column() == 0:
+            return self.groups[parent.row()][3]
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 2
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self.groups)
+        return parent.internalId() == 0 and parent.column() == 0 and bool(self.groups[parent.row()][2])
+
+    def canFetchMore(self, parent):
+        if not parent.isValid() or parent.internalId() != 0:
             return False
+        group = self.groups[parent.row()]
+        return group[3] < len(group[2])
+
+    def fetchMore(self, parent):
+        group = self.groups[parent.row()]
+        count = min(self.FETCH_SIZE, len(group[2]) - group[3])
+        self.beginInsertRows(parent, group[3], group[3] + count - 1)
+        group[3] += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if index.internalId() == 0:
+            if role == Qt.ItemDataRole.DisplayRole and index.column() == 0:
+                return self.groups[index.row()][0]
+            return None
+        title, type_name, symbols, _ = self.groups[index.internalId() - 1]
+        line_number, symbol, file_path, column = symbols[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return symbol if index.column() == 0 else type_name
+        if role == Qt.ItemDataRole.UserRole:
+            return (file_path, line_number, column)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return ["Symbol", "Type"][section]
+        return None
 
 class FunctionList(QDockWidget):
     def __init__(self, parent=None):
@@ -116,13 +196,12 @@ class FunctionList(QDockWidget):
         self.setObjectName("FunctionDock")
         self.layout = QVBoxLayout(self.main_widget)
 
-        # TreeWidget to display the list of functions/variables
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["Symbol", "Type"])
-        self.tree.setColumnWidth(0, 200)  # Symbol column wider
-        self.tree.setColumnWidth(1, 100)  # Type column narrower
-        self.tree.itemDoubleClicked.connect(self.on_item_double_clicked)
+        # TreeView to display the outline model of the current editor
+        self.tree = QTreeView()
+        self.tree.setUniformRowHeights(True)  # Let the view skip measuring every row
+        self.tree.doubleClicked.connect(self.on_item_double_clicked)
         self.layout.addWidget(self.tree)
+        self.current_model = None  # Keep the displayed model alive while the view uses it
 
         self.setWidget(self.main_widget)
         self.visibilityChanged.connect(self.on_function_list_visibility_changed)
@@ -133,78 +212,34 @@ class FunctionList(QDockWidget):
             self.parent.functionlistAction.setChecked(visible)
 
     def update_function_list(self, editor):
-        """Update the list of functions and variables based on the self.tags_cache of the current editor."""
-        self.tree.clear()  # Clear the old list
-
-        if not editor or not hasattr(editor, 'file_path') or not editor.file_path:
+        """Show the outline of the current editor, reusing the model cached on the editor when possible."""
+        if not isinstance(editor, CodeEditor) or not getattr(editor, 'file_path', None):
+            self.tree.setModel(None)
+            self.current_model = None
             return
 
         # Ensure tags_cache has been updated
         if not hasattr(editor, 'tags_cache') or not editor.tags_cache:
-            file_tag = f"{editor.file_path}.tags"
-            if not os.path.exists(file_tag):
-                self.parent.statusBar().showMessage(f"Tags file not found: {file_tag}")
-                return
-
-            project_dir = self.parent.project_view.get_project_directory() if self.parent.project_view else None
-            project_tag = str(Path(project_dir) / "project.tags") if project_dir else None
-            tag_files = [file_tag]
-            if project_tag and os.path.exists(project_tag):
-                tag_files.append(project_tag)
-
-            editor.update_tags_cache(tag_files)
-
-        # Use tags_cache from editor
-        try:
-            # Only display 2 columns: Symbol and Type
-            self.tree.setHeaderLabels(["Symbol", "Type"])
-            self.tree.setColumnWidth(0, 200)  # Symbol column wider
-            self.tree.setColumnWidth(1, 100)  # Type column narrower
-
-            functions = QTreeWidgetItem(self.tree, ["Functions"])
-            self.tree.addTopLevelItem(functions)
-            variables = QTreeWidgetItem(self.tree, ["Variables"])
-            self.tree.addTopLevelItem(variables)
-
-            # Classify functions and variables from tags_cache
-            for symbol, (file_path, line_number, column) in editor.tags_cache.items():
-                tag_type = None
-                # Read the .tags file to get tag_type
-                with open(f"{editor.file_path}.tags", 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if line.startswith("!"):
-                            continue
-                        parts = line.strip().split("\t")
-                        if len(parts) < 4 or parts[0] != symbol:
-                            continue
-                        tag_type = parts[3] if len(parts) > 3 else 'unknown'
-                        break
-
-                if tag_type == 'f':  # Function
-                    item = QTreeWidgetItem(functions)  # Create a new item for each function
-                    item.setText(0, symbol)  # Symbol
-                    item.setText(1, "Function")  # Type
-                    item.setData(0, Qt.ItemDataRole.UserRole, (file_path, line_number, column))
-                    functions.addChild(item)
-                elif tag_type == 'v':  # Variable
-                    item = QTreeWidgetItem(variables)  # Create a new item for each variable
-                    item.setText(0, symbol)  # Symbol
-                    item.setText(1, "Variable")  # Type
-                    item.setData(0, Qt.ItemDataRole.UserRole, (file_path, line_number, column))
-                    variables.addChild(item)
-
-            # Expand the Functions and Variables sections to display child items
-            functions.setExpanded(True)
-            variables.setExpanded(True)
-
-            # Ensure the QTreeWidget is updated
-            self.tree.repaint()
-        except Exception as e:
+            editor.update_tags_cache()
+
+        # Build the outline once per tags cache, switching back to a tab reuses it
+        if editor.outline_model is None:
+            editor.outline_model = SymbolOutlineModel(editor.tags_cache)
+        if editor.outline_model is self.current_model:
             return
 
-    def on_item_double_clicked(self, item, column):
+        self.tree.setModel(editor.outline_model)
+        self.current_model = editor.outline_model
+        self.tree.setColumnWidth(0, 200)  # Symbol column wider
+        self.tree.setColumnWidth(1, 100)  # Type column narrower
+
+        # Expand the groups to display child items, rows are fetched as they are scrolled into view
+        for row in range(self.current_model.rowCount()):
+            self.tree.expand(self.current_model.index(row, 0))
+
+    def on_item_double_clicked(self, index):
         """Jump to the definition and set the cursor at the symbol position when double-clicked on an item."""
-        data = item.data(0, Qt.ItemDataRole.UserRole)
+        data = index.data(Qt.ItemDataRole.UserRole)
         if data:
             file_path, line_number, column = data  # Directly get line_number and column from cache
             editor = self.parent.get_current_editor()
@@ -0,0 +1,94 @@
+# references_view.py
+from PyQt6.QtWidgets import QDockWidget, QWidget, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem
+from PyQt6.QtCore import Qt
+from pathlib import Path
+import os
+
+from symbol_database import normalize_path
+from xref_index import scan_identifiers
+
+MAX_REFERENCES = 5000  # Rows shown at most, the count label still reports every occurrence
+
+class ReferencesPanel(QDockWidget):
+    """Dock listing the occurrences of an identifier across the project, grouped by file."""
+    def __init__(self, parent=None):
+        super().__init__("Find References", parent)
+        self.parent = parent
+        self.setObjectName("ReferencesDock")
+        self.setAllowedAreas(Qt.DockWidgetArea.BottomDockWidgetArea | Qt.DockWidgetArea.RightDockWidgetArea | Qt.DockWidgetArea.LeftDockWidgetArea)
+
+        main_widget = QWidget()
+        layout = QVBoxLayout(main_widget)
+        self.summary_label = QLabel("No search yet")
+        layout.addWidget(self.summary_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Location", "Text"])
+        self.tree.setColumnWidth(0, 250)
+        self.tree.setUniformRowHeights(True)
+        self.tree.itemDoubleClicked.connect(self.on_item_double_clicked)
+        layout.addWidget(self.tree)
+
+        self.setWidget(main_widget)
+
+    def find_references(self, word, symbol_db, open_editors):
+        """Show the references of word from the cross-reference index, using the text of unsaved editors."""
+        references = symbol_db.find_references(word) if symbol_db else []
+
+        # Modified buffers are scanned directly, their indexed entries describe the file on disk
+        buffers = {}
+        for editor in open_editors:
+            if getattr(editor, 'file_path', None) and editor.isModified():
+                buffers[normalize_path(editor.file_path)] = editor.text()
+        if buffers:
+            references = [ref for ref in references if ref[0] not in buffers]
+            for path, text in buffers.items():
+                references.extend((path, line, column) for name, line, column in scan_identifiers(text, Path(path).suffix.lower()) if name == word)
+            references.sort()
+
+        self.show_references(word, references, buffers)
+
+    def show_references(self, word, references, buffers):
+        """Fill the tree with references grouped by file."""
+        self.show_locations(f"{len(references)} references to '{word}'", references, buffers)
+
+    def show_locations(self, summary, references, buffers=None):
+        """Fill the tree with (file, line, column) locations grouped by file, reading each file once for the line previews."""
+        buffers = buffers or {}
+        self.tree.clear()
+        self.summary_label.setText(summary)
+        shown = references[:MAX_REFERENCES]
+        if len(references) > MAX_REFERENCES:
+            self.summary_label.setText(f"{summary} (showing first {MAX_REFERENCES})")
+
+        file_item = None
+        lines = []
+        for path, line_number, column in shown:
+            if file_item is None or file_item.data(0, Qt.ItemDataRole.UserRole) != path:
+                file_item = QTreeWidgetItem(self.tree, [path])
+                file_item.setData(0, Qt.ItemDataRole.UserRole, path)
+                file_item.setExpanded(True)
+                lines = self.read_lines(path, buffers)
+            text = lines[line_number - 1].strip() if line_number <= len(lines) else ""
+            item = QTreeWidgetItem(file_item, [f"{Path(path).name}:{line_number}", text])
+            item.setData(1, Qt.ItemDataRole.UserRole, (path, line_number, column))
+        self.show()
+        self.raise_()
+
+    def read_lines(self, path, buffers):
+        if path in buffers:
+            return buffers[path].split("\n")
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as source_file:
+                return source_file.read().split("\n")
+        except OSError:
+            return []
+
+    def on_item_double_clicked(self, item, column):
+        """Jump to the reference under the double-clicked item."""
+        data = item.data(1, Qt.ItemDataRole.UserRole)
+        if data:
+            file_path, line_number, column = data
+            editor = self.parent.get_current_editor()
+            if editor and os.path.exists(file_path):
+                editor.open_file_at_line(file_path, line_number, column)
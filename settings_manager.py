@@ -42,7 +42,6 @@ class SettingsManager:
         for i in range(main_window.tabWidget.count()):
             editor = main_window.tabWidget.widget(i)
             cursor_pos = editor.getCursorPosition()
-            content = editor.text()
 
             # Save saved files
             if hasattr(editor, 'file_path') and editor.file_path and not editor.isModified():
@@ -53,6 +52,7 @@ class SettingsManager:
 
             # Save unsaved or modified files
             if editor.isModified() or not hasattr(editor, 'file_path'):
+                content = editor.text()  # Only copied for the buffers backed up, open files can be huge
                 if content.strip():
                     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                     if hasattr(editor, 'file_path') and editor.file_path:
@@ -85,12 +85,12 @@ class SettingsManager:
         try:
             session_data = json.loads(session_json)
 
-            # Restore saved files
+            # Restore saved files as placeholders, each is loaded when its tab is first shown
             for file_info in session_data.get('open_files', []):
                 file_path = file_info['path']
                 cursor_pos = tuple(file_info['cursor'])
                 if Path(file_path).exists():
-                    main_window.open_file(file_path, cursor_pos)
+                    main_window.add_tab_placeholder(file_path, cursor_pos)
 
             # Restore unsaved files from backup
             for unsaved in session_data.get('unsaved_files', []):
@@ -110,6 +110,9 @@ class SettingsManager:
             current_tab = session_data.get('current_tab', 0)
             if main_window.tabWidget.count() > current_tab:
                 main_window.tabWidget.setCurrentIndex(current_tab)
+            # The active tab is loaded first, even when it was already current and no switch happened
+            if main_window.tabWidget.count():
+                main_window.on_tab_changed(main_window.tabWidget.currentIndex())
 
             # Restore the project directory
             project_dir = session_data.get('project_directory', '')
@@ -0,0 +1,350 @@
+# symbol_database.py
+from PyQt6.QtCore import QStandardPaths
+from pathlib import Path
+import hashlib
+import sqlite3
+import threading
+import os
+
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path    TEXT PRIMARY KEY,
+    mtime   INTEGER NOT NULL,
+    size    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    name    TEXT NOT NULL,
+    path    TEXT NOT NULL,
+    line    INTEGER NOT NULL,
+    col     INTEGER NOT NULL DEFAULT 0,
+    kind    TEXT,
+    scope   TEXT
+);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols(name);
+CREATE INDEX IF NOT EXISTS symbols_path ON symbols(path);
+CREATE TABLE IF NOT EXISTS ref_files (
+    path    TEXT PRIMARY KEY,
+    mtime   INTEGER NOT NULL,
+    size    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refs (
+    name    TEXT NOT NULL,
+    path    TEXT NOT NULL,
+    line    INTEGER NOT NULL,
+    col     INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS refs_name ON refs(name);
+CREATE INDEX IF NOT EXISTS refs_path ON refs(path);
+CREATE TABLE IF NOT EXISTS include_files (
+    path    TEXT PRIMARY KEY,
+    mtime   INTEGER NOT NULL,
+    size    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS includes (
+    path    TEXT NOT NULL,
+    line    INTEGER NOT NULL,
+    name    TEXT NOT NULL,
+    system  INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS includes_path ON includes(path);
+"""
+
+def normalize_path(path):
+    """Normalize a file path so the same file always maps to the same database key."""
+    return os.path.abspath(path).replace('\\', '/')
+
+def index_directory():
+    """Return the directory holding the symbol databases, creating it if needed."""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+    if not base:
+        base = str(Path.home())
+    directory = Path(base) / "Taara" / "Debugger" / "index"
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+def file_signature(path):
+    """Return (mtime_ns, size) of a file, or None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+DECLARATION_KINDS = ("p", "x")  # Prototypes and extern variables rank below the definitions
+
+def rank_definitions(candidates, current_file, project_dir=None):
+    """Sort (file_path, line, column, kind, scope) candidates for go-to-definition.
+
+    Returns a list of (rank, candidate): definitions before declarations, each ordered same file first,
+    then same directory, then the project, then everything else (framework and driver trees).
+    """
+    current_file = normalize_path(current_file)
+    current_dir = current_file.rsplit('/', 1)[0] + '/'
+    project_prefix = normalize_path(project_dir).rstrip('/') + '/' if project_dir else None
+
+    def rank(candidate):
+        path = normalize_path(candidate[0])
+        if path == current_file:
+            location = 0
+        elif path.startswith(current_dir) and '/' not in path[len(current_dir):]:
+            location = 1
+        elif project_prefix and path.startswith(project_prefix):
+            location = 2
+        else:
+            location = 3
+        return (candidate[3] in DECLARATION_KINDS, location)
+
+    return sorted(((rank(c), c) for c in set(candidates)), key=lambda item: (item[0], item[1][0], item[1][1]))
+
+class SymbolDatabase:
+    """Persistent SQLite symbol store for one workspace, keyed by file path + mtime + size."""
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False, uri=True)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.create_schema()
+        # In-memory revisions let caches notice re-indexed files without querying SQLite
+        self.revision = 0
+        self.file_revisions = {}
+        self.framework_db_path = None  # Read-only framework index attached under this one, see attach_framework
+
+    @classmethod
+    def for_workspace(cls, directory=None):
+        """Open the database of a project directory, or the default one for loose files."""
+        if directory:
+            key = hashlib.sha1(normalize_path(directory).lower().encode("utf-8")).hexdigest()[:16]
+            name = f"{Path(directory).name}_{key}.db"
+        else:
+            name = "default.db"
+        return cls(index_directory() / name)
+
+    def create_schema(self):
+        """Create the tables, dropping an index written by an incompatible version."""
+        with self.lock:
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                self.connection.executescript(
+                    "DROP TABLE IF EXISTS symbols; DROP TABLE IF EXISTS files;"
+                    "DROP TABLE IF EXISTS refs; DROP TABLE IF EXISTS ref_files;"
+                    "DROP TABLE IF EXISTS includes; DROP TABLE IF EXISTS include_files;"
+                )
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.connection.commit()
+
+    def attach_framework(self, framework_db_path):
+        """Layer a shared, read-only framework index under this database: lookups then search both."""
+        with self.lock:
+            self.detach_framework()
+            uri = Path(framework_db_path).resolve().as_uri() + "?mode=ro"
+            self.connection.execute("ATTACH DATABASE ? AS framework", (uri,))
+            self.framework_db_path = str(framework_db_path)
+
+    def detach_framework(self):
+        with self.lock:
+            if self.framework_db_path:
+                self.connection.execute("DETACH DATABASE framework")
+                self.framework_db_path = None
+
+    def in_framework(self, path):
+        """Return True if the attached framework index holds the current symbols of path."""
+        if not self.framework_db_path:
+            return False
+        signature = file_signature(path)
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT mtime, size FROM framework.files WHERE path = ?", (normalize_path(path),)
+            ).fetchone()
+        return row is not None and tuple(row) == signature
+
+    def is_current(self, path):
+        """Return True if the stored symbols of path match the file on disk."""
+        signature = file_signature(path)
+        if signature is None:
+            return False
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT mtime, size FROM files WHERE path = ?", (normalize_path(path),)
+            ).fetchone()
+        return row is not None and tuple(row) == signature
+
+    def stale_files(self, paths):
+        """Return the paths whose file changed (or was never indexed) since it was last tagged."""
+        return self.stale_paths("files", paths)
+
+    def stale_paths(self, table, paths):
+        """Return the paths whose signature differs from the one recorded in a (path, mtime, size) table."""
+        with self.lock:
+            known = {row[0]: (row[1], row[2]) for row in self.connection.execute(f"SELECT path, mtime, size FROM {table}")}
+        stale = []
+        for path in paths:
+            signature = file_signature(path)
+            if signature is not None and known.get(normalize_path(path)) != signature:
+                stale.append(path)
+        return stale
+
+    def store_file(self, path, tags, signature=None):
+        """Replace the symbols of one file. tags is an iterable of (name, line, column, kind, scope)."""
+        key = normalize_path(path)
+        signature = signature or file_signature(path)
+        if signature is None:
+            return
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM symbols WHERE path = ?", (key,))
+            self.connection.executemany(
+                "INSERT INTO symbols (name, path, line, col, kind, scope) VALUES (?, ?, ?, ?, ?, ?)",
+                ((name, key, line, column, kind, scope) for name, line, column, kind, scope in tags)
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO files (path, mtime, size) VALUES (?, ?, ?)", (key, *signature)
+            )
+            self.bump_revision(key)
+
+    def add_symbols(self, path, tags):
+        """Add symbols to a file stored earlier, without replacing the existing ones."""
+        key = normalize_path(path)
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT INTO symbols (name, path, line, col, kind, scope) VALUES (?, ?, ?, ?, ?, ?)",
+                ((name, key, line, column, kind, scope) for name, line, column, kind, scope in tags)
+            )
+            self.bump_revision(key)
+
+    def remove_file(self, path):
+        """Forget a file and all of its symbols."""
+        key = normalize_path(path)
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM symbols WHERE path = ?", (key,))
+            self.connection.execute("DELETE FROM files WHERE path = ?", (key,))
+            self.connection.execute("DELETE FROM refs WHERE path = ?", (key,))
+            self.connection.execute("DELETE FROM ref_files WHERE path = ?", (key,))
+            self.bump_revision(key)
+
+    def bump_revision(self, key):
+        """Record that the symbols of a file changed."""
+        self.revision += 1
+        self.file_revisions[key] = self.revision
+
+    def file_revision(self, path):
+        """Return a number that changes whenever the symbols of path are re-indexed in this process."""
+        return self.file_revisions.get(normalize_path(path), 0)
+
+    def prune(self, directory, existing_paths):
+        """Drop files under directory that no longer exist in existing_paths."""
+        prefix = normalize_path(directory).rstrip('/') + '/'
+        existing = {normalize_path(path) for path in existing_paths}
+        with self.lock:
+            indexed = [row[0] for row in self.connection.execute(
+                "SELECT path FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+            )]
+        for path in indexed:
+            if path not in existing:
+                self.remove_file(path)
+
+    def lookup(self, name):
+        """Return every definition of name as a list of (file_path, line, column, kind, scope)."""
+        query = "SELECT path, line, col, kind, scope FROM symbols WHERE name = ?"
+        with self.lock:
+            if self.framework_db_path:
+                return [tuple(row) for row in self.connection.execute(
+                    query + " UNION ALL SELECT path, line, col, kind, scope FROM framework.symbols WHERE name = ?", (name, name)
+                )]
+            return [tuple(row) for row in self.connection.execute(query, (name,))]
+
+    def symbols_in_file(self, path):
+        """Return the symbols of one file as a list of (name, line, column, kind), in file order."""
+        key = normalize_path(path)
+        with self.lock:
+            symbols = [tuple(row) for row in self.connection.execute(
+                "SELECT name, line, col, kind FROM symbols WHERE path = ? ORDER BY line", (key,)
+            )]
+            if not symbols and self.framework_db_path:
+                symbols = [tuple(row) for row in self.connection.execute(
+                    "SELECT name, line, col, kind FROM framework.symbols WHERE path = ? ORDER BY line", (key,)
+                )]
+            return symbols
+
+    def symbol_names(self):
+        """Return the distinct symbol names of the workspace, framework included."""
+        with self.lock:
+            if self.framework_db_path:
+                return [row[0] for row in self.connection.execute(
+                    "SELECT name FROM symbols UNION SELECT name FROM framework.symbols"
+                )]
+            return [row[0] for row in self.connection.execute("SELECT DISTINCT name FROM symbols")]
+
+    def stale_reference_files(self, paths):
+        """Return the paths whose cross-reference entries are missing or older than the file."""
+        return self.stale_paths("ref_files", paths)
+
+    def store_references(self, path, occurrences, signature):
+        """Replace the identifier occurrences of one file. occurrences is an iterable of (name, line, column)."""
+        key = normalize_path(path)
+        if signature is None:
+            return
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM refs WHERE path = ?", (key,))
+            self.connection.executemany(
+                "INSERT INTO refs (name, path, line, col) VALUES (?, ?, ?, ?)",
+                ((name, key, line, column) for name, line, column in occurrences)
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO ref_files (path, mtime, size) VALUES (?, ?, ?)", (key, *signature)
+            )
+
+    def find_references(self, name):
+        """Return every occurrence of an identifier as a list of (file_path, line, column), by file and line."""
+        with self.lock:
+            if self.framework_db_path:
+                return [tuple(row) for row in self.connection.execute(
+                    "SELECT path, line, col FROM refs WHERE name = ? UNION "
+                    "SELECT path, line, col FROM framework.refs WHERE name = ? ORDER BY 1, 2, 3", (name, name)
+                )]
+            return [tuple(row) for row in self.connection.execute(
+                "SELECT path, line, col FROM refs WHERE name = ? ORDER BY path, line, col", (name,)
+            )]
+
+    def stale_include_files(self, paths):
+        """Return the paths whose #include directives are missing or older than the file."""
+        return self.stale_paths("include_files", paths)
+
+    def store_includes(self, path, directives, signature):
+        """Replace the #include directives of one file. directives is an iterable of (line, name, is_system)."""
+        key = normalize_path(path)
+        if signature is None:
+            return
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM includes WHERE path = ?", (key,))
+            self.connection.executemany(
+                "INSERT INTO includes (path, line, name, system) VALUES (?, ?, ?, ?)",
+                ((key, line, name, int(is_system)) for line, name, is_system in directives)
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO include_files (path, mtime, size) VALUES (?, ?, ?)", (key, *signature)
+            )
+
+    def prune_includes(self, existing_paths):
+        """Drop the #include directives of the files that are no longer in existing_paths."""
+        existing = {normalize_path(path) for path in existing_paths}
+        with self.lock, self.connection:
+            gone = [(row[0],) for row in self.connection.execute("SELECT path FROM include_files") if row[0] not in existing]
+            self.connection.executemany("DELETE FROM includes WHERE path = ?", gone)
+            self.connection.executemany("DELETE FROM include_files WHERE path = ?", gone)
+
+    def all_includes(self):
+        """Return {path: [(line, name, is_system)]} for every file whose directives are stored."""
+        with self.lock:
+            directives = {row[0]: [] for row in self.connection.execute("SELECT path FROM include_files")}
+            for path, line, name, system in self.connection.execute("SELECT path, line, name, system FROM includes ORDER BY path, line"):
+                directives.setdefault(path, []).append((line, name, bool(system)))
+        return directives
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self.lock:
+            self.connection.close()
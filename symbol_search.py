@@ -0,0 +1,178 @@
+# symbol_search.py
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+import re
+
+PREFIX_SCAN_LIMIT = 2000     # Prefix matches scored at most
+SUBSTRING_SCAN_LIMIT = 5000  # Substring candidates checked at most, a longer query narrows them down
+FUZZY_TRIGRAMS = 6           # Rarest query trigrams counted for fuzzy candidates
+FUZZY_POSTING_BUDGET = 80000  # Ids counted at most for fuzzy candidates, common trigrams are skipped past it
+FUZZY_CANDIDATES = 5000      # Candidates checked with the subsequence regex at most
+
+def search_key(name):
+    """Case and underscore insensitive form of a symbol name, so 'gpioinit' finds HAL_GPIO_Init."""
+    return name.lower().replace("_", "")
+
+def trigrams(key):
+    return {key[i:i + 3] for i in range(len(key) - 2)}
+
+class SymbolSearchIndex:
+    """In-memory trigram and prefix index over symbol names for the Go to Symbol palette.
+
+    Names are only ever added: a name whose symbols were deleted stays in the index and simply
+    finds no definition when the palette looks it up.
+    """
+    def __init__(self, names=()):
+        self.names = []          # Symbol names by id
+        self.keys = []           # search_key() of each name
+        self.name_ids = {}       # {name: id}
+        self.postings = {}       # {trigram: array of ids}, ids in increasing order
+        self.sorted_keys = []    # [(key, id)] sorted, for prefix queries
+        self.add_names(names, resort=False)
+        self.sorted_keys.sort()
+
+    def __len__(self):
+        return len(self.names)
+
+    def add_names(self, names, resort=True):
+        """Add the names not indexed yet, e.g. the symbols of a freshly indexed file."""
+        postings = self.postings
+        for name in names:
+            if name in self.name_ids:
+                continue
+            name_id = len(self.names)
+            key = search_key(name)
+            self.name_ids[name] = name_id
+            self.names.append(name)
+            self.keys.append(key)
+            for gram in trigrams(key):
+                posting = postings.get(gram)
+                if posting is None:
+                    postings[gram] = array('i', (name_id,))
+                else:
+                    posting.append(name_id)
+            if resort:
+                insort(self.sorted_keys, (key, name_id))
+            else:
+                self.sorted_keys.append((key, name_id))
+
+    def search(self, query, limit=100):
+        """Return up to limit names matching query: exact, prefix, substring then fuzzy (subsequence) matches."""
+        query_key = search_key(query.strip())
+        if not query_key:
+            return []
+        # Exact and prefix matches rank first, when there are enough of them nothing else is scored
+        matches = self.prefix_matches(query_key)
+        if len(matches) < limit and len(query_key) >= 3:
+            found = set(matches)
+            matches += [i for i in self.substring_matches(query_key) if i not in found]
+            if len(matches) < limit:
+                found.update(matches)
+                matches += [i for i in self.fuzzy_matches(query_key) if i not in found]
+
+        keys = self.keys
+        names = self.names
+
+        def score(name_id):
+            key = keys[name_id]
+            if key == query_key:
+                group, spread = 0, 0
+            elif key.startswith(query_key):
+                group, spread = 1, 0
+            else:
+                position = key.find(query_key)
+                if position >= 0:
+                    group, spread = 2, position
+                else:
+                    group, spread = 3, fuzzy_spread(key, query_key)
+            return (group, spread, len(key), names[name_id])
+
+        return [names[i] for i in sorted(matches, key=score)[:limit]]
+
+    def prefix_matches(self, query_key):
+        """Ids of the keys starting with query_key, from the sorted key list."""
+        start = bisect_left(self.sorted_keys, (query_key,))
+        matches = []
+        for key, name_id in self.sorted_keys[start:start + PREFIX_SCAN_LIMIT]:
+            if not key.startswith(query_key):
+                break
+            matches.append(name_id)
+        return matches
+
+    def substring_matches(self, query_key):
+        """Ids of the keys containing query_key, intersecting trigram postings from the rarest one."""
+        postings = []
+        for gram in trigrams(query_key):
+            posting = self.postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            # Once few candidates are left, checking the keys is cheaper than another intersection
+            if len(candidates) <= 256:
+                break
+            candidates.intersection_update(posting)
+        keys = self.keys
+        matches = []
+        for i in candidates:
+            if query_key in keys[i]:
+                matches.append(i)
+                if len(matches) >= SUBSTRING_SCAN_LIMIT:
+                    break
+        return matches
+
+    def fuzzy_matches(self, query_key):
+        """Ids of the keys containing the letters of query_key in order, among keys sharing most of its trigrams."""
+        pattern = re.compile(".*?".join(re.escape(c) for c in query_key))
+        keys = self.keys
+        postings = sorted((self.postings[gram] for gram in trigrams(query_key) if gram in self.postings), key=len)
+        if not postings:
+            # No trigram in common (e.g. 'hlp' for helper): small indexes are cheap enough to scan
+            if len(keys) > FUZZY_CANDIDATES:
+                return []
+            return [i for i, key in enumerate(keys) if pattern.search(key)]
+        counts = Counter()
+        counted = 0
+        budget = FUZZY_POSTING_BUDGET
+        for posting in postings[:FUZZY_TRIGRAMS]:
+            if counted and len(posting) > budget:
+                break
+            counts.update(posting)
+            counted += 1
+            budget -= len(posting)
+        # A typo or skipped letter breaks up to three trigrams, ask for half of the counted ones to be present
+        needed = max(1, (counted + 1) // 2)
+        candidates = [i for i, hits in counts.items() if hits >= needed][:FUZZY_CANDIDATES]
+        return [i for i in candidates if pattern.search(keys[i])]
+
+def fuzzy_spread(key, query_key):
+    """Length of the shortest-start span of key holding the letters of query_key in order, for ranking."""
+    position = key.find(query_key[0])
+    start = position
+    for c in query_key[1:]:
+        position = key.find(c, position + 1)
+        if position < 0:
+            return len(key)
+    return position - start
+
+class SymbolSearchSignals(QObject):
+    finished = pyqtSignal(object, object)  # (symbol database, SymbolSearchIndex)
+
+class SymbolSearchJob(QRunnable):
+    """Build a SymbolSearchIndex from a symbol database on a worker thread."""
+    def __init__(self, symbol_db):
+        super().__init__()
+        self.symbol_db = symbol_db
+        self.signals = SymbolSearchSignals()
+
+    def run(self):
+        try:
+            index = SymbolSearchIndex(self.symbol_db.symbol_names())
+        except Exception:
+            return  # The database was closed by a project switch, a new build follows
+        self.signals.finished.emit(self.symbol_db, index)
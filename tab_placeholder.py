@@ -0,0 +1,24 @@
+# tab_placeholder.py
+from PyQt6.QtWidgets import QWidget
+
+class TabPlaceholder(QWidget):
+    """Empty stand-in for a restored tab; MainWindow.materialize_tab opens the file when the tab is first shown.
+
+    It answers the few editor calls made on every tab (file path, modified state, cursor, tags cache)
+    so the tab can be saved with the session, closed or looked up without loading the file.
+    """
+    def __init__(self, file_path, cursor_pos=(0, 0), parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.cursor_pos = tuple(cursor_pos)
+        self.large_file = False
+        self.tags_cache = {}
+
+    def isModified(self):
+        return False
+
+    def getCursorPosition(self):
+        return self.cursor_pos
+
+    def update_tags_cache(self):
+        pass
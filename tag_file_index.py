@@ -0,0 +1,142 @@
+# tag_file_index.py
+from collections import OrderedDict, defaultdict
+import threading
+import mmap
+import os
+
+from ctags_handler import parse_tag_line
+from symbol_database import normalize_path
+from tag_resolver import resolve_file_tags
+
+TAG_FILE_NAMES = ("tags", ".tags")  # Tags files picked up from a project or framework root
+
+class SortedTagsFile:
+    """A sorted ctags file searched in place through mmap instead of being loaded into the Python heap.
+
+    Lookups binary-search the mapped file for the lines of a name and resolve their locations;
+    the most recently resolved names are kept in a small LRU. The pages a search touches are read
+    through the OS page cache and count towards resident memory while they stay mapped. The IDE does
+    not write these files, only tags files the user provides (see open_tag_files) are read this way.
+    """
+    def __init__(self, path, cache_size=256):
+        self.path = path
+        self.directory = os.path.dirname(os.path.abspath(path))
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            self.file.close()
+            raise
+        self.size = len(self.map)
+        self.fold_case = self.sort_mode() == 2
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # {name: [(file_path, line, column, kind, scope)]}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path):
+        """Open a tags file if it is sorted (ctags writes !_TAG_FILE_SORTED 1 or 2), else return None."""
+        try:
+            tags_file = cls(path)
+        except (OSError, ValueError):
+            return None
+        if tags_file.sort_mode() == 0:
+            tags_file.close()
+            return None
+        return tags_file
+
+    def sort_mode(self):
+        """Return the !_TAG_FILE_SORTED value: 0 unsorted, 1 sorted, 2 sorted ignoring case."""
+        header = self.map[:4096]
+        position = header.find(b"!_TAG_FILE_SORTED\t")
+        if position < 0:
+            return 0
+        value = header[position + len(b"!_TAG_FILE_SORTED\t"):position + len(b"!_TAG_FILE_SORTED\t") + 1]
+        return int(value) if value.isdigit() else 0
+
+    def line_start(self, position):
+        """Return the offset of the first line starting at or after position."""
+        if position <= 0:
+            return 0
+        newline = self.map.find(b"\n", position - 1)
+        return self.size if newline < 0 else newline + 1
+
+    def key_at(self, start):
+        line_end = self.map.find(b"\n", start)
+        if line_end < 0:
+            line_end = self.size
+        end = self.map.find(b"\t", start, line_end)
+        key = self.map[start:end if end >= 0 else line_end]
+        return key.upper() if self.fold_case else key
+
+    def find_lines(self, name):
+        """Return the raw lines whose tag name is name, found with a binary search over byte offsets."""
+        wanted = name.encode("utf-8")
+        # ctags and sort -f fold to upper case, so '_' sorts after the letters as it does in the file
+        search_key = wanted.upper() if self.fold_case else wanted
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            start = self.line_start(middle)
+            if start >= self.size or self.key_at(start) >= search_key:
+                high = middle
+            else:
+                low = middle + 1
+
+        lines = []
+        start = self.line_start(low)
+        while start < self.size:
+            end = self.map.find(b"\n", start)
+            end = self.size if end < 0 else end
+            line = self.map[start:end]
+            tag_name = line.split(b"\t", 1)[0]
+            if (tag_name.upper() if self.fold_case else tag_name) != search_key:
+                break
+            if tag_name == wanted:
+                lines.append(line.decode("utf-8", errors="replace"))
+            start = end + 1
+        return lines
+
+    def lookup(self, name):
+        """Return the definitions of name as a list of (file_path, line, column, kind, scope)."""
+        with self.lock:
+            cached = self.cache.get(name)
+            if cached is not None:
+                self.cache.move_to_end(name)
+                return cached
+
+        tags_by_file = defaultdict(list)
+        for line in self.find_lines(name):
+            tag = parse_tag_line(line)
+            if tag:
+                # Paths in a tags file are relative to the file itself
+                path = normalize_path(os.path.join(self.directory, tag["path"]))
+                tags_by_file[path].append(tag)
+        definitions = []
+        for path, tags in tags_by_file.items():
+            definitions.extend((path, line_number, column, kind, scope)
+                               for _, line_number, column, kind, scope in resolve_file_tags(path, tags))
+
+        with self.lock:
+            self.cache[name] = definitions
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return definitions
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+def open_tag_files(directories):
+    """Open the sorted tags files the user placed at the root of the given directories (none are generated)."""
+    tag_files = []
+    for directory in directories:
+        if not directory:
+            continue
+        for name in TAG_FILE_NAMES:
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                tags_file = SortedTagsFile.open(path)
+                if tags_file:
+                    tag_files.append(tags_file)
+    return tag_files
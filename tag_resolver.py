@@ -0,0 +1,75 @@
+# tag_resolver.py
+from collections import defaultdict
+
+def parse_pattern(address):
+    """Turn a ctags search address into (text, whole_line), or (None, False) if it is not a pattern."""
+    if not address.startswith("/^"):
+        return None, False
+    body = address[2:]
+    if body.endswith(';"'):
+        body = body[:-2]
+    if body.endswith("/"):
+        body = body[:-1]
+    whole_line = body.endswith("$")  # ctags drops the '$' of patterns it had to truncate
+    if whole_line:
+        body = body[:-1]
+    return body.replace("\\/", "/").replace("\\\\", "\\").strip(), whole_line
+
+class SourceLines:
+    """Lines of one source file, read once, with a lazy index from stripped line text to line number."""
+    def __init__(self, path):
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as source_file:
+                self.lines = source_file.read().split("\n")
+        except OSError:
+            self.lines = []
+        self.first_line_of = None
+
+    def line(self, line_number):
+        """Return the text of a 1-based line, or an empty string if it is out of range."""
+        if 0 < line_number <= len(self.lines):
+            return self.lines[line_number - 1]
+        return ""
+
+    def find_pattern(self, text, whole_line):
+        """Return the 1-based number of the first line matching a ctags pattern, or None."""
+        if whole_line:
+            if self.first_line_of is None:
+                self.first_line_of = {}
+                for i, source_line in enumerate(self.lines, 1):
+                    self.first_line_of.setdefault(source_line.strip(), i)
+            line_number = self.first_line_of.get(text)
+            if line_number is not None:
+                return line_number
+        # Truncated or unusual patterns fall back to a substring scan
+        for i, source_line in enumerate(self.lines, 1):
+            if text in source_line:
+                return i
+        return None
+
+def resolve_file_tags(path, tags):
+    """Resolve the (line, column) of all tags of one file with a single read of the file.
+
+    tags are dicts from ctags_handler.parse_tag_line; returns a list of (name, line, column, kind, scope).
+    """
+    source = SourceLines(path)
+    resolved = []
+    for tag in tags:
+        line_number = tag["line"]
+        if line_number is None:
+            text, whole_line = parse_pattern(tag["address"])
+            if text is None:
+                continue
+            line_number = source.find_pattern(text, whole_line)
+            if line_number is None:
+                continue
+        column = max(source.line(line_number).find(tag["name"]), 0)
+        resolved.append((tag["name"], line_number, column, tag["kind"], tag["scope"]))
+    return resolved
+
+def resolve_tags(tags):
+    """Group tags by file and resolve each file in one pass. Returns {path: [(name, line, column, kind, scope)]}."""
+    tags_by_file = defaultdict(list)
+    for tag in tags:
+        tags_by_file[tag["path"]].append(tag)
+    return {path: resolve_file_tags(path, file_tags) for path, file_tags in tags_by_file.items()}
@@ -0,0 +1,55 @@
+# tags_cache.py
+from collections import OrderedDict
+import threading
+
+from symbol_database import normalize_path, DECLARATION_KINDS
+
+class SharedTagsCache:
+    """Process-wide, memory-bounded cache of per-file symbol tables read from the symbol database.
+
+    Entries are keyed by database path + file path and tagged with the file revision of the
+    database, so every editor showing a file shares one table until the file is re-indexed.
+    The returned dicts are shared and must not be modified.
+    """
+    def __init__(self, max_symbols=200000):
+        self.max_symbols = max_symbols
+        self.entries = OrderedDict()  # {(db_path, file_key): (revision, {symbol: (file_path, line, column, kind)})}
+        self.symbol_count = 0
+        self.lock = threading.Lock()
+
+    def file_symbols(self, symbol_db, file_path):
+        """Return {symbol: (file_path, line, column, kind)} for one file, reading SQLite only when stale."""
+        key = (symbol_db.db_path, normalize_path(file_path))
+        revision = symbol_db.file_revision(file_path)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == revision:
+                self.entries.move_to_end(key)
+                return entry[1]
+
+        symbols = {}
+        for symbol, line_number, column, kind in symbol_db.symbols_in_file(file_path):
+            # A definition wins over a prototype or extern declaration of the same name earlier in the file
+            known = symbols.get(symbol)
+            if known is None or (known[3] in DECLARATION_KINDS and kind not in DECLARATION_KINDS):
+                symbols[symbol] = (file_path, line_number, column, kind)
+
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.symbol_count -= len(old[1])
+            self.entries[key] = (revision, symbols)
+            self.symbol_count += len(symbols)
+            # Evict the least recently used files until the cache fits again
+            while self.symbol_count > self.max_symbols and len(self.entries) > 1:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.symbol_count -= len(evicted)
+        return symbols
+
+    def clear(self):
+        """Drop every cached table, e.g. when the workspace database changes."""
+        with self.lock:
+            self.entries.clear()
+            self.symbol_count = 0
+
+shared_tags_cache = SharedTagsCache()
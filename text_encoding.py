@@ -0,0 +1,55 @@
+# text_encoding.py
+from chardet.universaldetector import UniversalDetector
+import codecs
+
+DETECT_CHUNK_SIZE = 64 * 1024       # Bytes fed to chardet at a time
+DETECT_LIMIT = 1024 * 1024          # chardet stops guessing after this many bytes
+MIN_CONFIDENCE = 0.5                # Below this chardet is guessing, e.g. Cyrillic for accented Latin text
+FALLBACK_ENCODING = 'cp1252'        # Weak guesses fall back to Windows Latin (then to Latin-1 if bytes do not fit)
+# UTF-32 LE starts with the UTF-16 LE mark, it is checked first
+BOMS = ((codecs.BOM_UTF32_LE, 'utf-32'), (codecs.BOM_UTF32_BE, 'utf-32'), (codecs.BOM_UTF8, 'utf-8-sig'),
+        (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+DISPLAY_NAMES = {'utf-8': "UTF-8", 'utf-8-sig': "UTF-8 BOM", 'utf-16': "UTF-16", 'utf-32': "UTF-32",
+                 'iso8859-1': "ISO-8859-1", 'ascii': "ASCII"}
+
+def detect_encoding(data, complete=True):
+    """Return the codec of data: a BOM, else valid UTF-8 (ASCII included), else chardet's confident guess.
+
+    complete is False when data is only the start of a file and may end in the middle of a character.
+    chardet is fed in chunks and stops as soon as it is confident.
+    """
+    for bom, encoding in BOMS:
+        if data.startswith(bom):
+            return encoding
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(data, final=complete)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    detector = UniversalDetector()
+    for start in range(0, min(len(data), DETECT_LIMIT), DETECT_CHUNK_SIZE):
+        detector.feed(data[start:start + DETECT_CHUNK_SIZE])
+        if detector.done:
+            break
+    detector.close()
+    encoding = detector.result['encoding']
+    if not encoding or detector.result['confidence'] < MIN_CONFIDENCE:
+        return FALLBACK_ENCODING
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
+        return FALLBACK_ENCODING
+
+def decode_text(data):
+    """Decode the bytes of a file. Return (text, encoding); bytes that fit no guess are kept as Latin-1."""
+    encoding = detect_encoding(data)
+    try:
+        return data.decode(encoding), encoding
+    except UnicodeDecodeError:
+        # Bytes past what chardet read may not fit its guess; Latin-1 maps every byte and saves it back unchanged
+        return data.decode('latin-1'), 'latin-1'
+
+def encoding_display_name(encoding):
+    name = codecs.lookup(encoding).name
+    return DISPLAY_NAMES.get(name, name.upper())
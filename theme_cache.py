@@ -0,0 +1,110 @@
+# theme_cache.py
+from PyQt6.QtCore import QObject, QFileSystemWatcher, pyqtSignal
+from PyQt6.QtGui import QColor
+from PyQt6.Qsci import QsciLexerCPP
+from collections import namedtuple
+from pathlib import Path
+import json
+import os
+
+THEMES_DIR = Path(__file__).parent / "themes"
+
+# TextMate scopes of a theme and the lexer styles they color
+STYLE_MAP = {
+    "comment": QsciLexerCPP.Comment,
+    "string": QsciLexerCPP.DoubleQuotedString,
+    "constant.numeric": QsciLexerCPP.Number,
+    "keyword": QsciLexerCPP.Keyword,
+    "storage": QsciLexerCPP.KeywordSet2,
+    "entity.name.function": QsciLexerCPP.GlobalClass,
+    "meta.preprocessor": QsciLexerCPP.PreProcessor
+}
+
+# A theme compiled once per process: colors are ready QColors, styles a tuple of (style, foreground, background)
+ThemeStyles = namedtuple("ThemeStyles", [
+    "name", "background", "foreground", "styles", "caret_line", "caret", "selection",
+    "margin_foreground", "margin_background", "indent_guide", "whitespace"])
+
+def compile_theme(name, theme):
+    """Turn the JSON of a theme into a ThemeStyles table."""
+    colors = theme.get("colors", {})
+    styles = {}
+    for token in theme.get("tokenColors", []):
+        scope = token.get("scope", "")
+        settings = token.get("settings", {})
+        # Handle both string and list scopes, later tokens override earlier ones like the old per-editor walk
+        for scope in ([scope] if isinstance(scope, str) else scope):
+            if scope in STYLE_MAP:
+                foreground, background = styles.get(STYLE_MAP[scope], (None, None))
+                if "foreground" in settings:
+                    foreground = QColor(settings["foreground"])
+                if "background" in settings:
+                    background = QColor(settings["background"])
+                styles[STYLE_MAP[scope]] = (foreground, background)
+    return ThemeStyles(
+        name=name,
+        background=QColor(colors.get("editor.background", "#D7D7AF")),
+        foreground=QColor(colors.get("editor.foreground", "#5F5F00")),
+        styles=tuple((style, foreground, background) for style, (foreground, background) in styles.items()),
+        caret_line=QColor(colors.get("editor.lineHighlightBackground", "#BFBF97")),
+        caret=QColor(colors.get("editorCursor.foreground", "#4D4D4D")),
+        selection=QColor(colors.get("editor.selectionBackground", "#D7FF87")),
+        margin_foreground=QColor("#2B2B2B"),  # Dark gray for line numbers
+        margin_background=QColor("#D3CBB7"),  # Darker khaki for margin background
+        indent_guide=QColor(colors.get("editorIndentGuide.background", "#586E7580")),
+        whitespace=QColor(colors.get("editorWhitespace.foreground", "#586E7580")))
+
+class ThemeCache(QObject):
+    """Process-wide cache of compiled themes, reloaded when their JSON file changes on disk.
+
+    Editors ask for a theme by name on construction and listen to themeChanged to restyle themselves.
+    """
+    themeChanged = pyqtSignal(str)  # theme name (lower case)
+
+    def __init__(self):
+        super().__init__()
+        self.themes = {}  # {name: (mtime, ThemeStyles or None)}
+        self.watcher = None
+
+    def theme_path(self, name):
+        return THEMES_DIR / f"{name.lower()}.json"
+
+    def theme(self, name):
+        """Return the ThemeStyles of a theme, or None if it cannot be read."""
+        name = name.lower()
+        if name not in self.themes:
+            self.themes[name] = self.load(name)
+            self.watch(name)
+        return self.themes[name][1]
+
+    def load(self, name):
+        path = self.theme_path(name)
+        try:
+            mtime = os.path.getmtime(path)
+            with open(path, 'r') as f:
+                return mtime, compile_theme(name, json.load(f))
+        except Exception as e:
+            return None, None
+
+    def watch(self, name):
+        if self.watcher is None:
+            self.watcher = QFileSystemWatcher(self)
+            self.watcher.fileChanged.connect(self.on_file_changed)
+        path = str(self.theme_path(name))
+        if os.path.exists(path) and path not in self.watcher.files():
+            self.watcher.addPath(path)
+
+    def on_file_changed(self, path):
+        """Recompile a theme edited on disk and let the editors using it restyle."""
+        name = Path(path).stem.lower()
+        if name not in self.themes:
+            return
+        # Editors replacing the file (write to temp, rename) drop the watch, it is set again
+        self.watch(name)
+        loaded = self.load(name)
+        if loaded[1] is None or loaded[0] == self.themes[name][0]:
+            return  # Half-written or unchanged, the next change notification brings the complete file
+        self.themes[name] = loaded
+        self.themeChanged.emit(name)
+
+shared_theme_cache = ThemeCache()
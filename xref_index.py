@@ -0,0 +1,59 @@
+# xref_index.py
+from pathlib import Path
+import re
+
+from symbol_database import normalize_path, file_signature
+
+# Comments and string/char literals are matched as whole tokens so identifiers inside them are skipped
+C_TOKENS = re.compile(r'//[^\n]*|/\*.*?(?:\*/|\Z)|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|[A-Za-z_]\w*|\n', re.S)
+PY_TOKENS = re.compile(r'#[^\n]*|"""(?:\\.|[^\\])*?(?:"""|\Z)|\'\'\'(?:\\.|[^\\])*?(?:\'\'\'|\Z)'
+                       r'|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|[A-Za-z_]\w*|\n', re.S)
+
+# Keywords are never looked up, leaving them out keeps the index small
+KEYWORDS = frozenset("""
+    auto break case char const continue default do double else enum extern float for goto if inline int long
+    register restrict return short signed sizeof static struct switch typedef union unsigned void volatile while
+    bool true false class namespace template typename public private protected virtual operator new delete this
+    using nullptr define include ifdef ifndef endif elif undef pragma defined
+    and as assert async await def del except finally from global import in is lambda nonlocal not or pass raise
+    try with yield None True False self
+""".split())
+
+def scan_identifiers(text, suffix=".c"):
+    """Yield (name, line, column) of every identifier outside comments and strings. Lines are 1-based."""
+    tokens = PY_TOKENS if suffix == ".py" else C_TOKENS
+    line_number = 1
+    line_start = 0
+    for match in tokens.finditer(text):
+        token = match.group()
+        first = token[0]
+        if first == "\n":
+            line_number += 1
+            line_start = match.end()
+        elif first.isalpha() or first == "_":
+            if token not in KEYWORDS:
+                yield token, line_number, match.start() - line_start
+        else:
+            # Comments and literals may span lines, keep the line counter in step
+            newlines = token.count("\n")
+            if newlines:
+                line_number += newlines
+                line_start = match.start() + token.rfind("\n") + 1
+
+def scan_file(path):
+    """Return the identifier occurrences of a file on disk as a list of (name, line, column)."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as source_file:
+            text = source_file.read()
+    except OSError:
+        return []
+    return list(scan_identifiers(text, Path(path).suffix.lower()))
+
+def index_references(symbol_db, paths, is_cancelled=None):
+    """Rebuild the cross-reference entries of the files that changed. Return False if cancelled."""
+    for path in symbol_db.stale_reference_files(paths):
+        if is_cancelled and is_cancelled():
+            return False
+        signature = file_signature(path)
+        symbol_db.store_references(normalize_path(path), scan_file(path), signature)
+    return True